@@ -5,130 +5,372 @@ Locust-based load testing for the fraud detection API.
 Supports realistic telco traffic patterns, fraud injection, and various test scenarios.
 Tracks ML scoring metrics (champion/challenger/holdout routing, model latency, score distributions).
 
+Two latency views are reported: Locust's own response_time includes the
+network round-trip, while the ML metrics (and the SLA check in
+send_decision) use the API's server-side processing_time_ms.
+
 Usage:
     locust -f locustfile.py --host=http://localhost:8000
 
 Web UI available at: http://localhost:8089
 """
 
+import array
+import itertools
+import math
 import random
-import statistics
-import time
+import secrets
 import threading
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from datetime import UTC, datetime
+from functools import cache
 from uuid import uuid4
 
-from locust import HttpUser, task, between, events
-from locust.runners import MasterRunner
+import numpy as np
+from locust import FastHttpUser, between, events, task
+from locust.runners import MasterRunner, WorkerRunner
+
+try:
+    from orjson import dumps as json_dumps
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; stdlib json also accepts bytes
+    import json
+    from json import loads as json_loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 from data_generator import (
-    generate_transaction,
+    TRAFFIC_MIX,
+    generate_amount,
     generate_card_testing_transaction,
-    generate_sim_farm_transaction,
-    generate_device_resale_transaction,
-    generate_equipment_fraud_transaction,
     generate_fraud_ring_transaction,
     generate_geo_anomaly_transaction,
     generate_high_value_new_subscriber_transaction,
-    TRAFFIC_MIX,
+    generate_sim_farm_transaction,
+    generate_transaction,
+    get_random_account,
+    get_random_card,
+    get_random_device,
+    get_random_ip,
+    get_random_subscriber,
 )
 
-
 # ---------------------------------------------------------------------------
 # ML Metrics Collector
 # Thread-safe accumulator for ML scoring telemetry across all users.
 # Tracks per-variant routing, score distributions, latency breakdown, and
 # decision outcomes to validate ML behavior under load.
+#
+# record() is a lock-free queue append; a background thread aggregates.
+# In distributed runs each worker ships a snapshot delta with every stats
+# report to the master, which merges them.
 # ---------------------------------------------------------------------------
 
-class MLMetricsCollector:
-    """Collects ML scoring metrics across all Locust users."""
+
+# Server-side SLA targets (ms)
+SCORING_SLA_MS = 25
+E2E_SLA_MS = 200
+
+# Canonical variant strings, so every recorded key shares one interned object
+_VARIANT_INTERN = {v: v for v in ("champion", "challenger", "holdout")}
+
+
+def _quantiles(values, qs: tuple[float, ...]) -> list[float]:
+    """
+    Return [quantile for q in qs] for a non-empty sequence.
+
+    Uses np.partition (O(n) selection) instead of a full sort; the
+    nearest-rank index int(n * q), clamped to n - 1, matches the
+    sorted-list lookup used previously.
+    """
+    arr = np.asarray(values, dtype=np.float64)  # zero-copy view of array('d')
+    n = len(arr)
+    idx = [min(int(n * q), n - 1) for q in qs]
+    part = np.partition(arr, idx)
+    return [float(part[i]) for i in idx]
+
+
+class _Histogram:
+    """
+    Fixed-size log-linear histogram (HdrHistogram-style).
+
+    Values are bucketed by log2 with SUB_BUCKETS buckets per power of two,
+    giving ~4% relative error on quantiles while memory stays constant no
+    matter how many requests a test sends. Sum and count are kept exactly
+    so the mean is not affected by bucketing.
+    """
+
+    NUM_BUCKETS = 2048
+    SUB_BUCKETS = 16
+    MIN_VALUE = 1e-6
+    # floor(log2(MIN_VALUE) * SUB_BUCKETS) == -319, so every value maps to a bucket >= 0
+    OFFSET = 320
 
     def __init__(self):
-        self._lock = threading.Lock()
-        self.reset()
+        self.buckets = np.zeros(self.NUM_BUCKETS, dtype=np.uint32)
+        self.count = 0
+        self.total = 0.0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, value: float):
+        """Count a single observation."""
+        idx = math.floor(math.log2(max(value, self.MIN_VALUE)) * self.SUB_BUCKETS) + self.OFFSET
+        self.buckets[min(idx, self.NUM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+
+    def record_many(self, values: np.ndarray):
+        """Count an array of observations in one vectorized pass."""
+        if values.size == 0:
+            return
+        idx = np.floor(np.log2(np.maximum(values, self.MIN_VALUE)) * self.SUB_BUCKETS).astype(np.intp)
+        idx += self.OFFSET
+        np.minimum(idx, self.NUM_BUCKETS - 1, out=idx)
+        self.buckets += np.bincount(idx, minlength=self.NUM_BUCKETS).astype(np.uint32)
+        self.count += int(values.size)
+        self.total += float(values.sum())
+
+    def snapshot(self) -> dict:
+        """Serializable form for shipping to the Locust master."""
+        return {"buckets": self.buckets.tobytes(), "count": self.count, "total": self.total}
+
+    def merge_snapshot(self, snap: dict):
+        """Add counts from a snapshot() produced by another process."""
+        self.buckets += np.frombuffer(snap["buckets"], dtype=np.uint32)
+        self.count += snap["count"]
+        self.total += snap["total"]
+
+    def summary(self, qs: tuple[float, ...]) -> tuple[float, list[float]]:
+        """Return (mean, [quantile for q in qs])."""
+        cumulative = np.cumsum(self.buckets)
+        values = []
+        for q in qs:
+            rank = min(int(self.count * q), self.count - 1)
+            idx = int(np.searchsorted(cumulative, rank, side="right"))
+            # Geometric midpoint of the bucket
+            values.append(2 ** ((idx - self.OFFSET + 0.5) / self.SUB_BUCKETS))
+        return self.total / self.count, values
+
+
+class _MetricsState:
+    """Aggregated ML metrics. Mutated only under the collector's state lock."""
 
-    def reset(self):
-        """Reset all counters for a fresh test run."""
-        with self._lock:
-            # Per-variant request counts
-            self.variant_counts = defaultdict(int)  # champion / challenger / holdout / rules_only
-            # Per-variant ML scores (for distribution analysis)
-            self.variant_scores = defaultdict(list)
-            # Per-variant decision distribution
-            self.variant_decisions = defaultdict(lambda: defaultdict(int))
-            # Component latency tracking (ms)
-            self.scoring_latencies = []
-            self.feature_latencies = []
-            self.total_latencies = []
-            # Per-variant risk scores (rules + ML combined)
-            self.variant_risk_scores = defaultdict(list)
-            # Model version tracking
-            self.model_versions_seen = set()
-            # SLA tracking
-            self.scoring_sla_breaches = 0  # scoring_time_ms > 25ms target
-            self.total_sla_breaches = 0    # processing_time_ms > 200ms target
-            self.total_tracked = 0
+    def __init__(self):
+        # Per-variant request counts
+        self.variant_counts = defaultdict(int)  # champion / challenger / holdout / rules_only
+        # Per-variant ML scores (for distribution analysis)
+        self.variant_scores = defaultdict(_Histogram)
+        # Per-variant decision distribution
+        self.variant_decisions = Counter()  # (variant, decision) -> count
+        # Union of decisions across all variants (report column headers)
+        self.all_decisions_seen = set()
+        # Component latency tracking (ms)
+        self.scoring_latencies = _Histogram()
+        self.feature_latencies = _Histogram()
+        self.total_latencies = _Histogram()
+        # Per-variant risk scores (rules + ML combined)
+        self.variant_risk_scores = defaultdict(lambda: array.array("d"))
+        # Running per-variant risk score sum, so report() needs no extra pass for the mean
+        self.variant_risk_sum = defaultdict(float)
+        # Model version tracking
+        self.model_versions_seen = set()  # (variant, model_version)
+        # SLA tracking
+        self.scoring_sla_breaches = 0  # scoring_time_ms > 25ms target
+        self.total_sla_breaches = 0    # processing_time_ms > 200ms target
+        self.total_tracked = 0
+
+    def add_batch(self, batch: list[dict]):
+        """
+        Fold a batch of /decide API responses into the aggregate.
 
-    def record(self, data: dict):
+        Per-response categorical fields (variant, decision, scores, model
+        version) are folded one at a time; component latencies and SLA
+        breaches are computed for the whole batch with numpy.
         """
-        Record ML metrics from a single /decide API response.
+        for data in batch:
+            self._add_categorical(data)
+
+        n = len(batch)
+        scoring = np.fromiter((d.get("scoring_time_ms", 0.0) for d in batch), dtype=np.float64, count=n)
+        feature = np.fromiter((d.get("feature_time_ms", 0.0) for d in batch), dtype=np.float64, count=n)
+        processing = np.fromiter((d.get("processing_time_ms", 0.0) for d in batch), dtype=np.float64, count=n)
+
+        # Latencies
+        self.scoring_latencies.record_many(scoring[scoring > 0])
+        self.feature_latencies.record_many(feature[feature > 0])
+        self.total_latencies.record_many(processing[processing > 0])
 
-        Extracts ml_score, model_variant, model_version from nested `scores`,
-        and component latencies from top-level timing fields.
+        # SLA breach tracking
+        self.scoring_sla_breaches += int(np.count_nonzero(scoring > SCORING_SLA_MS))
+        self.total_sla_breaches += int(np.count_nonzero(processing > E2E_SLA_MS))
+
+    def snapshot(self) -> dict:
         """
-        scores = data.get("scores", {})
-        ml_score = scores.get("ml_score")
-        model_variant = scores.get("model_variant")
-        model_version = scores.get("model_version")
-        risk_score = scores.get("risk_score", 0.0)
-        decision = data.get("decision", "UNKNOWN")
+        Serializable form for shipping to the Locust master.
 
-        scoring_time = data.get("scoring_time_ms", 0.0)
-        feature_time = data.get("feature_time_ms", 0.0)
-        processing_time = data.get("processing_time_ms", 0.0)
+        Only str keys, lists, numbers and bytes, so it survives Locust's
+        msgpack transport.
+        """
+        return {
+            "variant_counts": dict(self.variant_counts),
+            "variant_scores": {v: h.snapshot() for v, h in self.variant_scores.items()},
+            "variant_decisions": [[v, d, c] for (v, d), c in self.variant_decisions.items()],
+            "scoring_latencies": self.scoring_latencies.snapshot(),
+            "feature_latencies": self.feature_latencies.snapshot(),
+            "total_latencies": self.total_latencies.snapshot(),
+            "variant_risk_scores": {v: a.tobytes() for v, a in self.variant_risk_scores.items()},
+            "variant_risk_sum": dict(self.variant_risk_sum),
+            "model_versions_seen": [list(mv) for mv in self.model_versions_seen],
+            "scoring_sla_breaches": self.scoring_sla_breaches,
+            "total_sla_breaches": self.total_sla_breaches,
+            "total_tracked": self.total_tracked,
+        }
+
+    def merge_snapshot(self, snap: dict):
+        """Fold a snapshot() from another process into this aggregate."""
+        for variant, count in snap["variant_counts"].items():
+            self.variant_counts[variant] += count
+        for variant, hist in snap["variant_scores"].items():
+            self.variant_scores[variant].merge_snapshot(hist)
+        for variant, decision, count in snap["variant_decisions"]:
+            self.variant_decisions[(variant, decision)] += count
+            self.all_decisions_seen.add(decision)
+        self.scoring_latencies.merge_snapshot(snap["scoring_latencies"])
+        self.feature_latencies.merge_snapshot(snap["feature_latencies"])
+        self.total_latencies.merge_snapshot(snap["total_latencies"])
+        for variant, raw in snap["variant_risk_scores"].items():
+            self.variant_risk_scores[variant].frombytes(raw)
+        for variant, total in snap["variant_risk_sum"].items():
+            self.variant_risk_sum[variant] += total
+        self.model_versions_seen.update(tuple(mv) for mv in snap["model_versions_seen"])
+        self.scoring_sla_breaches += snap["scoring_sla_breaches"]
+        self.total_sla_breaches += snap["total_sla_breaches"]
+        self.total_tracked += snap["total_tracked"]
+
+    def _add_categorical(self, data: dict):
+        """Fold the per-variant fields of a single response (nested under `scores`)."""
+        data_get = data.get
+        scores_get = data_get("scores", {}).get
+        ml_score = scores_get("ml_score")
+        model_variant = scores_get("model_variant")
+        model_version = scores_get("model_version")
+        risk_score = scores_get("risk_score", 0.0)
+        decision = data_get("decision", "UNKNOWN")
 
         # Determine variant bucket: use model_variant if present, else rules_only
-        variant = model_variant if model_variant else "rules_only"
+        variant = _VARIANT_INTERN.get(model_variant, model_variant or "rules_only")
+
+        self.total_tracked += 1
 
-        with self._lock:
-            self.total_tracked += 1
+        # Variant routing
+        self.variant_counts[variant] += 1
 
-            # Variant routing
-            self.variant_counts[variant] += 1
+        # ML score distribution (only when ML actually scored)
+        if ml_score is not None:
+            self.variant_scores[variant].record(ml_score)
 
-            # ML score distribution (only when ML actually scored)
-            if ml_score is not None:
-                self.variant_scores[variant].append(ml_score)
+        # Risk score per variant (always available)
+        self.variant_risk_scores[variant].append(risk_score)
+        self.variant_risk_sum[variant] += risk_score
 
-            # Risk score per variant (always available)
-            self.variant_risk_scores[variant].append(risk_score)
+        # Decision breakdown per variant
+        self.variant_decisions[(variant, decision)] += 1
+        self.all_decisions_seen.add(decision)
 
-            # Decision breakdown per variant
-            self.variant_decisions[variant][decision] += 1
+        # Model version tracking
+        if model_version:
+            self.model_versions_seen.add((variant, model_version))
 
-            # Latencies
-            if scoring_time > 0:
-                self.scoring_latencies.append(scoring_time)
-            if feature_time > 0:
-                self.feature_latencies.append(feature_time)
-            if processing_time > 0:
-                self.total_latencies.append(processing_time)
 
-            # Model version tracking
-            if model_version:
-                self.model_versions_seen.add(f"{variant}:{model_version}")
+class MLMetricsCollector:
+    """
+    Collects ML scoring metrics across all Locust users.
 
-            # SLA breach tracking
-            if scoring_time > 25:
-                self.scoring_sla_breaches += 1
-            if processing_time > 200:
-                self.total_sla_breaches += 1
+    record() only queues the response; a daemon thread drains the queue in
+    batches and folds it into _MetricsState, keeping aggregation out of the
+    request's measured window.
+    """
+
+    DRAIN_BATCH = 256
+    DRAIN_INTERVAL_S = 0.1
+
+    def __init__(self):
+        self._queue = deque()
+        # Serializes folding between the drain thread and report()/reset()
+        self._state_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._drain_thread = None
+        self.reset()
+
+    def reset(self):
+        """Reset all counters for a fresh test run."""
+        with self._state_lock:
+            self._queue.clear()
+            self._state = _MetricsState()
+
+    def record(self, data: dict):
+        """Queue a single /decide API response for aggregation (deque.append is atomic)."""
+        self._queue.append(data)
+        if self._drain_thread is None:
+            self._start_drain()
+
+    def _start_drain(self):
+        with self._start_lock:
+            if self._drain_thread is None:
+                self._stop.clear()
+                self._drain_thread = threading.Thread(
+                    target=self._drain_loop, name="ml-metrics-drain", daemon=True
+                )
+                self._drain_thread.start()
+
+    def _drain_loop(self):
+        while not self._stop.wait(self.DRAIN_INTERVAL_S):
+            self._drain()
+
+    def _drain(self):
+        """Fold everything currently queued into the aggregate, DRAIN_BATCH at a time."""
+        queue = self._queue
+        while queue:
+            batch = []
+            for _ in range(self.DRAIN_BATCH):
+                try:
+                    batch.append(queue.popleft())
+                except IndexError:
+                    break
+            with self._state_lock:
+                self._state.add_batch(batch)
+
+    def drain_and_join(self):
+        """Stop the drain thread and fold any remaining queued responses."""
+        with self._start_lock:
+            thread, self._drain_thread = self._drain_thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        self._drain()
+
+    def take_snapshot(self) -> dict:
+        """Drain, then hand off the current aggregate as a snapshot and start a fresh one."""
+        self._drain()
+        with self._state_lock:
+            state, self._state = self._state, _MetricsState()
+        return state.snapshot()
+
+    def merge_snapshot(self, snap: dict):
+        """Fold another process's take_snapshot() into this collector."""
+        with self._state_lock:
+            self._state.merge_snapshot(snap)
 
     def report(self) -> str:
         """Generate a formatted ML metrics report for test_stop output."""
-        with self._lock:
-            if self.total_tracked == 0:
+        self._drain()
+        with self._state_lock:
+            m = self._state
+            if m.total_tracked == 0:
                 return "  No ML metrics collected (0 successful requests)."
 
             lines = []
@@ -136,9 +378,9 @@ class MLMetricsCollector:
             # --- Variant Routing Distribution ---
             lines.append("  VARIANT ROUTING DISTRIBUTION")
             lines.append("  " + "-" * 56)
-            total = self.total_tracked
-            for variant in sorted(self.variant_counts.keys()):
-                count = self.variant_counts[variant]
+            total = m.total_tracked
+            for variant in sorted(m.variant_counts.keys()):
+                count = m.variant_counts[variant]
                 pct = (count / total) * 100
                 bar = "#" * int(pct / 2)
                 lines.append(f"    {variant:<14} {count:>6} ({pct:5.1f}%)  {bar}")
@@ -146,27 +388,22 @@ class MLMetricsCollector:
             lines.append("")
 
             # --- Model Versions Observed ---
-            if self.model_versions_seen:
+            if m.model_versions_seen:
                 lines.append("  MODEL VERSIONS OBSERVED")
                 lines.append("  " + "-" * 56)
-                for mv in sorted(self.model_versions_seen):
-                    lines.append(f"    {mv}")
+                for variant, model_version in sorted(m.model_versions_seen):
+                    lines.append(f"    {variant}:{model_version}")
                 lines.append("")
 
             # --- ML Score Distribution Per Variant ---
-            ml_variants = {v: s for v, s in self.variant_scores.items() if s}
+            ml_variants = {v: s for v, s in m.variant_scores.items() if s}
             if ml_variants:
                 lines.append("  ML SCORE DISTRIBUTION (per variant)")
                 lines.append("  " + "-" * 56)
                 lines.append(f"    {'Variant':<14} {'Count':>6} {'Mean':>7} {'P50':>7} {'P95':>7} {'P99':>7}")
                 for variant in sorted(ml_variants.keys()):
-                    scores = ml_variants[variant]
-                    sorted_scores = sorted(scores)
-                    n = len(sorted_scores)
-                    mean = statistics.mean(sorted_scores)
-                    p50 = sorted_scores[int(n * 0.5)] if n > 0 else 0
-                    p95 = sorted_scores[min(int(n * 0.95), n - 1)] if n > 0 else 0
-                    p99 = sorted_scores[min(int(n * 0.99), n - 1)] if n > 0 else 0
+                    n = len(ml_variants[variant])
+                    mean, (p50, p95, p99) = ml_variants[variant].summary((0.5, 0.95, 0.99))
                     lines.append(f"    {variant:<14} {n:>6} {mean:>7.4f} {p50:>7.4f} {p95:>7.4f} {p99:>7.4f}")
                 lines.append("")
 
@@ -174,28 +411,27 @@ class MLMetricsCollector:
             lines.append("  RISK SCORE BY VARIANT (combined ML + rules)")
             lines.append("  " + "-" * 56)
             lines.append(f"    {'Variant':<14} {'Count':>6} {'Mean':>7} {'P50':>7} {'P95':>7}")
-            for variant in sorted(self.variant_risk_scores.keys()):
-                scores = sorted(self.variant_risk_scores[variant])
+            for variant in sorted(m.variant_risk_scores.keys()):
+                scores = m.variant_risk_scores[variant]
                 n = len(scores)
                 if n > 0:
-                    mean = statistics.mean(scores)
-                    p50 = scores[int(n * 0.5)]
-                    p95 = scores[min(int(n * 0.95), n - 1)]
+                    mean = m.variant_risk_sum[variant] / n
+                    p50, p95 = _quantiles(scores, (0.5, 0.95))
                     lines.append(f"    {variant:<14} {n:>6} {mean:>7.4f} {p50:>7.4f} {p95:>7.4f}")
             lines.append("")
 
             # --- Decision Distribution Per Variant ---
             lines.append("  DECISIONS BY VARIANT")
             lines.append("  " + "-" * 56)
-            all_decisions = sorted(set(
-                d for vd in self.variant_decisions.values() for d in vd.keys()
-            ))
+            all_decisions = sorted(m.all_decisions_seen)
             header = f"    {'Variant':<14}" + "".join(f" {d:>9}" for d in all_decisions)
             lines.append(header)
-            for variant in sorted(self.variant_decisions.keys()):
+            # Every tracked response has exactly one decision, so variant_counts
+            # lists the same variants; Counter lookups of missing pairs yield 0
+            for variant in sorted(m.variant_counts.keys()):
                 row = f"    {variant:<14}"
                 for d in all_decisions:
-                    count = self.variant_decisions[variant].get(d, 0)
+                    count = m.variant_decisions[(variant, d)]
                     row += f" {count:>9}"
                 lines.append(row)
             lines.append("")
@@ -204,17 +440,12 @@ class MLMetricsCollector:
             lines.append("  COMPONENT LATENCY (ms)")
             lines.append("  " + "-" * 56)
             for label, latencies in [
-                ("Feature", self.feature_latencies),
-                ("Scoring", self.scoring_latencies),
-                ("Total E2E", self.total_latencies),
+                ("Feature", m.feature_latencies),
+                ("Scoring", m.scoring_latencies),
+                ("Total E2E", m.total_latencies),
             ]:
                 if latencies:
-                    sorted_lat = sorted(latencies)
-                    n = len(sorted_lat)
-                    mean = statistics.mean(sorted_lat)
-                    p50 = sorted_lat[int(n * 0.5)]
-                    p95 = sorted_lat[min(int(n * 0.95), n - 1)]
-                    p99 = sorted_lat[min(int(n * 0.99), n - 1)]
+                    mean, (p50, p95, p99) = latencies.summary((0.5, 0.95, 0.99))
                     lines.append(
                         f"    {label:<12} mean={mean:>7.1f}  P50={p50:>7.1f}  "
                         f"P95={p95:>7.1f}  P99={p99:>7.1f}"
@@ -224,12 +455,12 @@ class MLMetricsCollector:
             # --- SLA Compliance ---
             lines.append("  SLA COMPLIANCE")
             lines.append("  " + "-" * 56)
-            scoring_pct = ((total - self.scoring_sla_breaches) / total) * 100 if total else 0
-            total_pct = ((total - self.total_sla_breaches) / total) * 100 if total else 0
+            scoring_pct = ((total - m.scoring_sla_breaches) / total) * 100 if total else 0
+            total_pct = ((total - m.total_sla_breaches) / total) * 100 if total else 0
             lines.append(f"    Scoring (<25ms target):     {scoring_pct:.1f}% compliant  "
-                         f"({self.scoring_sla_breaches} breaches)")
+                         f"({m.scoring_sla_breaches} breaches)")
             lines.append(f"    End-to-end (<200ms target): {total_pct:.1f}% compliant  "
-                         f"({self.total_sla_breaches} breaches)")
+                         f"({m.total_sla_breaches} breaches)")
 
             return "\n".join(lines)
 
@@ -238,7 +469,113 @@ class MLMetricsCollector:
 ml_metrics = MLMetricsCollector()
 
 
-class FraudDetectionUser(HttpUser):
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def send_decision(client, payload: dict | bytes, name: str, enforce_sla: bool = True) -> None:
+    """
+    POST a transaction to /decide, feed the ML metrics collector, and mark the result.
+
+    Shared by every user class so the hot request path lives in one place.
+    Extracts ML scoring metadata (model variant, ML score, component latencies)
+    from each response so we can validate champion/challenger routing ratios,
+    score distributions, and per-component latency budgets under load.
+
+    Args:
+        client: Locust HTTP client of the calling user
+        payload: Transaction payload, or an already-serialized JSON body
+        name: Locust stats name for the request
+        enforce_sla: Fail the request when processing_time_ms exceeds the
+            E2E SLA. Attackers disable this; only the decision outcome matters.
+    """
+    if isinstance(payload, bytes):
+        body = {"data": payload, "headers": _JSON_HEADERS}
+    else:
+        body = {"json": payload}
+
+    with client.post(
+        "/decide",
+        name=name,
+        catch_response=True,
+        **body,
+    ) as response:
+        if response.status_code == 200:
+            data = json_loads(response.content)
+
+            # Feed ML metrics collector
+            ml_metrics.record(data)
+
+            # Fail if total latency exceeds end-to-end SLA
+            processing_time = data.get("processing_time_ms", 0)
+            if enforce_sla and processing_time > E2E_SLA_MS:
+                response.failure(f"SLA breach: {processing_time:.1f}ms > {E2E_SLA_MS}ms")
+            else:
+                response.success()
+        elif response.status_code == 422:
+            response.failure(f"Validation error: {response.text}")
+        else:
+            response.failure(f"HTTP {response.status_code}: {response.text}")
+
+
+# ---------------------------------------------------------------------------
+# Pre-serialized legitimate payloads
+# Legitimate traffic is 95% of the mix. Rather than building and encoding a
+# fresh dict per request, each process serializes a pool of templates once
+# and splices per-request values into the bytes. Only the static fields
+# (device/geo attributes, verification, channel, ...) come from the
+# template: the entities and the amount are drawn from the data_generator
+# pools on every request, so velocity and profile features see the same
+# entity cardinality as freshly generated traffic.
+# ---------------------------------------------------------------------------
+
+LEGIT_TEMPLATE_POOL_SIZE = 256
+_TXN_ID_PLACEHOLDER = "__TXN_ID__"
+_TIMESTAMP_PLACEHOLDER = "__TIMESTAMP__"
+_CARD_PLACEHOLDER = "__CARD__"
+_DEVICE_PLACEHOLDER = "__DEVICE__"
+_IP_PLACEHOLDER = "__IP__"
+_SUBSCRIBER_PLACEHOLDER = "__SUBSCRIBER__"
+_SERVICE_PLACEHOLDER = "__SERVICE__"
+# Quoted in the serialized template; replaced with a bare JSON integer
+_AMOUNT_PLACEHOLDER = "__AMOUNT__"
+
+
+@cache
+def _legit_templates() -> tuple[tuple[str, bytes], ...]:
+    """(event_subtype, serialized template) pairs; the subtype drives the amount."""
+    templates = []
+    for _ in range(LEGIT_TEMPLATE_POOL_SIZE):
+        payload = generate_transaction()
+        payload["transaction_id"] = _TXN_ID_PLACEHOLDER
+        payload["idempotency_key"] = f"idem_{_TXN_ID_PLACEHOLDER}"
+        payload["timestamp"] = _TIMESTAMP_PLACEHOLDER
+        payload["card_token"] = _CARD_PLACEHOLDER
+        payload["device"]["device_id"] = _DEVICE_PLACEHOLDER
+        payload["geo"]["ip_address"] = _IP_PLACEHOLDER
+        payload["subscriber_id"] = _SUBSCRIBER_PLACEHOLDER
+        payload["service_id"] = _SERVICE_PLACEHOLDER
+        payload["amount_cents"] = _AMOUNT_PLACEHOLDER
+        templates.append((payload["event_subtype"], json_dumps(payload)))
+    return tuple(templates)
+
+
+def legit_transaction_body() -> bytes:
+    """Return a legitimate /decide body with fresh ids, entities, amount and timestamp."""
+    event_subtype, template = random.choice(_legit_templates())
+    return (
+        template
+        .replace(_TXN_ID_PLACEHOLDER.encode(), uuid4().hex.encode())
+        .replace(_TIMESTAMP_PLACEHOLDER.encode(), datetime.now(UTC).isoformat().encode())
+        .replace(_CARD_PLACEHOLDER.encode(), get_random_card().encode())
+        .replace(_DEVICE_PLACEHOLDER.encode(), get_random_device().encode())
+        .replace(_IP_PLACEHOLDER.encode(), get_random_ip().encode())
+        .replace(_SUBSCRIBER_PLACEHOLDER.encode(), get_random_subscriber().encode())
+        .replace(_SERVICE_PLACEHOLDER.encode(), get_random_account().encode())
+        .replace(f'"{_AMOUNT_PLACEHOLDER}"'.encode(), str(generate_amount(event_subtype)).encode())
+    )
+
+
+class FraudDetectionUser(FastHttpUser):
     """
     Simulates a telco payment processor sending transactions for fraud decisions.
 
@@ -254,16 +591,16 @@ class FraudDetectionUser(HttpUser):
     wait_time = between(0.1, 0.5)
 
     def on_start(self):
-        """Called when a user starts. Verify API is healthy."""
+        """Called when a user starts. Verify API is healthy and warm the template pool."""
         response = self.client.get("/health")
         if response.status_code != 200:
             print(f"WARNING: Health check failed: {response.status_code}")
+        _legit_templates()
 
     @task(95)
     def legitimate_transaction(self):
         """Normal legitimate transaction - 95% of traffic."""
-        payload = generate_transaction()
-        self._send_decision_request(payload, "legitimate")
+        self._send_decision_request(legit_transaction_body(), "legitimate")
 
     @task(2)
     def card_testing_attack(self):
@@ -301,40 +638,38 @@ class FraudDetectionUser(HttpUser):
         payload = generate_high_value_new_subscriber_transaction()
         self._send_decision_request(payload, "high_value_new_subscriber")
 
-    def _send_decision_request(self, payload: dict, scenario: str):
-        """
-        Send decision request, enforce SLA, and feed ML metrics collector.
+    def _send_decision_request(self, payload: dict | bytes, scenario: str):
+        """Send decision request for a mixed-traffic scenario, enforcing the E2E SLA."""
+        send_decision(self.client, payload, f"/decide [{scenario}]")
 
-        Extracts ML scoring metadata (model variant, ML score, component latencies)
-        from each response so we can validate champion/challenger routing ratios,
-        score distributions, and per-component latency budgets under load.
-        """
-        with self.client.post(
-            "/decide",
-            json=payload,
-            name=f"/decide [{scenario}]",
-            catch_response=True
-        ) as response:
-            if response.status_code == 200:
-                data = response.json()
-                decision = data.get("decision", "unknown")
-                processing_time = data.get("processing_time_ms", 0)
-
-                # Feed ML metrics collector
-                ml_metrics.record(data)
-
-                # Fail if total latency exceeds end-to-end SLA
-                if processing_time > 200:
-                    response.failure(f"SLA breach: {processing_time:.1f}ms > 200ms")
-                else:
-                    response.success()
-            elif response.status_code == 422:
-                response.failure(f"Validation error: {response.text}")
-            else:
-                response.failure(f"HTTP {response.status_code}: {response.text}")
+
+# ---------------------------------------------------------------------------
+# Attacker card pools
+# Tokens are generated once per process from a single random draw; each
+# spawned attacker takes the next ATTACK_CARDS_PER_USER of them.
+# ---------------------------------------------------------------------------
+
+ATTACK_CARDS_PER_USER = 3
+_TOKEN_POOL_SIZE = 10_000
+
+
+def _token_pool(prefix: str) -> list[str]:
+    raw = secrets.token_hex(4 * _TOKEN_POOL_SIZE)
+    return [f"{prefix}_{raw[i:i + 8]}" for i in range(0, len(raw), 8)]
 
 
-class SIMFarmAttacker(HttpUser):
+_FARM_TOKENS = _token_pool("card_farm")
+_TEST_TOKENS = _token_pool("card_test")
+_pool_cursor = itertools.count(0, ATTACK_CARDS_PER_USER)
+
+
+def _take_attack_cards(pool: list[str]) -> list[str]:
+    """Return the next block of cards from a pool, wrapping around at the end."""
+    start = next(_pool_cursor)
+    return [pool[(start + i) % len(pool)] for i in range(ATTACK_CARDS_PER_USER)]
+
+
+class SIMFarmAttacker(FastHttpUser):
     """
     Dedicated SIM farm attacker simulation.
 
@@ -348,34 +683,21 @@ class SIMFarmAttacker(HttpUser):
     def on_start(self):
         """Initialize attacker's card pool."""
         # Each attacker has a small pool of cards they're using for SIM farm
-        self.attack_cards = [f"card_farm_{uuid4().hex[:8]}" for _ in range(3)]
-        self.current_card_idx = 0
+        self.attack_cards = _take_attack_cards(_FARM_TOKENS)
+        self._card_iter = itertools.cycle(self.attack_cards)
 
     @task
     def rapid_sim_activation(self):
         """Rapid SIM activations - cycles through small card pool."""
-        card_token = self.attack_cards[self.current_card_idx]
-        self.current_card_idx = (self.current_card_idx + 1) % len(self.attack_cards)
+        card_token = next(self._card_iter)
 
         payload = generate_sim_farm_transaction(card_token=card_token)
 
-        with self.client.post(
-            "/decide",
-            json=payload,
-            name="/decide [sim_farm_attack]",
-            catch_response=True
-        ) as response:
-            if response.status_code == 200:
-                data = response.json()
-                decision = data.get("decision", "unknown")
-                ml_metrics.record(data)
-                # We expect BLOCK or FRICTION after velocity threshold
-                response.success()
-            else:
-                response.failure(f"HTTP {response.status_code}")
+        # We expect BLOCK or FRICTION after velocity threshold
+        send_decision(self.client, payload, "/decide [sim_farm_attack]", enforce_sla=False)
 
 
-class CardTestingUser(HttpUser):
+class CardTestingUser(FastHttpUser):
     """
     Dedicated card testing attacker simulation.
 
@@ -389,34 +711,21 @@ class CardTestingUser(HttpUser):
     def on_start(self):
         """Initialize attacker's card pool."""
         # Each attacker has a small pool of cards they're testing
-        self.attack_cards = [f"card_test_{uuid4().hex[:8]}" for _ in range(3)]
-        self.current_card_idx = 0
+        self.attack_cards = _take_attack_cards(_TEST_TOKENS)
+        self._card_iter = itertools.cycle(self.attack_cards)
 
     @task
     def rapid_card_test(self):
         """Rapid card testing via small topups - cycles through card pool."""
-        card_token = self.attack_cards[self.current_card_idx]
-        self.current_card_idx = (self.current_card_idx + 1) % len(self.attack_cards)
+        card_token = next(self._card_iter)
 
         payload = generate_card_testing_transaction(card_token=card_token)
 
-        with self.client.post(
-            "/decide",
-            json=payload,
-            name="/decide [card_testing_attack]",
-            catch_response=True
-        ) as response:
-            if response.status_code == 200:
-                data = response.json()
-                decision = data.get("decision", "unknown")
-                ml_metrics.record(data)
-                # We expect BLOCK or FRICTION after velocity threshold
-                response.success()
-            else:
-                response.failure(f"HTTP {response.status_code}")
+        # We expect BLOCK or FRICTION after velocity threshold
+        send_decision(self.client, payload, "/decide [card_testing_attack]", enforce_sla=False)
 
 
-class SteadyStateUser(HttpUser):
+class SteadyStateUser(FastHttpUser):
     """
     Steady state testing - only legitimate traffic.
 
@@ -428,28 +737,35 @@ class SteadyStateUser(HttpUser):
     @task
     def legitimate_only(self):
         """Only legitimate transactions for clean baseline."""
-        payload = generate_transaction()
-
-        with self.client.post(
-            "/decide",
-            json=payload,
-            name="/decide [steady_state]",
-            catch_response=True
-        ) as response:
-            if response.status_code == 200:
-                data = response.json()
-                processing_time = data.get("processing_time_ms", 0)
-                ml_metrics.record(data)
-                if processing_time > 200:
-                    response.failure(f"SLA breach: {processing_time:.1f}ms")
-                else:
-                    response.success()
-            else:
-                response.failure(f"HTTP {response.status_code}")
+        send_decision(self.client, legit_transaction_body(), "/decide [steady_state]")
 
 
 # Event handlers for custom metrics and reporting
 
+# Runner of this process, for handlers (like quit) that don't receive the environment
+_runner = None
+
+
+@events.init.add_listener
+def on_locust_init(environment, **kwargs):
+    global _runner
+    _runner = environment.runner
+
+
+@events.report_to_master.add_listener
+def on_report_to_master(client_id, data, **kwargs):
+    """Worker: attach the ML metrics gathered since the last report (incl. the final one)."""
+    data["ml_metrics"] = ml_metrics.take_snapshot()
+
+
+@events.worker_report.add_listener
+def on_worker_report(client_id, data, **kwargs):
+    """Master: fold a worker's ML metrics delta into the combined collector."""
+    snapshot = data.get("ml_metrics")
+    if snapshot:
+        ml_metrics.merge_snapshot(snapshot)
+
+
 @events.test_start.add_listener
 def on_test_start(environment, **kwargs):
     """Called when test starts. Resets ML metrics collector and prints banner."""
@@ -479,6 +795,10 @@ def on_test_start(environment, **kwargs):
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
     """Called when test stops. Prints Locust stats + detailed ML metrics report."""
+    if isinstance(environment.runner, WorkerRunner):
+        # Workers ship their metrics with the regular stats reports; the master prints
+        return
+
     print()
     print("=" * 60)
     print("LOAD TEST COMPLETE")
@@ -495,24 +815,29 @@ def on_test_stop(environment, **kwargs):
         print(f"  P99 response:     {stats.get_response_time_percentile(0.99):.2f}ms")
         print(f"  Requests/sec:     {stats.total_rps:.2f}")
 
-    # Print ML-specific metrics report
+    if isinstance(environment.runner, MasterRunner):
+        # Workers' final reports arrive after the master's test_stop; see on_quit
+        print()
+        print("  ML scoring metrics are printed at shutdown, once all workers have reported.")
+        print("=" * 60)
+        return
+
+    print_ml_metrics()
+
+
+@events.quit.add_listener
+def on_quit(exit_code, **kwargs):
+    """Master: print the combined ML report after every worker's final stats report."""
+    if isinstance(_runner, MasterRunner):
+        print_ml_metrics()
+
+
+def print_ml_metrics():
+    """Print the ML-specific metrics report."""
     print()
     print("-" * 60)
     print("ML SCORING METRICS")
     print("-" * 60)
+    ml_metrics.drain_and_join()
     print(ml_metrics.report())
     print("=" * 60)
-
-
-@events.request.add_listener
-def on_request(request_type, name, response_time, response_length, response, context, exception, **kwargs):
-    """
-    Called on every request for cross-cutting SLA monitoring.
-
-    Note: ML-specific metrics (variant routing, scores, component latencies) are
-    captured in _send_decision_request via ml_metrics.record(). This listener
-    handles Locust-level response_time tracking which includes HTTP overhead.
-    """
-    # Locust response_time includes network round-trip; API processing_time_ms
-    # is the server-side measurement used for SLA in ml_metrics.
-    pass
@@ -237,6 +237,8 @@ CREATE TABLE IF NOT EXISTS policy_versions (
 );
 
 CREATE INDEX IF NOT EXISTS idx_policy_versions_created_at ON policy_versions(created_at);
+-- Keyset pagination for GET /policy/versions: (created_at, id) DESC seek
+CREATE INDEX IF NOT EXISTS idx_policy_versions_created_at_id ON policy_versions(created_at, id);
 CREATE INDEX IF NOT EXISTS idx_policy_versions_is_active ON policy_versions(is_active);
 CREATE INDEX IF NOT EXISTS idx_policy_versions_version ON policy_versions(version);
 
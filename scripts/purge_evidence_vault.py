@@ -1,21 +1,67 @@
 """
 Purge expired records from the evidence vault.
 
-Intended to run as a daily cron/job.
+Intended to run as a daily cron/job. Rows are deleted in short batched
+transactions so the purge never holds long locks or bloats WAL, and can
+safely run alongside live traffic.
 """
 
+import time
+
 from sqlalchemy import create_engine, text
 
 from src.config import settings
 
+# Rows deleted per transaction
+PURGE_BATCH_SIZE = 10_000
+# Pause between batches to let autovacuum and replicas keep up
+PURGE_BATCH_PAUSE_S = 0.05
 
-def purge_expired() -> int:
-    engine = create_engine(settings.postgres_sync_url)
-    with engine.begin() as conn:
-        result = conn.execute(
-            text("DELETE FROM evidence_vault WHERE expires_at < NOW()")
+
+def _ensure_expires_index(engine) -> None:
+    """
+    Make sure the expires_at index from init_db.sql exists.
+
+    Vaults created before the index shipped would otherwise purge via a
+    full table scan. Built CONCURRENTLY (outside a transaction) so it never
+    blocks writers; a no-op when the index is already present.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(
+            text(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_vault_expires_at "
+                "ON evidence_vault(expires_at)"
+            )
         )
-        return result.rowcount or 0
+
+
+def purge_expired(batch_size: int = PURGE_BATCH_SIZE, pause_s: float = PURGE_BATCH_PAUSE_S) -> int:
+    engine = create_engine(settings.postgres_sync_url)
+    total = 0
+    try:
+        _ensure_expires_index(engine)
+        while True:
+            with engine.begin() as conn:
+                result = conn.execute(
+                    text(
+                        """
+                        DELETE FROM evidence_vault
+                        WHERE ctid IN (
+                            SELECT ctid FROM evidence_vault
+                            WHERE expires_at < NOW()
+                            LIMIT :batch_size
+                        )
+                        """
+                    ),
+                    {"batch_size": batch_size},
+                )
+                deleted = result.rowcount or 0
+            total += deleted
+            if deleted < batch_size:
+                return total
+            time.sleep(pause_s)
+    finally:
+        engine.dispose()
 
 
 if __name__ == "__main__":
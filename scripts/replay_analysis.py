@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 from datetime import datetime
 from pathlib import Path
 import sys
 
+import orjson
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -40,7 +41,15 @@ def main() -> None:
         postgres_url=args.postgres_url,
     )
 
-    print(json.dumps(results.to_dict(), indent=2))
+    out = sys.stdout.buffer
+    out.write(
+        orjson.dumps(
+            results.to_dict(),
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    )
+    out.write(b"\n")
+    out.flush()
 
 
 if __name__ == "__main__":
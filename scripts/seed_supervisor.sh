@@ -57,7 +57,7 @@ start_seeder() {
     --mature-ratio 0.8 --maturity-days 120 --backdate-captured-at \
     --concurrency "$CONCURRENCY" \
     --postgres-url "$POSTGRES_URL" \
-    --log-every 10000 \
+    --log-interval 30 \
     >> "$SEED_LOG" 2>&1 &
   echo $! > "$SEED_PID_FILE"
 }
@@ -10,33 +10,43 @@ Defaults align with the Phase 2 roadmap:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
+import bisect
+import functools
 import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta, UTC
 from pathlib import Path
-from typing import Iterable
+from typing import AsyncIterable, AsyncIterator, Sequence
 
+import asyncpg
 import numpy as np
-from sqlalchemy import create_engine, text
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.config import settings
-from src.ml.features import FEATURE_COLUMNS, extract_from_snapshot, vector_from_feature_dict
-from src.ml.registry import ModelEntry, ModelRegistry
+# src imports follow the sys.path bootstrap so the script runs from any cwd
+from src.config import settings  # noqa: E402
+from src.constants import CRIMINAL_REASON_CODES_SORTED  # noqa: E402
+from src.ml.features import FEATURE_COLUMNS, snapshot_select_columns  # noqa: E402
+from src.ml.registry import ModelEntry, ModelRegistry  # noqa: E402
 
 logger = logging.getLogger("fraud_detection.train")
 
-CRIMINAL_REASON_CODES = {
-    "10.1",
-    "10.2",
-    "10.3",
-    "10.4",
-    "10.5",
-}
+# Rows prefetched per round trip from the server-side cursor, and rows per
+# preallocated feature-matrix chunk
+TRAINING_FETCH_SIZE = 10_000
+
+# Below this many matrix cells, host<->device copies outweigh LightGBM's
+# CUDA speedup and CPU training is faster
+LGBM_CUDA_MIN_CELLS = 5_000_000
 
 
 def parse_args() -> argparse.Namespace:
@@ -49,6 +59,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--min-rows", type=int, default=1000)
     parser.add_argument("--min-auc", type=float, default=0.85)
     parser.add_argument("--validation-days", type=int, default=7)
+    parser.add_argument(
+        "--gpu",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Train on a CUDA device (default: auto-detect)",
+    )
     return parser.parse_args()
 
 
@@ -62,211 +78,392 @@ def compute_window(args: argparse.Namespace) -> tuple[datetime, datetime]:
     return start, end
 
 
-def load_training_rows(start: datetime, end: datetime) -> list[dict]:
-    engine = create_engine(settings.postgres_sync_url)
-    query = text(
-        """
+def training_query() -> str:
+    """
+    SQL for labeled evidence rows in [$1, $2), oldest first.
+
+    Rows without a JSON-object snapshot are skipped: the projected columns
+    default to 0, so they would otherwise train as all-zero feature vectors.
+    """
+    feature_sql = ",\n            ".join(snapshot_select_columns("e.features_snapshot"))
+    return f"""
         SELECT
-            e.transaction_id,
             e.captured_at,
-            e.features_snapshot,
-            MAX(
-                CASE
-                    WHEN c.fraud_type = 'CRIMINAL' THEN 1
-                    WHEN c.reason_code IN :reason_codes THEN 1
-                    ELSE 0
-                END
-            ) AS label
+            EXISTS (
+                SELECT 1 FROM chargebacks c
+                WHERE c.transaction_id = e.transaction_id
+                  AND (c.fraud_type = 'CRIMINAL' OR c.reason_code = ANY($3::text[]))
+            ) AS label,
+            {feature_sql}
         FROM transaction_evidence e
-        LEFT JOIN chargebacks c ON c.transaction_id = e.transaction_id
-        WHERE e.captured_at >= :start
-          AND e.captured_at < :end
-        GROUP BY e.transaction_id, e.captured_at, e.features_snapshot
+        WHERE e.captured_at >= $1
+          AND e.captured_at < $2
+          AND e.features_snapshot IS NOT NULL
+          AND jsonb_typeof(e.features_snapshot) = 'object'
         ORDER BY e.captured_at ASC
         """
-    )
-    with engine.begin() as conn:
-        rows = conn.execute(
-            query,
-            {
-                "start": start,
-                "end": end,
-                "reason_codes": tuple(CRIMINAL_REASON_CODES),
-            },
-        ).mappings().all()
-    return [dict(row) for row in rows]
-
-
-def build_dataset(rows: Iterable[dict]) -> tuple[np.ndarray, np.ndarray, list[datetime]]:
-    features_list: list[list[float]] = []
-    labels: list[int] = []
-    timestamps: list[datetime] = []
 
-    for row in rows:
-        snapshot = row.get("features_snapshot")
-        if snapshot is None:
-            continue
-        if isinstance(snapshot, str):
-            try:
-                snapshot = json.loads(snapshot)
-            except json.JSONDecodeError:
-                continue
-        if not isinstance(snapshot, dict):
-            continue
-        feature_dict = extract_from_snapshot(snapshot)
-        vector = vector_from_feature_dict(feature_dict)
-        features_list.append(vector)
-        labels.append(int(row.get("label") or 0))
-        timestamps.append(row.get("captured_at"))
-
-    if not features_list:
-        return np.array([]), np.array([]), []
-
-    return np.array(features_list, dtype=float), np.array(labels, dtype=int), timestamps
+
+async def load_training_rows(start: datetime, end: datetime) -> AsyncIterator[Sequence]:
+    """
+    Stream labeled evidence rows for the training window.
+
+    Feature columns are projected out of the JSONB snapshot by Postgres, so
+    each row is (captured_at, label, *FEATURE_COLUMNS) as plain numbers,
+    decoded from asyncpg's binary protocol. A server-side cursor holds only
+    TRAINING_FETCH_SIZE rows in memory at a time.
+    """
+    query = training_query()
+    conn = await asyncpg.connect(settings.postgres_sync_url)
+    try:
+        # Cursors only exist inside a transaction
+        async with conn.transaction(readonly=True):
+            cursor = conn.cursor(query, start, end, list(CRIMINAL_REASON_CODES_SORTED), prefetch=TRAINING_FETCH_SIZE)
+            async for record in cursor:
+                yield record
+    finally:
+        await conn.close()
+
+
+async def build_dataset(rows: AsyncIterable[Sequence]) -> tuple[np.ndarray, np.ndarray, list[datetime]]:
+    """
+    Build the feature matrix chunk by chunk.
+
+    Rows are (captured_at, label, *FEATURE_COLUMNS) as produced by
+    load_training_rows. Each chunk is a preallocated float32 block that the
+    projected feature values are written into in place.
+    """
+    n_cols = len(FEATURE_COLUMNS)
+    x_chunks: list[np.ndarray] = []
+    y_chunks: list[np.ndarray] = []
+    timestamps: list[datetime] = []
+    # GBDT libraries bin features from float32 internally; float64 would only
+    # double the bytes copied into DMatrix/Dataset
+    x_buf = np.empty((TRAINING_FETCH_SIZE, n_cols), dtype=np.float32)
+    y_buf = np.empty(TRAINING_FETCH_SIZE, dtype=np.uint8)
+    filled = 0
+
+    async for row in rows:
+        x_buf[filled] = row[2:]
+        y_buf[filled] = bool(row[1])
+        timestamps.append(row[0])
+        filled += 1
+        if filled == TRAINING_FETCH_SIZE:
+            x_chunks.append(x_buf.copy())
+            y_chunks.append(y_buf.copy())
+            filled = 0
+    if filled:
+        x_chunks.append(x_buf[:filled].copy())
+        y_chunks.append(y_buf[:filled].copy())
+
+    if not x_chunks:
+        return np.array([], dtype=np.float32), np.array([], dtype=np.uint8), []
+
+    # vstack of C-ordered chunks is already row-major; make it explicit so the
+    # DMatrix/Dataset builders never take their internal copy path
+    x = np.ascontiguousarray(np.vstack(x_chunks), dtype=np.float32)
+    return x, np.concatenate(y_chunks), timestamps
 
 
 def time_split(
-    X: np.ndarray,
+    x: np.ndarray,
     y: np.ndarray,
     timestamps: list[datetime],
     validation_days: int = 7,
 ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split rows into train/validation at `validation_days` before the newest row.
+
+    `timestamps` must be ascending (load_training_rows orders by captured_at),
+    so the cutoff is found by bisection and both halves are views of x/y.
+    """
     if not timestamps:
-        return X, y, np.array([]), np.array([])
+        return x, y, np.array([]), np.array([])
 
-    cutoff = max(timestamps) - timedelta(days=validation_days)
-    train_idx = [i for i, ts in enumerate(timestamps) if ts <= cutoff]
-    val_idx = [i for i, ts in enumerate(timestamps) if ts > cutoff]
+    cutoff = timestamps[-1] - timedelta(days=validation_days)
+    k = bisect.bisect_right(timestamps, cutoff)
 
-    if not val_idx:
-        return X, y, np.array([]), np.array([])
+    if k == len(timestamps):
+        return x, y, np.array([]), np.array([])
 
-    return X[train_idx], y[train_idx], X[val_idx], y[val_idx]
+    return x[:k], y[:k], x[k:], y[k:]
 
 
-def train_xgboost(X_train: np.ndarray, y_train: np.ndarray):
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """Best-effort check for a usable CUDA device."""
+    try:
+        import cupy
+
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        pass
+    nvidia_smi = shutil.which("nvidia-smi")
+    if nvidia_smi is None:
+        return False
+    try:
+        result = subprocess.run([nvidia_smi, "-L"], capture_output=True, text=True, timeout=10, check=False)
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return result.returncode == 0 and "GPU" in result.stdout
+
+
+def train_xgboost(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    use_gpu: bool = False,
+    n_jobs: int | None = None,
+):
     import xgboost as xgb
 
-    model = xgb.XGBClassifier(
-        n_estimators=200,
-        max_depth=6,
-        learning_rate=0.1,
-        subsample=0.8,
-        colsample_bytree=0.8,
-        eval_metric="auc",
-        tree_method="hist",
-    )
-    model.fit(X_train, y_train)
-    return model
-
-
-def train_lightgbm(X_train: np.ndarray, y_train: np.ndarray):
+    x_train = np.ascontiguousarray(x_train, dtype=np.float32)
+
+    def fit(device: str):
+        model = xgb.XGBClassifier(
+            n_estimators=200,
+            max_depth=6,
+            learning_rate=0.1,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            eval_metric="auc",
+            tree_method="hist",
+            device=device,
+            n_jobs=n_jobs,
+        )
+        model.fit(x_train, y_train)
+        return model
+
+    if use_gpu:
+        try:
+            model = fit("cuda")
+            # The API scores on CPU; don't persist the training device
+            model.set_params(device="cpu")
+            return model
+        except xgb.core.XGBoostError as exc:
+            # e.g. a CPU-only xgboost build on a GPU host
+            logger.warning("XGBoost CUDA training failed (%s); falling back to CPU", exc)
+    return fit("cpu")
+
+
+def train_lightgbm(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    use_gpu: bool = False,
+    n_jobs: int | None = None,
+):
     import lightgbm as lgb
 
-    model = lgb.LGBMClassifier(
-        n_estimators=200,
-        max_depth=-1,
-        learning_rate=0.05,
-        subsample=0.8,
-        colsample_bytree=0.8,
-    )
-    model.fit(X_train, y_train)
-    return model
+    x_train = np.ascontiguousarray(x_train, dtype=np.float32)
+
+    def fit(device: str):
+        model = lgb.LGBMClassifier(
+            n_estimators=200,
+            # The CUDA backend ignores max_depth; tree size is bounded by num_leaves
+            max_depth=-1,
+            num_leaves=63,
+            max_bin=255,
+            learning_rate=0.05,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            device=device,
+            n_jobs=n_jobs,
+        )
+        model.fit(x_train, y_train)
+        return model
+
+    if use_gpu and x_train.size > LGBM_CUDA_MIN_CELLS:
+        try:
+            return fit("cuda")
+        except lgb.basic.LightGBMError as exc:
+            # Stock LightGBM wheels are built without CUDA support
+            logger.warning("LightGBM CUDA training failed (%s); falling back to CPU", exc)
+    return fit("cpu")
 
 
-def compute_auc(model, X_val: np.ndarray, y_val: np.ndarray) -> float | None:
-    if X_val.size == 0:
+def compute_auc(model, x_val: np.ndarray, y_val: np.ndarray) -> float | None:
+    if x_val.size == 0:
         return None
     from sklearn.metrics import roc_auc_score
 
-    if hasattr(model, "predict_proba"):
-        probas = model.predict_proba(X_val)[:, 1]
+    # Ask the boosters for the 1-D positive-class probability directly rather
+    # than slicing column 1 out of an (n, 2) predict_proba matrix
+    x_val = np.ascontiguousarray(x_val, dtype=np.float32)
+    if hasattr(model, "get_booster"):
+        probas = model.get_booster().inplace_predict(x_val)
+    elif hasattr(model, "booster_"):
+        probas = model.booster_.predict(x_val)
+    elif hasattr(model, "predict_proba"):
+        probas = model.predict_proba(x_val)[:, 1]
     else:
-        probas = model.predict(X_val)
+        probas = model.predict(x_val)
     return float(roc_auc_score(y_val, probas))
 
 
+_SPLIT_NAMES = ("x_train", "y_train", "x_val", "y_val")
+
+
+def _save_split(data_dir: str, *arrays: np.ndarray) -> None:
+    """Write the train/validation split as .npy files for the worker processes."""
+    for name, array in zip(_SPLIT_NAMES, arrays, strict=True):
+        np.save(Path(data_dir) / f"{name}.npy", array)
+
+
+def _load_split(data_dir: str) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Memory-map the split written by _save_split; both workers share its page cache."""
+    x_train, y_train, x_val, y_val = (
+        np.load(Path(data_dir) / f"{name}.npy", mmap_mode="r") for name in _SPLIT_NAMES
+    )
+    return x_train, y_train, x_val, y_val
+
+
+def _train_champion(
+    data_dir: str,
+    output_dir: str,
+    use_gpu: bool,
+    n_jobs: int,
+) -> tuple[str, str, float | None]:
+    """Fit, evaluate and save the XGBoost champion (runs in a worker process)."""
+    x_train, y_train, x_val, y_val = _load_split(data_dir)
+    model = train_xgboost(x_train, y_train, use_gpu=use_gpu, n_jobs=n_jobs)
+    auc = compute_auc(model, x_val, y_val)
+    version = f"xgb-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}"
+    # UBJSON: binary, smaller and faster to write/load than text JSON;
+    # xgboost picks the format from the extension when loading
+    path = Path(output_dir) / f"{version}.ubj"
+    model.save_model(str(path))
+    return version, str(path), auc
+
+
+def _train_challenger(
+    data_dir: str,
+    output_dir: str,
+    use_gpu: bool,
+    n_jobs: int,
+) -> tuple[str, str, float | None]:
+    """Fit, evaluate and save the LightGBM challenger (runs in a worker process)."""
+    x_train, y_train, x_val, y_val = _load_split(data_dir)
+    model = train_lightgbm(x_train, y_train, use_gpu=use_gpu, n_jobs=n_jobs)
+    auc = compute_auc(model, x_val, y_val)
+    version = f"lgbm-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}"
+    path = Path(output_dir) / f"{version}.txt"
+    model.booster_.save_model(str(path))
+    return version, str(path), auc
+
+
+def _register_champion(
+    registry: ModelRegistry,
+    args: argparse.Namespace,
+    version: str,
+    path: str,
+    auc: float | None,
+    trained_at: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    registry.set(
+        "champion",
+        ModelEntry(
+            name="xgboost_criminal",
+            version=version,
+            path=path,
+            framework="xgboost",
+            model_type="xgb_classifier",
+            trained_at=trained_at,
+            auc=auc,
+            feature_columns=FEATURE_COLUMNS,
+            window_start=start.isoformat(),
+            window_end=end.isoformat(),
+        ),
+    )
+    if auc is not None and auc < args.min_auc:
+        logger.warning("Champion AUC %.4f below min %.4f (registered anyway)", auc, args.min_auc)
+    logger.info("Saved champion model: %s (AUC=%s)", version, auc)
+
+
+def _register_challenger(
+    registry: ModelRegistry,
+    args: argparse.Namespace,
+    version: str,
+    path: str,
+    auc: float | None,
+    trained_at: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    if auc is None:
+        logger.warning("No validation AUC for challenger; skipping registry update")
+        return
+    if auc < args.min_auc:
+        logger.warning("Challenger AUC %.4f below min %.4f; skipping registry update", auc, args.min_auc)
+        return
+    registry.set(
+        "challenger",
+        ModelEntry(
+            name="lightgbm_criminal",
+            version=version,
+            path=path,
+            framework="lightgbm",
+            model_type="lgbm_classifier",
+            trained_at=trained_at,
+            auc=auc,
+            feature_columns=FEATURE_COLUMNS,
+            window_start=start.isoformat(),
+            window_end=end.isoformat(),
+        ),
+    )
+    logger.info("Saved challenger model: %s (AUC=%s)", version, auc)
+
+
 def main() -> None:
     logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
     args = parse_args()
     start, end = compute_window(args)
 
     logger.info("Training window: %s to %s", start.isoformat(), end.isoformat())
-    rows = load_training_rows(start, end)
-    if len(rows) < args.min_rows:
-        logger.warning("Insufficient training rows (%d); need >= %d", len(rows), args.min_rows)
-        return
-
-    X, y, timestamps = build_dataset(rows)
-    if X.size == 0:
+    x, y, timestamps = asyncio.run(build_dataset(load_training_rows(start, end)))
+    if x.size == 0:
         logger.warning("No usable feature snapshots found")
         return
+    if len(y) < args.min_rows:
+        logger.warning("Insufficient training rows (%d); need >= %d", len(y), args.min_rows)
+        return
 
-    X_train, y_train, X_val, y_val = time_split(X, y, timestamps, validation_days=args.validation_days)
+    x_train, y_train, x_val, y_val = time_split(x, y, timestamps, validation_days=args.validation_days)
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     trained_at = datetime.now(UTC).isoformat()
     registry = ModelRegistry(args.registry_path)
-
-    try:
-        xgb_model = train_xgboost(X_train, y_train)
-        xgb_auc = compute_auc(xgb_model, X_val, y_val)
-        xgb_version = f"xgb-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}"
-        xgb_path = output_dir / f"{xgb_version}.json"
-        xgb_model.save_model(str(xgb_path))
-
-        registry.set(
-            "champion",
-            ModelEntry(
-                name="xgboost_criminal",
-                version=xgb_version,
-                path=str(xgb_path),
-                framework="xgboost",
-                model_type="xgb_classifier",
-                trained_at=trained_at,
-                auc=xgb_auc,
-                feature_columns=FEATURE_COLUMNS,
-                window_start=start.isoformat(),
-                window_end=end.isoformat(),
-            ),
-        )
-        if xgb_auc is not None and xgb_auc < args.min_auc:
-            logger.warning("Champion AUC %.4f below min %.4f (registered anyway)", xgb_auc, args.min_auc)
-        logger.info("Saved champion model: %s (AUC=%s)", xgb_version, xgb_auc)
-    except Exception as exc:
-        logger.warning("XGBoost training failed: %s", exc)
-
-    try:
-        lgb_model = train_lightgbm(X_train, y_train)
-        lgb_auc = compute_auc(lgb_model, X_val, y_val)
-        lgb_version = f"lgbm-{datetime.now(UTC).strftime('%Y%m%d%H%M%S')}"
-        lgb_path = output_dir / f"{lgb_version}.txt"
-        lgb_model.booster_.save_model(str(lgb_path))
-
-        if lgb_auc is None:
-            logger.warning("No validation AUC for challenger; skipping registry update")
-        elif lgb_auc < args.min_auc:
-            logger.warning("Challenger AUC %.4f below min %.4f; skipping registry update", lgb_auc, args.min_auc)
-        else:
-            registry.set(
-                "challenger",
-                ModelEntry(
-                    name="lightgbm_criminal",
-                    version=lgb_version,
-                    path=str(lgb_path),
-                    framework="lightgbm",
-                    model_type="lgbm_classifier",
-                    trained_at=trained_at,
-                    auc=lgb_auc,
-                    feature_columns=FEATURE_COLUMNS,
-                    window_start=start.isoformat(),
-                    window_end=end.isoformat(),
-                ),
-            )
-            logger.info("Saved challenger model: %s (AUC=%s)", lgb_version, lgb_auc)
-    except Exception as exc:
-        logger.warning("LightGBM training failed: %s", exc)
+    use_gpu = _cuda_available() if args.gpu is None else args.gpu
+    logger.info("Training device: %s", "cuda" if use_gpu else "cpu")
+
+    # Champion and challenger fits are independent: run them in separate
+    # processes and split the cores so the two don't oversubscribe the CPU.
+    # The split goes through memory-mapped files rather than being pickled
+    # into each worker, and the parent drops its copy once it is on disk.
+    # Spawned, not forked: _cuda_available() may have initialized CUDA in
+    # this process, and a forked child cannot use it.
+    n_jobs = max(1, (os.cpu_count() or 2) // 2)
+    with tempfile.TemporaryDirectory(prefix="train_model-") as data_dir:
+        _save_split(data_dir, x_train, y_train, x_val, y_val)
+        del x, y, timestamps, x_train, y_train, x_val, y_val
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {
+                pool.submit(_train_champion, data_dir, str(output_dir), use_gpu, n_jobs): "champion",
+                pool.submit(_train_challenger, data_dir, str(output_dir), use_gpu, n_jobs): "challenger",
+            }
+            for future in as_completed(futures):
+                role = futures[future]
+                try:
+                    version, path, auc = future.result()
+                except Exception as exc:
+                    framework = "XGBoost" if role == "champion" else "LightGBM"
+                    logger.warning("%s training failed: %s", framework, exc)
+                    continue
+                if role == "champion":
+                    _register_champion(registry, args, version, path, auc, trained_at, start, end)
+                else:
+                    _register_challenger(registry, args, version, path, auc, trained_at, start, end)
 
 
 if __name__ == "__main__":
@@ -7,70 +7,107 @@ FastAPI dependency injection for shared resources.
 from typing import AsyncGenerator, Optional
 
 import redis.asyncio as redis
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 from ..config import settings
 
 
-# Redis connection pool
+# Redis connection pool and the single client wrapping it
 _redis_pool: Optional[redis.ConnectionPool] = None
+_redis_client: Optional[redis.Redis] = None
 
 
-async def get_redis() -> AsyncGenerator[redis.Redis, None]:
+async def get_redis() -> redis.Redis:
     """
-    Get Redis connection from pool.
+    Get the shared Redis client.
 
-    Yields:
+    The client is created once and reused by every request; connections are
+    checked out of its pool per command, so there is nothing to release here.
+
+    Returns:
         Redis client instance
     """
-    global _redis_pool
+    global _redis_pool, _redis_client
 
-    if _redis_pool is None:
+    if _redis_client is None:
         _redis_pool = redis.ConnectionPool.from_url(
             settings.redis_url,
             decode_responses=True,
             max_connections=20,
         )
+        _redis_client = redis.Redis(connection_pool=_redis_pool)
+
+    return _redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and its pool (application shutdown)."""
+    global _redis_pool, _redis_client
 
-    client = redis.Redis(connection_pool=_redis_pool)
-    try:
-        yield client
-    finally:
-        await client.close()
+    if _redis_client is not None:
+        await _redis_client.aclose()  # type: ignore[attr-defined]
+    if _redis_pool is not None:
+        await _redis_pool.disconnect()
+    _redis_client = None
+    _redis_pool = None
 
 
-# Database engine and session factory
-_engine = None
-_session_factory = None
+# Database engine and session factory, shared by every service in the worker
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
 
-def get_db_engine():
-    """Get or create database engine."""
-    global _engine
+def init_db_engine() -> AsyncEngine:
+    """
+    Create the worker's database engine and session factory.
+
+    Called once from the application lifespan before any request is served,
+    so all services share a single pool sized by the postgres_pool_* settings.
+    Idempotent: later calls return the existing engine.
+    """
+    global _engine, _session_factory
 
     if _engine is None:
         _engine = create_async_engine(
             settings.postgres_url,
             echo=settings.app_debug,
-            pool_size=5,
-            max_overflow=10,
+            pool_size=settings.postgres_pool_size,
+            max_overflow=settings.postgres_max_overflow,
+            pool_recycle=settings.postgres_pool_recycle_s,
             pool_pre_ping=True,
+            # The asyncpg dialect prepares every statement and keeps an LRU of
+            # them per connection, so hot lookups (policy versions, evidence,
+            # idempotency) are parsed and planned once per connection
+            connect_args={"prepared_statement_cache_size": settings.postgres_statement_cache_size},
+        )
+        _session_factory = async_sessionmaker(
+            bind=_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
         )
 
     return _engine
 
 
-def get_session_factory():
-    """Get or create session factory."""
-    global _session_factory
+async def dispose_db_engine() -> None:
+    """Close the shared engine's pooled connections (application shutdown)."""
+    global _engine, _session_factory
+
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
+
+
+def get_db_engine() -> AsyncEngine:
+    """Get the shared database engine."""
+    return init_db_engine()
 
-    if _session_factory is None:
-        _session_factory = async_sessionmaker(
-            bind=get_db_engine(),
-            class_=AsyncSession,
-            expire_on_commit=False,
-        )
 
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the shared session factory."""
+    init_db_engine()
+    assert _session_factory is not None
     return _session_factory
 
 
@@ -6,46 +6,61 @@ Designed for <200ms end-to-end latency.
 
 Endpoints:
 - POST /decide: Make fraud decision for a transaction
+- POST /decide/bulk: Make fraud decisions for a batch of transactions
 - GET /health: Health check
 - GET /metrics: Prometheus metrics
 """
 
 import asyncio
+import base64
+import json
 import logging
 import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from itertools import islice
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Union, get_origin
 
+import orjson
 import redis.asyncio as redis
+from redis.commands.core import AsyncScript
 from fastapi import FastAPI, HTTPException, Request, Depends
-
-logger = logging.getLogger("fraud_detection.api")
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response
 from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from ..config import settings
+from ..constants import CRIMINAL_REASON_CODES
 from ..schemas import PaymentEvent, FraudDecisionResponse, Decision, RiskScores, FeatureSet, ChargebackRequest, RefundRequest
 from ..features import FeatureStore
 from ..scoring import RiskScorer
 from ..policy import (
     PolicyEngine,
+    PolicyRules,
+    PolicyVersion,
     PolicyVersioningService,
     PolicyValidationError,
     ThresholdUpdate,
     RuleUpdate,
     ListUpdate,
+    PolicyOperation,
+    PolicyListType,
 )
 from ..evidence import EvidenceService
 from ..metrics import metrics, setup_metrics, telemetry
 from ..ml import ModelMonitor
-from .dependencies import get_redis, get_db_pool
+from .dependencies import close_redis, dispose_db_engine, get_redis, get_db_pool, init_db_engine
 from .auth import require_api_token, require_admin_token, require_metrics_token
 
+logger = logging.getLogger("fraud_detection.api")
+
 
 # Global instances (initialized in lifespan)
 redis_client: Optional[redis.Redis] = None
+# Guarded policy response cache write, registered on redis_client
+_policy_cache_write: Optional[AsyncScript] = None
 feature_store: Optional[FeatureStore] = None
 risk_scorer: Optional[RiskScorer] = None
 policy_engine: Optional[PolicyEngine] = None
@@ -53,7 +68,18 @@ evidence_service: Optional[EvidenceService] = None
 policy_versioning: Optional[PolicyVersioningService] = None
 model_monitor: Optional[ModelMonitor] = None
 
-CRIMINAL_REASON_CODES = {"10.1", "10.2", "10.3", "10.4", "10.5"}
+# Bounded queue of post-decision coroutines, drained by a fixed worker pool
+_background_queue: Optional[asyncio.Queue] = None
+_background_workers: list[asyncio.Task] = []
+# Max time shutdown waits for queued background work to finish
+BACKGROUND_DRAIN_TIMEOUT_S = 5.0
+# Evidence is the audit/chargeback trail: never shed, see _enqueue_required
+_REQUIRED_BACKGROUND_TASKS = frozenset({"capture_evidence", "safe_mode_evidence"})
+
+# Safe-mode constants, built once; shared across responses and never mutated
+_SAFE_MODE_DECISION = Decision[settings.safe_mode_decision]
+_SAFE_MODE_SCORES = RiskScores(risk_score=0.0, criminal_score=0.0, friendly_fraud_score=0.0)
+_SAFE_MODE_FEATURES = FeatureSet()
 
 
 # =============================================================================
@@ -106,6 +132,7 @@ async def lifespan(app: FastAPI):
     - Service instances
     """
     global redis_client, feature_store, risk_scorer, policy_engine, evidence_service, policy_versioning, model_monitor
+    global _background_queue, _background_workers, _policy_cache_write
 
     # Initialize Redis
     redis_client = redis.Redis(
@@ -115,6 +142,8 @@ async def lifespan(app: FastAPI):
         password=settings.redis_password,
         decode_responses=True,
     )
+    # Hashes the script once; calls go out as EVALSHA
+    _policy_cache_write = redis_client.register_script(_POLICY_CACHE_WRITE_LUA)
 
     # Verify Redis connection
     try:
@@ -132,30 +161,76 @@ async def lifespan(app: FastAPI):
     policy_path = Path(__file__).parent.parent.parent / "config" / "policy.yaml"
     policy_engine = PolicyEngine(policy_path=policy_path)
 
+    # One engine (and connection pool) per worker, shared by all DB services
+    db_engine = init_db_engine()
+
     # Initialize evidence service
-    evidence_service = EvidenceService(settings.postgres_url)
+    evidence_service = EvidenceService(settings.postgres_url, engine=db_engine)
     await evidence_service.initialize()
 
     # Initialize policy versioning service
     policy_versioning = PolicyVersioningService(
         database_url=settings.postgres_url,
         policy_path=policy_path,
+        engine=db_engine,
     )
     await policy_versioning.initialize()
 
+    # Start background workers
+    _background_queue = asyncio.Queue(maxsize=settings.api_background_queue_size)
+    _background_workers = [
+        asyncio.create_task(_background_worker(_background_queue), name=f"background-worker-{i}")
+        for i in range(settings.api_background_workers)
+    ]
+
     # Setup metrics
     if settings.metrics_enabled:
         setup_metrics()
 
     yield
 
-    # Cleanup
+    # Cleanup: let queued evidence/profile writes finish before closing pools
+    try:
+        await asyncio.wait_for(_background_queue.join(), timeout=BACKGROUND_DRAIN_TIMEOUT_S)
+    except asyncio.TimeoutError:
+        required = []
+        while not _background_queue.empty():
+            name, pending = _background_queue.get_nowait()
+            if name in _REQUIRED_BACKGROUND_TASKS:
+                required.append(pending)
+            else:
+                pending.close()
+        logger.warning("Dropping best-effort background tasks at shutdown; finishing %d evidence writes", len(required))
+        for result in await asyncio.gather(*required, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.warning("Evidence capture failed at shutdown: %s", result)
+    for worker in _background_workers:
+        worker.cancel()
+    await asyncio.gather(*_background_workers, return_exceptions=True)
+    _background_workers = []
+    _background_queue = None
+
     if redis_client:
         await redis_client.aclose()  # type: ignore[attr-defined]
     if evidence_service:
         await evidence_service.close()
     if policy_versioning:
         await policy_versioning.close()
+    await dispose_db_engine()
+    await close_redis()
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson.
+
+    Stands in for fastapi.responses.ORJSONResponse, which newer FastAPI
+    releases deprecate in favour of response-model serialization (not
+    available for the endpoints here that return plain dicts).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
 
 
 def create_app() -> FastAPI:
@@ -165,6 +240,9 @@ def create_app() -> FastAPI:
         description="Real-time fraud detection for payment transactions",
         version="1.0.0",
         lifespan=lifespan,
+        # orjson for the dict-returning endpoints (policy, health, diffs);
+        # /decide already returns pre-serialized JSON
+        default_response_class=OrjsonResponse,
     )
 
     # CORS middleware
@@ -256,220 +334,360 @@ async def make_decision(
     Returns:
         FraudDecisionResponse with decision and supporting data
     """
-    start_time = time.perf_counter()
-
     try:
         # Track request
         metrics.requests_total.labels(endpoint="/decide").inc()
 
-        # Get required services (raises 503 if not initialized)
-        fs = _require_feature_store()
-        scorer = _require_risk_scorer()
-        engine = _require_policy_engine()
-        ev_service = _require_evidence_service()
-
-        # Safe mode: bypass decisioning for controlled fallback
-        if settings.safe_mode_enabled:
-            safe_time = (time.perf_counter() - start_time) * 1000
-            response = _safe_mode_response(event, safe_time)
-
-            # Record Prometheus metrics for SLO monitoring
-            metrics.decisions_total.labels(decision=response.decision.value).inc()
-            metrics.e2e_latency.observe(safe_time)
-            telemetry.record(response.decision.value, safe_time)
-            if model_monitor:
-                model_monitor.record_decision(response.decision, response.scores)
-
-            # Capture evidence for auditability (zeroed scores, no computed features)
-            safe_features = FeatureSet()
-            _fire_and_forget(
-                ev_service.capture_evidence(
-                    event, safe_features, response.scores, response,
-                    policy_version_id=None,
-                ),
-                "safe_mode_evidence",
-            )
+        # Idempotent replay: hand back the cached JSON as-is, skipping the
+        # parse/validate/re-serialize round trip of a response model
+        if not settings.safe_mode_enabled:
+            cached_json, preloaded_profiles = await _preload_decision_reads(event)
+            if cached_json is not None:
+                metrics.cache_hits.inc()
+                return Response(content=cached_json, media_type="application/json")
+            payload = await _evaluate_event(event, redis_checked=True, preloaded_profiles=preloaded_profiles)
+        else:
+            payload = await _evaluate_event(event)
 
-            return response
-
-        # =======================================================================
-        # Step 1: Check idempotency (return cached result if exists)
-        # =======================================================================
-        cached_result = await _check_idempotency(event.idempotency_key)
-        if cached_result:
-            metrics.cache_hits.inc()
-            return cached_result
-
-        # =======================================================================
-        # Step 2: Compute features
-        # =======================================================================
-        feature_start = time.perf_counter()
-        features = await fs.compute_features(event)
-        feature_time = (time.perf_counter() - feature_start) * 1000
-
-        # Track feature latency
-        metrics.feature_latency.observe(feature_time)
-
-        # =======================================================================
-        # Step 3: Compute risk scores
-        # =======================================================================
-        scoring_start = time.perf_counter()
-        scores, score_reasons = await scorer.compute_scores(event, features)
-        scoring_time = (time.perf_counter() - scoring_start) * 1000
-
-        # Track scoring latency
-        metrics.scoring_latency.observe(scoring_time)
-
-        # =======================================================================
-        # Step 4: Evaluate policy
-        # =======================================================================
-        policy_start = time.perf_counter()
-        decision, policy_reasons, friction_type, review_priority = engine.evaluate(
-            event, features, scores
-        )
-        policy_time = (time.perf_counter() - policy_start) * 1000
-
-        # Track policy latency
-        metrics.policy_latency.observe(policy_time)
-
-        # Combine reasons
-        all_reasons = score_reasons + policy_reasons
-
-        # =======================================================================
-        # Step 5: Build response
-        # =======================================================================
-        total_time = (time.perf_counter() - start_time) * 1000
-
-        response = FraudDecisionResponse(
-            transaction_id=event.transaction_id,
-            idempotency_key=event.idempotency_key,
-            decision=decision,
-            reasons=all_reasons,
-            scores=scores,
-            friction_type=friction_type,
-            friction_message=_get_friction_message(friction_type) if friction_type else None,
-            review_priority=review_priority,
-            review_notes=_get_review_notes(all_reasons) if review_priority else None,
-            processing_time_ms=round(total_time, 2),
-            feature_time_ms=round(feature_time, 2),
-            scoring_time_ms=round(scoring_time, 2),
-            policy_time_ms=round(policy_time, 2),
-            policy_version=engine.version,
-            is_cached=False,
-        )
+        # Already serialized; a plain Response skips FastAPI's re-encode
+        return Response(content=payload, media_type="application/json")
 
-        # =======================================================================
-        # Step 6: Update entity profiles (async, don't block response)
-        # =======================================================================
-        is_decline = decision == Decision.BLOCK
-        _fire_and_forget(
-            fs.update_entity_profiles(event, is_decline),
-            "update_entity_profiles",
+    except Exception as e:
+        metrics.errors_total.labels(error_type=type(e).__name__).inc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/decide/bulk", response_model=list[FraudDecisionResponse])
+async def make_decisions_bulk(
+    events: list[PaymentEvent],
+    request: Request,
+    _: None = Depends(require_api_token),
+):
+    """
+    Make fraud decisions for a batch of payment transactions.
+
+    Intended for backfills and synthetic seeding, where per-request HTTP
+    overhead dominates. Events are evaluated in order, exactly as if each
+    had been posted to /decide, so velocity features and idempotency behave
+    the same and a retried batch returns cached results.
+
+    Args:
+        events: Payment events to evaluate (at most api_max_bulk_decisions)
+
+    Returns:
+        List of FraudDecisionResponse in request order
+    """
+    if len(events) > settings.api_max_bulk_decisions:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(events)} exceeds limit of {settings.api_max_bulk_decisions}",
         )
 
-        # =======================================================================
-        # Step 7: Capture evidence (async)
-        # =======================================================================
-        policy_version_id = policy_versioning.current_version_id if policy_versioning else None
-        _fire_and_forget(
+    try:
+        metrics.requests_total.labels(endpoint="/decide/bulk").inc()
+        payloads = [await _evaluate_event(event) for event in events]
+        return Response(content=f"[{','.join(payloads)}]", media_type="application/json")
+
+    except Exception as e:
+        metrics.errors_total.labels(error_type=type(e).__name__).inc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _evaluate_event(
+    event: PaymentEvent,
+    redis_checked: bool = False,
+    preloaded_profiles: Optional[dict[str, dict]] = None,
+) -> str:
+    """
+    Run the full decision pipeline for one event (shared by /decide and /decide/bulk).
+
+    Returns the FraudDecisionResponse serialized to JSON. It is serialized
+    exactly once; the same string is returned to the client, cached in
+    Redis and persisted as the idempotency record.
+
+    `redis_checked` skips the Redis idempotency lookup when the caller has
+    already missed on it; `preloaded_profiles` are entity profile hashes the
+    caller read in that same round trip.
+    """
+    start_time = time.perf_counter()
+
+    # Get required services (raises 503 if not initialized)
+    fs = _require_feature_store()
+    scorer = _require_risk_scorer()
+    engine = _require_policy_engine()
+    ev_service = _require_evidence_service()
+
+    # Safe mode: bypass decisioning for controlled fallback
+    if settings.safe_mode_enabled:
+        safe_time = (time.perf_counter() - start_time) * 1000
+        response = _safe_mode_response(event, safe_time)
+
+        # Record Prometheus metrics for SLO monitoring
+        metrics.decisions_total.labels(decision=response.decision.value).inc()
+        metrics.e2e_latency.observe(safe_time)
+        telemetry.record(response.decision.value, safe_time)
+        if model_monitor:
+            model_monitor.record_decision(response.decision, response.scores)
+
+        # Capture evidence for auditability (zeroed scores, no computed features)
+        await _enqueue_required(
             ev_service.capture_evidence(
-                event, features, scores, response, policy_version_id=policy_version_id
+                event, _SAFE_MODE_FEATURES, response.scores, response,
+                policy_version_id=None,
             ),
-            "capture_evidence",
+            "safe_mode_evidence",
         )
 
-        # =======================================================================
-        # Step 8: Persist idempotency record + cache result
-        # =======================================================================
-        await _persist_idempotency(event.idempotency_key, response)
-        await _cache_result(event.idempotency_key, response)
+        return response.model_dump_json()
 
-        # Track metrics
-        metrics.decisions_total.labels(decision=decision.value).inc()
-        metrics.e2e_latency.observe(total_time)
-        telemetry.record(decision.value, total_time)
-        if model_monitor:
-            model_monitor.record_decision(decision, scores)
+    # Phase boundaries are stamped once each (the end of one phase is the
+    # start of the next); durations are derived after policy evaluation.
 
-        # Log slow requests
-        if total_time > settings.target_e2e_latency_ms:
-            metrics.slow_requests.inc()
+    # =======================================================================
+    # Step 1: Check idempotency (return cached result if exists)
+    # =======================================================================
+    # Feature computation is read-only, so it starts speculatively alongside
+    # the lookup and is cancelled on a hit; a miss (the common case) then no
+    # longer pays for the lookup before features begin.
+    feature_start = time.perf_counter()
+    feature_task = asyncio.create_task(
+        fs.compute_features(event, preloaded_profiles=preloaded_profiles)
+    )
+    try:
+        cached_result = await _check_idempotency(event.idempotency_key, redis_checked=redis_checked)
+    except BaseException:
+        feature_task.cancel()
+        raise
+    if cached_result:
+        feature_task.cancel()
+        metrics.cache_hits.inc()
+        return cached_result
+
+    # =======================================================================
+    # Step 2: Compute features
+    # =======================================================================
+    features = await feature_task
+
+    # =======================================================================
+    # Step 3: Compute risk scores
+    # =======================================================================
+    scoring_start = time.perf_counter()
+    scores, score_reasons = await scorer.compute_scores(event, features)
+
+    # =======================================================================
+    # Step 4: Evaluate policy
+    # =======================================================================
+    policy_start = time.perf_counter()
+    decision, policy_reasons, friction_type, review_priority = engine.evaluate(
+        event, features, scores
+    )
+    policy_end = time.perf_counter()
 
-        return response
+    feature_time = (scoring_start - feature_start) * 1000
+    scoring_time = (policy_start - scoring_start) * 1000
+    policy_time = (policy_end - policy_start) * 1000
+    total_time = (policy_end - start_time) * 1000
 
-    except Exception as e:
-        metrics.errors_total.labels(error_type=type(e).__name__).inc()
-        raise HTTPException(status_code=500, detail=str(e))
+    # Track phase latencies
+    metrics.feature_latency.observe(feature_time)
+    metrics.scoring_latency.observe(scoring_time)
+    metrics.policy_latency.observe(policy_time)
 
+    # Combine reasons
+    all_reasons = score_reasons + policy_reasons
 
-async def _check_idempotency(idempotency_key: str) -> Optional[FraudDecisionResponse]:
-    """Check if we've already processed this request."""
-    if redis_client:
-        try:
-            key = f"{settings.redis_key_prefix}idempotency:{idempotency_key}"
-            cached = await redis_client.get(key)
-            if cached:
-                import json
-                data = json.loads(cached)
-                response = FraudDecisionResponse(**data)
-                response.is_cached = True
-                return response
-        except Exception:
-            pass
+    # =======================================================================
+    # Step 5: Build response
+    # =======================================================================
+    response = FraudDecisionResponse(
+        transaction_id=event.transaction_id,
+        idempotency_key=event.idempotency_key,
+        decision=decision,
+        reasons=all_reasons,
+        scores=scores,
+        friction_type=friction_type,
+        friction_message=_get_friction_message(friction_type) if friction_type else None,
+        review_priority=review_priority,
+        review_notes=_get_review_notes(all_reasons) if review_priority else None,
+        processing_time_ms=round(total_time, 2),
+        feature_time_ms=round(feature_time, 2),
+        scoring_time_ms=round(scoring_time, 2),
+        policy_time_ms=round(policy_time, 2),
+        policy_version=engine.version,
+        is_cached=False,
+    )
+
+    payload = response.model_dump_json()
+
+    # =======================================================================
+    # Step 6: Update entity profiles + cache result (async, one Redis trip)
+    # =======================================================================
+    is_decline = decision == Decision.BLOCK
+    _fire_and_forget(
+        _post_decision_writes(fs, event, is_decline, _flag_cached(payload)),
+        "post_decision_writes",
+    )
+
+    # =======================================================================
+    # Step 7: Capture evidence (async)
+    # =======================================================================
+    policy_version_id = policy_versioning.current_version_id if policy_versioning else None
+    await _enqueue_required(
+        ev_service.capture_evidence(
+            event, features, scores, response, policy_version_id=policy_version_id
+        ),
+        "capture_evidence",
+    )
+
+    # =======================================================================
+    # Step 8: Persist idempotency record
+    # =======================================================================
+    await _persist_idempotency(event.idempotency_key, payload)
+
+    # Track metrics
+    metrics.decisions_total.labels(decision=decision.value).inc()
+    metrics.e2e_latency.observe(total_time)
+    telemetry.record(decision.value, total_time)
+    if model_monitor:
+        model_monitor.record_decision(decision, scores)
+
+    # Log slow requests
+    if total_time > settings.target_e2e_latency_ms:
+        metrics.slow_requests.inc()
+
+    return payload
+
+
+def _flag_cached(payload: str) -> str:
+    """
+    Mark a serialized FraudDecisionResponse as served from cache.
+
+    is_cached is the model's last field, so flipping the final occurrence of
+    the literal is exact (string values containing it would be escaped).
+    """
+    head, found, tail = payload.rpartition('"is_cached":false')
+    return f'{head}"is_cached":true{tail}' if found else payload
+
+
+async def _get_cached_json(idempotency_key: str) -> Optional[str]:
+    """Return the cached response JSON from Redis, if any."""
+    if not redis_client:
+        return None
+    try:
+        key = f"{settings.redis_key_prefix}idempotency:{idempotency_key}"
+        return await redis_client.get(key)
+    except Exception:
+        return None
+
+
+async def _preload_decision_reads(event: PaymentEvent) -> tuple[Optional[str], Optional[dict[str, dict]]]:
+    """
+    Read the idempotency cache and the event's entity profiles in one round trip.
+
+    Returns (cached response JSON or None, raw profile hashes by kind or None
+    if they could not be preloaded).
+    """
+    if not redis_client or not feature_store:
+        return await _get_cached_json(event.idempotency_key), None
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(f"{settings.redis_key_prefix}idempotency:{event.idempotency_key}")
+        kinds = feature_store.queue_profile_reads(pipe, event)
+        results = await pipe.execute()
+    except Exception:
+        return None, None
+    return results[0], dict(zip(kinds, results[1:]))
+
+
+async def _check_idempotency(idempotency_key: str, redis_checked: bool = False) -> Optional[str]:
+    """
+    Check if we've already processed this request.
+
+    Returns the stored response JSON flagged is_cached=true, without
+    rebuilding a FraudDecisionResponse only to serialize it again.
+    """
+    if not redis_checked:
+        cached = await _get_cached_json(idempotency_key)
+        if cached:
+            # Stored already flagged (see _post_decision_writes)
+            return cached
 
     if evidence_service:
         try:
             record = await evidence_service.get_idempotency_response(idempotency_key)
             if record:
-                response = FraudDecisionResponse(**record)
-                response.is_cached = True
-                return response
+                record["is_cached"] = True
+                return orjson.dumps(record).decode()
         except Exception:
             pass
 
     return None
 
 
-async def _cache_result(idempotency_key: str, response: FraudDecisionResponse) -> None:
-    """Cache the result for idempotency."""
+async def _post_decision_writes(
+    fs: FeatureStore,
+    event: PaymentEvent,
+    is_decline: bool,
+    cached_payload: str,
+) -> None:
+    """
+    Cache the result for idempotency and update entity profiles.
+
+    Both go out on one non-transactional pipeline, so all post-decision Redis
+    work costs a single round trip. `cached_payload` is the response JSON
+    already flagged is_cached=True, so /decide can return it verbatim on a
+    replay.
+    """
     if not redis_client:
+        await fs.update_entity_profiles(event, is_decline)
         return
 
-    try:
-        key = f"{settings.redis_key_prefix}idempotency:{idempotency_key}"
-        # Cache for 24 hours
-        await redis_client.setex(
-            key,
-            86400,
-            response.model_dump_json(),
-        )
-    except Exception:
-        pass
-
-
-async def _persist_idempotency(idempotency_key: str, response: FraudDecisionResponse) -> None:
+    pipe = redis_client.pipeline(transaction=False)
+    # Cache for 24 hours
+    pipe.setex(
+        f"{settings.redis_key_prefix}idempotency:{event.idempotency_key}",
+        86400,
+        cached_payload,
+    )
+    await fs.queue_profile_updates(pipe, event, is_decline)
+    # execute() clears the stack; keep the commands to name any failures
+    commands = [args for args, _ in pipe.command_stack]
+    # Best effort: a failed command must not stop the others
+    results = await pipe.execute(raise_on_error=False)
+    for args, result in zip(commands, results):
+        if isinstance(result, Exception):
+            metrics.errors_total.labels(error_type=type(result).__name__).inc()
+            logger.warning("Post-decision %s %s failed: %s", args[0], args[1], result)
+
+
+async def _persist_idempotency(idempotency_key: str, payload: str) -> None:
     """Persist idempotency response in Postgres (fallback for Redis)."""
     if not evidence_service:
         return
     try:
         await evidence_service.store_idempotency_response(
             idempotency_key,
-            response.model_dump(),
+            payload,
             ttl_hours=settings.idempotency_ttl_hours,
         )
     except Exception as e:
         logger.warning("Idempotency persistence failed: %s", e)
 
 
+_FRICTION_MESSAGES = {
+    "3DS": "Additional verification required. You will be redirected to your bank.",
+    "OTP": "Please enter the verification code sent to your phone.",
+    "STEP_UP": "Please verify your identity to continue.",
+    "CAPTCHA": "Please complete the verification challenge.",
+}
+
+
 def _get_friction_message(friction_type: str) -> str:
     """Get user-facing message for friction type."""
-    messages = {
-        "3DS": "Additional verification required. You will be redirected to your bank.",
-        "OTP": "Please enter the verification code sent to your phone.",
-        "STEP_UP": "Please verify your identity to continue.",
-        "CAPTCHA": "Please complete the verification challenge.",
-    }
-    return messages.get(friction_type, "Additional verification required.")
+    return _FRICTION_MESSAGES.get(friction_type, "Additional verification required.")
+
+
+_HIGH_SEVERITIES = frozenset(("HIGH", "CRITICAL"))
 
 
 def _get_review_notes(reasons: list) -> str:
@@ -477,24 +695,26 @@ def _get_review_notes(reasons: list) -> str:
     if not reasons:
         return "No specific concerns noted."
 
-    high_severity = [r for r in reasons if r.severity in ("HIGH", "CRITICAL")]
+    # Stop at the first three matches instead of filtering the whole list
+    high_severity = list(islice(
+        (r.description for r in reasons if r.severity in _HIGH_SEVERITIES), 3
+    ))
     if high_severity:
-        return "; ".join(r.description for r in high_severity[:3])
+        return "; ".join(high_severity)
 
     return "; ".join(r.description for r in reasons[:3])
 
 
 def _safe_mode_response(event: PaymentEvent, elapsed_ms: float = 0.0) -> FraudDecisionResponse:
     """Return a deterministic response when safe mode is enabled."""
-    decision = Decision[settings.safe_mode_decision]
     # Safe to access policy_engine here since it's checked before calling this function
     version = policy_engine.version if policy_engine is not None else "unknown"
     response = FraudDecisionResponse(
         transaction_id=event.transaction_id,
         idempotency_key=event.idempotency_key,
-        decision=decision,
+        decision=_SAFE_MODE_DECISION,
         reasons=[],
-        scores=RiskScores(risk_score=0.0, criminal_score=0.0, friendly_fraud_score=0.0),
+        scores=_SAFE_MODE_SCORES,
         friction_type=None,
         friction_message=None,
         review_priority=None,
@@ -510,16 +730,69 @@ def _safe_mode_response(event: PaymentEvent, elapsed_ms: float = 0.0) -> FraudDe
 
 
 def _fire_and_forget(coro, name: str) -> None:
-    """Run a coroutine in the background and log failures."""
-    task = asyncio.create_task(coro)
+    """
+    Queue best-effort work (profile updates, result caching) for the background workers.
 
-    def _log_exception(task_ref: asyncio.Task) -> None:
+    The queue is bounded so a traffic spike cannot pile up unlimited pending
+    writes; when it is full the work is dropped and counted. Before the
+    lifespan has started the workers, falls back to a plain task. Work that
+    must not be lost goes through _enqueue_required instead.
+    """
+    if _background_queue is None:
+        task = asyncio.create_task(coro)
+        task.add_done_callback(lambda task_ref: _log_background_result(task_ref, name))
+        return
+    try:
+        _background_queue.put_nowait((name, coro))
+    except asyncio.QueueFull:
+        coro.close()
+        metrics.background_dropped.labels(task=name).inc()
+        logger.debug("Background queue full; dropped %s", name)
+        return
+    metrics.background_queue_depth.set(_background_queue.qsize())
+
+
+async def _enqueue_required(coro, name: str) -> None:
+    """
+    Queue background work that must never be shed (evidence capture).
+
+    When the queue is full the caller runs the write inline instead of
+    dropping it, so sustained overload slows responses rather than losing
+    the audit trail. Failures are logged, as in the workers.
+    """
+    if _background_queue is None:
+        _fire_and_forget(coro, name)
+        return
+    try:
+        _background_queue.put_nowait((name, coro))
+    except asyncio.QueueFull:
+        metrics.background_inline.labels(task=name).inc()
         try:
-            task_ref.result()
-        except Exception as exc:  # pragma: no cover - best effort logging
+            await coro
+        except Exception as exc:
             logger.warning("Background task %s failed: %s", name, exc)
+        return
+    metrics.background_queue_depth.set(_background_queue.qsize())
+
+
+def _log_background_result(task_ref: asyncio.Task, name: str) -> None:
+    try:
+        task_ref.result()
+    except Exception as exc:  # pragma: no cover - best effort logging
+        logger.warning("Background task %s failed: %s", name, exc)
+
 
-    task.add_done_callback(_log_exception)
+async def _background_worker(queue: asyncio.Queue) -> None:
+    """Run queued background coroutines one at a time, logging failures."""
+    while True:
+        name, coro = await queue.get()
+        try:
+            await coro
+        except Exception as exc:
+            logger.warning("Background task %s failed: %s", name, exc)
+        finally:
+            queue.task_done()
+            metrics.background_queue_depth.set(queue.qsize())
 
 
 @app.get("/policy/version")
@@ -536,7 +809,7 @@ async def get_policy_version(_: None = Depends(require_api_token)):
 async def reload_policy(_: None = Depends(require_admin_token)):
     """Reload policy from configuration file."""
     engine = _require_policy_engine()
-    if engine.reload_policy():
+    if await asyncio.to_thread(engine.reload_policy):
         return {
             "status": "success",
             "version": engine.version,
@@ -550,64 +823,334 @@ async def reload_policy(_: None = Depends(require_admin_token)):
 # POLICY MANAGEMENT ENDPOINTS
 # =============================================================================
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers `etag` (weak compare)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+POLICY_RESPONSE_CACHE_TTL_S = 30
+
+
+def _policy_response_cache_key() -> str:
+    """Redis hash holding cached policy GET responses, one field per path+query."""
+    return f"{settings.redis_key_prefix}resp:policy"
+
+
+def _policy_response_generation_key() -> str:
+    """Counter bumped by every policy mutation; guards writes into the response cache."""
+    return f"{settings.redis_key_prefix}resp:policy:gen"
+
+
+# Writes the body and ETag only if no mutation has bumped the generation
+# since the caller read it, so a GET that loaded the database before a
+# mutation cannot repopulate the cache after the mutation cleared it. The
+# TTL is set once, when the hash is created: later writes do not extend
+# it, so every entry is gone within POLICY_RESPONSE_CACHE_TTL_S.
+_POLICY_CACHE_WRITE_LUA = """
+if (redis.call('GET', KEYS[1]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[2], ARGV[2], ARGV[3], ARGV[2] .. ':etag', ARGV[4])
+if redis.call('TTL', KEYS[2]) < 0 then
+    redis.call('EXPIRE', KEYS[2], ARGV[5])
+end
+return 1
+"""
+
+
+def _policy_response_field(request: Request) -> str:
+    query = request.url.query
+    return f"{request.url.path}?{query}" if query else request.url.path
+
+
+def _policy_json_response(request: Request, body: Union[str, bytes], etag: Optional[str]) -> Response:
+    """Serve `body` (or a 304 when the client already holds `etag`)."""
+    if etag is None:
+        return Response(content=body, media_type="application/json")
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+async def _cached_policy_response(request: Request) -> tuple[Optional[Response], Optional[str]]:
+    """
+    Serve a policy GET from the Redis response cache, if present.
+
+    All entries live in one hash so a mutation drops them with a single DEL,
+    visible to every worker. Returns the cached response (None on a miss)
+    and the cache generation to pass to _policy_response; the generation is
+    None when Redis is unavailable, which disables the write. Cache errors
+    fall through to the database.
+    """
+    if not redis_client:
+        return None, None
+    field = _policy_response_field(request)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hmget(_policy_response_cache_key(), [field, f"{field}:etag"])
+        pipe.get(_policy_response_generation_key())
+        (body, etag), generation = await pipe.execute()
+    except Exception:
+        return None, None
+    if body is None:
+        return None, generation or "0"
+    return _policy_json_response(request, body, etag or None), generation or "0"
+
+
+async def _policy_response(
+    request: Request,
+    content: dict[str, Any],
+    etag: Optional[str] = None,
+    generation: Optional[str] = None,
+) -> Response:
+    """
+    Serve a policy GET response, caching its body (and ETag) in Redis.
+
+    Only cached when `generation` (from _cached_policy_response) is given
+    and still current.
+    """
+    # Kept as bytes: Response and Redis both take them without re-encoding
+    body = orjson.dumps(content)
+    if generation is not None and _policy_cache_write is not None:
+        field = _policy_response_field(request)
+        try:
+            await _policy_cache_write(
+                keys=[_policy_response_generation_key(), _policy_response_cache_key()],
+                args=[generation, field, body, etag or "", POLICY_RESPONSE_CACHE_TTL_S],
+            )
+        except Exception as e:
+            logger.warning(f"Failed to cache policy response: {e}")
+    return _policy_json_response(request, body, etag)
+
+
+async def _invalidate_policy_responses() -> None:
+    """Drop every cached policy GET response and fence off in-flight cache writes."""
+    if not redis_client:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.incr(_policy_response_generation_key())
+        pipe.delete(_policy_response_cache_key())
+        await pipe.execute()
+    except Exception as e:
+        # Entries still expire within POLICY_RESPONSE_CACHE_TTL_S
+        logger.warning(f"Failed to invalidate policy response cache: {e}")
+
+
+# In-flight active-version read shared by concurrent cache misses
+_active_version_fetch: Optional["asyncio.Future[Optional[PolicyVersion]]"] = None
+
+# Inactive versions never change again (a rollback writes a new row), so
+# they can be held in-process without cross-worker invalidation
+_INACTIVE_VERSION_CACHE_SIZE = 64
+_inactive_version_cache: "OrderedDict[str, PolicyVersion]" = OrderedDict()
+
+
+def _clear_active_version_fetch(_: "asyncio.Future[Optional[PolicyVersion]]") -> None:
+    global _active_version_fetch
+    _active_version_fetch = None
+
+
+async def _fetch_active_version(versioning: PolicyVersioningService) -> Optional[PolicyVersion]:
+    """
+    Read the active version, coalescing concurrent callers onto one query.
+
+    Not cached across calls: other workers can change the active version,
+    so freshness is left to the shared Redis response cache.
+    """
+    global _active_version_fetch
+    if _active_version_fetch is None:
+        _active_version_fetch = asyncio.ensure_future(versioning.get_active_version())
+        _active_version_fetch.add_done_callback(_clear_active_version_fetch)
+    # Shielded so one cancelled request does not cancel the shared read
+    return await asyncio.shield(_active_version_fetch)
+
+
+def _cached_inactive_version(version: str) -> Optional[PolicyVersion]:
+    v = _inactive_version_cache.get(version)
+    if v is not None:
+        _inactive_version_cache.move_to_end(version)
+    return v
+
+
+def _remember_version(v: PolicyVersion) -> None:
+    """Keep `v` in the in-process LRU if it can no longer change."""
+    if v.is_active:
+        return
+    _inactive_version_cache[v.version] = v
+    _inactive_version_cache.move_to_end(v.version)
+    if len(_inactive_version_cache) > _INACTIVE_VERSION_CACHE_SIZE:
+        _inactive_version_cache.popitem(last=False)
+
+
+# Single-flight engine reload shared by concurrent policy mutations
+_reload_task: Optional[asyncio.Task] = None
+_reload_pending = False
+
+
+async def _run_pending_reloads(engine: PolicyEngine) -> None:
+    """Reload until no mutation has landed since the last reload started."""
+    global _reload_pending
+    while _reload_pending:
+        _reload_pending = False
+        await asyncio.to_thread(engine.reload_policy)
+
+
+async def _request_policy_reload(engine: PolicyEngine) -> None:
+    """
+    Reload the engine after a committed mutation, coalescing bursts.
+
+    Returns once a reload that started after this call has finished, so
+    the caller's change is live; callers arriving while a reload runs
+    share the next one instead of each reloading.
+    """
+    global _reload_task, _reload_pending
+    _reload_pending = True
+    if _reload_task is None or _reload_task.done():
+        _reload_task = asyncio.create_task(_run_pending_reloads(engine))
+    # Shielded so one cancelled request does not abort the shared reload
+    await asyncio.shield(_reload_task)
+
+
+async def _apply_policy_change(engine: PolicyEngine) -> None:
+    """Reload the engine and drop cached policy responses after a mutation."""
+    await _request_policy_reload(engine)
+    await _invalidate_policy_responses()
+
+
 @app.get("/policy")
-async def get_policy(_: None = Depends(require_api_token)):
-    """Get the current active policy configuration."""
+async def get_policy(
+    request: Request,
+    _: None = Depends(require_api_token),
+):
+    """
+    Get the current active policy configuration.
+
+    Sends an ETag; pollers that echo it in If-None-Match get a bodiless 304
+    until the active version changes. Responses are cached in Redis until
+    the next policy mutation.
+    """
+    cached, generation = await _cached_policy_response(request)
+    if cached is not None:
+        return cached
+
     versioning = _require_policy_versioning()
-    version = await versioning.get_active_version()
+    version = await _fetch_active_version(versioning)
     if not version:
         raise HTTPException(status_code=404, detail="No active policy found")
 
-    return {
+    # A rollback can reactivate identical content under a new version
+    etag = f'"{version.version}-{version.policy_hash}"'
+    return await _policy_response(request, {
         "version": version.version,
         "policy_hash": version.policy_hash,
         "changed_by": version.changed_by,
-        "created_at": version.created_at.isoformat(),
+        "created_at": version.created_at_iso,
         "policy": version.policy_content,
-    }
+    }, etag, generation)
+
+
+def _encode_version_cursor(created_at: datetime, version_id: int) -> str:
+    """Opaque keyset cursor for the version after which the next page starts."""
+    payload = json.dumps([created_at.isoformat(), version_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def _decode_version_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a cursor from _encode_version_cursor, raising 400 if malformed."""
+    try:
+        created_at, version_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(version_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Upper bound on a /policy/versions page; larger requests are clamped
+POLICY_VERSIONS_MAX_LIMIT = 200
 
 
 @app.get("/policy/versions")
-async def list_policy_versions(limit: int = 50, _: None = Depends(require_api_token)):
-    """List all policy versions, most recent first."""
-    versioning = _require_policy_versioning()
-    versions = await versioning.list_versions(limit=limit)
-    return {
-        "versions": [
-            {
-                "id": v.id,
-                "version": v.version,
-                "change_type": v.change_type,
-                "change_summary": v.change_summary,
-                "changed_by": v.changed_by,
-                "created_at": v.created_at.isoformat(),
-                "is_active": v.is_active,
-            }
-            for v in versions
-        ]
-    }
+async def list_policy_versions(
+    request: Request,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    _: None = Depends(require_api_token),
+):
+    """
+    List policy versions, most recent first.
 
+    Keyset-paginated: pass the returned `next_cursor` as `cursor` to fetch
+    the next page; `next_cursor` is null on the last page. `limit` is
+    clamped to 1..POLICY_VERSIONS_MAX_LIMIT.
+    """
+    limit = max(1, min(limit, POLICY_VERSIONS_MAX_LIMIT))
+    cached, generation = await _cached_policy_response(request)
+    if cached is not None:
+        return cached
 
-@app.get("/policy/versions/{version}")
-async def get_policy_version_by_id(version: str, _: None = Depends(require_api_token)):
-    """Get a specific policy version by its version string."""
     versioning = _require_policy_versioning()
-    v = await versioning.get_version(version)
-    if not v:
-        raise HTTPException(status_code=404, detail=f"Version '{version}' not found")
+    before = _decode_version_cursor(cursor) if cursor else None
+    rows: list[dict[str, Any]] = []
+    last = None
+    async for last in versioning.iter_versions(limit=limit, before=before):
+        rows.append({
+            "id": last.id,
+            "version": last.version,
+            "change_type": last.change_type,
+            "change_summary": last.change_summary,
+            "changed_by": last.changed_by,
+            "created_at": last.created_at_iso,
+            "is_active": last.is_active,
+        })
+    next_cursor = None
+    if last is not None and len(rows) == limit:
+        next_cursor = _encode_version_cursor(last.created_at, last.id)
+    return await _policy_response(request, {
+        "next_cursor": next_cursor,
+        "versions": rows,
+    }, generation=generation)
 
-    return {
+
+@app.get("/policy/versions/{version}")
+async def get_policy_version_by_id(
+    version: str,
+    request: Request,
+    _: None = Depends(require_api_token),
+):
+    """Get a specific policy version by its version string (ETag-aware and cached, like GET /policy)."""
+    v = _cached_inactive_version(version)
+    # Served from process memory: no cache round trip, nothing to write back
+    generation: Optional[str] = None
+    if v is None:
+        cached, generation = await _cached_policy_response(request)
+        if cached is not None:
+            return cached
+
+        versioning = _require_policy_versioning()
+        v = await versioning.get_version(version)
+        if not v:
+            raise HTTPException(status_code=404, detail=f"Version '{version}' not found")
+        _remember_version(v)
+
+    # Version rows are immutable apart from is_active
+    etag = f'"{v.version}-{v.policy_hash}-{int(v.is_active)}"'
+    return await _policy_response(request, {
         "id": v.id,
         "version": v.version,
         "policy_hash": v.policy_hash,
         "change_type": v.change_type,
         "change_summary": v.change_summary,
         "changed_by": v.changed_by,
-        "created_at": v.created_at.isoformat(),
+        "created_at": v.created_at_iso,
         "is_active": v.is_active,
         "previous_version": v.previous_version,
         "policy": v.policy_content,
-    }
+    }, etag, generation)
 
 
 @app.put("/policy/thresholds")
@@ -627,7 +1170,7 @@ async def update_thresholds(
         version = await versioning.update_thresholds(updates, changed_by=changed_by)
 
         # Reload policy engine with new config
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -651,7 +1194,7 @@ async def add_rule(
         version = await versioning.add_rule(rule, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -679,7 +1222,7 @@ async def update_rule(
         version = await versioning.update_rule(rule, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -703,7 +1246,7 @@ async def delete_rule(
         version = await versioning.delete_rule(rule_id, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -716,12 +1259,12 @@ async def delete_rule(
 
 @app.post("/policy/lists/{list_type}")
 async def add_to_list(
-    list_type: str,
+    list_type: PolicyListType,
     value: str,
     changed_by: str = "system",
     _: None = Depends(require_admin_token),
 ):
-    """Add a value to a blocklist or allowlist."""
+    """Add a value to a blocklist or allowlist (unknown list types get a 422)."""
     versioning = _require_policy_versioning()
     engine = _require_policy_engine()
     try:
@@ -729,7 +1272,7 @@ async def add_to_list(
         version = await versioning.update_list(update, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -744,7 +1287,7 @@ async def add_to_list(
 
 @app.delete("/policy/lists/{list_type}/{value}")
 async def remove_from_list(
-    list_type: str,
+    list_type: PolicyListType,
     value: str,
     changed_by: str = "system",
     _: None = Depends(require_admin_token),
@@ -757,12 +1300,44 @@ async def remove_from_list(
         version = await versioning.update_list(update, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
+
+        return {
+            "status": "success",
+            "version": version.version,
+            "change_summary": version.change_summary,
+        }
+    except PolicyValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.post("/policy/batch")
+async def apply_policy_batch(
+    operations: list[PolicyOperation],
+    changed_by: str = "system",
+    _: None = Depends(require_admin_token),
+):
+    """
+    Apply several policy changes as one version.
+
+    All operations are validated against the same working copy and saved
+    together, and the policy engine reloads once, instead of once per edit.
+    """
+    versioning = _require_policy_versioning()
+    engine = _require_policy_engine()
+    try:
+        version = await versioning.apply_batch(operations, changed_by=changed_by)
+
+        # Reload policy engine once for the whole batch
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
             "version": version.version,
             "change_summary": version.change_summary,
+            "operations": len(operations),
         }
     except PolicyValidationError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -788,7 +1363,7 @@ async def rollback_policy_version(
         version = await versioning.rollback(target_version, changed_by=changed_by)
 
         # Reload policy engine
-        engine.reload_policy()
+        await _apply_policy_change(engine)
 
         return {
             "status": "success",
@@ -800,21 +1375,60 @@ async def rollback_policy_version(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@app.get("/policy/diff/{version1}/{version2}")
-async def diff_policy_versions(
-    version1: str,
-    version2: str,
-    _: None = Depends(require_api_token),
-):
-    """Compare two policy versions and return differences."""
-    versioning = _require_policy_versioning()
-    v1 = await versioning.get_version(version1)
-    v2 = await versioning.get_version(version2)
+# Derived from the schema so a new block/allow list (a set-typed field) is
+# diffed without touching this module
+_POLICY_LIST_NAMES = tuple(
+    name for name, field in PolicyRules.model_fields.items()
+    if get_origin(field.annotation) is set
+)
+# Remaining top-level fields compared by value ("version" always differs)
+_POLICY_SETTING_NAMES = tuple(
+    name for name in PolicyRules.model_fields
+    if name not in _POLICY_LIST_NAMES and name not in ("version", "thresholds", "rules")
+)
+_DIFF_INDEX_CACHE_SIZE = 128
+_diff_index_cache: "OrderedDict[str, tuple[dict, dict[str, frozenset]]]" = OrderedDict()
+_DIFF_CACHE_SIZE = 256
+_diff_cache: "OrderedDict[tuple[str, str], list[dict]]" = OrderedDict()
 
-    if not v1:
-        raise HTTPException(status_code=404, detail=f"Version '{version1}' not found")
-    if not v2:
-        raise HTTPException(status_code=404, detail=f"Version '{version2}' not found")
+
+def _policy_diff_index(version: PolicyVersion) -> tuple[dict, dict[str, frozenset]]:
+    """
+    Rules keyed by id and lists as frozensets for a policy version.
+
+    Memoized by policy_hash (content-addressed, so entries never go stale)
+    in a small LRU, so repeated diffs reuse the indexes instead of
+    rebuilding them from policy_content.
+    """
+    key = version.policy_hash
+    index = _diff_index_cache.get(key)
+    if index is not None:
+        _diff_index_cache.move_to_end(key)
+        return index
+
+    content = version.policy_content
+    rules_by_id = {r["id"]: r for r in content.get("rules", [])}
+    lists = {name: frozenset(content.get(name, [])) for name in _POLICY_LIST_NAMES}
+    index = (rules_by_id, lists)
+    _diff_index_cache[key] = index
+    if len(_diff_index_cache) > _DIFF_INDEX_CACHE_SIZE:
+        _diff_index_cache.popitem(last=False)
+    return index
+
+
+def _policy_diff(v1: PolicyVersion, v2: PolicyVersion) -> list[dict]:
+    """
+    Changes from v1 to v2.
+
+    Memoized by the (policy_hash, policy_hash) pair: content-addressed like
+    _policy_diff_index, so a cached diff never goes stale and rollbacks to
+    identical content share entries.
+    """
+    cache_key = (v1.policy_hash, v2.policy_hash)
+    cached = _diff_cache.get(cache_key)
+    if cached is not None:
+        _diff_cache.move_to_end(cache_key)
+        return cached
 
     # Simple diff - compare JSON structures
     changes: list[dict] = []
@@ -822,46 +1436,89 @@ async def diff_policy_versions(
     # Compare thresholds
     t1 = v1.policy_content.get("thresholds", {})
     t2 = v2.policy_content.get("thresholds", {})
-    for key in set(t1.keys()) | set(t2.keys()):
-        if t1.get(key) != t2.get(key):
-            changes.append({
-                "type": "threshold",
-                "key": key,
-                "v1": t1.get(key),
-                "v2": t2.get(key),
-            })
+    for key in t1.keys() | t2.keys():
+        a = t1.get(key)
+        b = t2.get(key)
+        if a != b:
+            changes.append({"type": "threshold", "key": key, "v1": a, "v2": b})
+
+    # Compare top-level settings (default_action, description, ...)
+    for key in _POLICY_SETTING_NAMES:
+        s1 = v1.policy_content.get(key)
+        s2 = v2.policy_content.get(key)
+        if s1 != s2:
+            changes.append({"type": "setting", "key": key, "v1": s1, "v2": s2})
 
     # Compare rules
-    r1 = {r["id"]: r for r in v1.policy_content.get("rules", [])}
-    r2 = {r["id"]: r for r in v2.policy_content.get("rules", [])}
-    for key in set(r1.keys()) | set(r2.keys()):
-        if key not in r1:
-            changes.append({"type": "rule_added", "key": key, "v2": r2[key]})
-        elif key not in r2:
-            changes.append({"type": "rule_removed", "key": key, "v1": r1[key]})
-        elif r1[key] != r2[key]:
-            changes.append({"type": "rule_modified", "key": key, "v1": r1[key], "v2": r2[key]})
+    r1, lists1 = _policy_diff_index(v1)
+    r2, lists2 = _policy_diff_index(v2)
+    for key in r1.keys() | r2.keys():
+        # Rule entries are dicts, so None means absent
+        a = r1.get(key)
+        b = r2.get(key)
+        if a is None:
+            changes.append({"type": "rule_added", "key": key, "v2": b})
+        elif b is None:
+            changes.append({"type": "rule_removed", "key": key, "v1": a})
+        elif a != b:
+            changes.append({"type": "rule_modified", "key": key, "v1": a, "v2": b})
 
     # Compare lists
-    for list_name in ['blocklist_cards', 'blocklist_devices', 'blocklist_ips',
-                      'blocklist_users', 'allowlist_cards', 'allowlist_users',
-                      'allowlist_services']:
-        l1 = set(v1.policy_content.get(list_name, []))
-        l2 = set(v2.policy_content.get(list_name, []))
-        added = l2 - l1
-        removed = l1 - l2
-        if added or removed:
+    for list_name in _POLICY_LIST_NAMES:
+        l1 = lists1[list_name]
+        l2 = lists2[list_name]
+        # One C-level pass finds every changed entry; unchanged lists (the
+        # usual case) stop here, and only the changed entries are classified
+        changed = l1 ^ l2
+        if changed:
             changes.append({
                 "type": "list",
                 "key": list_name,
-                "added": list(added),
-                "removed": list(removed),
+                "added": [item for item in changed if item in l2],
+                "removed": [item for item in changed if item not in l2],
             })
 
+    _diff_cache[cache_key] = changes
+    if len(_diff_cache) > _DIFF_CACHE_SIZE:
+        _diff_cache.popitem(last=False)
+    return changes
+
+
+@app.get("/policy/diff/{version1}/{version2}")
+async def diff_policy_versions(
+    version1: str,
+    version2: str,
+    _: None = Depends(require_api_token),
+):
+    """Compare two policy versions and return differences."""
+    found: dict[str, PolicyVersion] = {}
+    for name in (version1, version2):
+        cached_version = _cached_inactive_version(name)
+        if cached_version is not None:
+            found[name] = cached_version
+    missing = [name for name in (version1, version2) if name not in found]
+    if missing:
+        fetched = await _require_policy_versioning().get_versions_bulk(missing)
+        for fetched_version in fetched.values():
+            _remember_version(fetched_version)
+        found.update(fetched)
+    v1 = found.get(version1)
+    v2 = found.get(version2)
+
+    if not v1:
+        raise HTTPException(status_code=404, detail=f"Version '{version1}' not found")
+    if not v2:
+        raise HTTPException(status_code=404, detail=f"Version '{version2}' not found")
+
+    # Identical content: a version against itself, or a rollback against its
+    # target (policy_hash excludes the version string)
+    if v1.policy_hash == v2.policy_hash:
+        return {"version1": version1, "version2": version2, "changes": []}
+
     return {
         "version1": version1,
         "version2": version2,
-        "changes": changes,
+        "changes": _policy_diff(v1, v2),
     }
 
 
@@ -883,8 +1540,9 @@ async def ingest_chargeback(
     ev_service = _require_evidence_service()
     fs = _require_feature_store()
 
-    # 1. Record chargeback in Postgres
-    record_id = await ev_service.record_chargeback(
+    # 1. Record chargeback in Postgres; the same query returns the original
+    #    transaction's evidence (affected entities)
+    record_id, evidence = await ev_service.record_chargeback_with_evidence(
         transaction_id=chargeback.transaction_id,
         chargeback_id=chargeback.chargeback_id,
         amount_cents=chargeback.amount_cents,
@@ -896,10 +1554,7 @@ async def ingest_chargeback(
     if not record_id:
         raise HTTPException(status_code=500, detail="Failed to record chargeback")
 
-    # 2. Look up original transaction to find affected entities
-    evidence = await ev_service.get_evidence(chargeback.transaction_id)
-
-    # 3. Update entity profiles in Redis with chargeback signal
+    # 2. Update entity profiles in Redis with chargeback signal
     if evidence:
         _fire_and_forget(
             fs.update_chargeback_profiles(
@@ -939,7 +1594,7 @@ async def ingest_refund(
     ev_service = _require_evidence_service()
     fs = _require_feature_store()
 
-    record_id = await ev_service.record_refund(
+    record_id, evidence = await ev_service.record_refund_with_evidence(
         transaction_id=refund.transaction_id,
         refund_id=refund.refund_id,
         amount_cents=refund.amount_cents,
@@ -950,8 +1605,6 @@ async def ingest_refund(
     if not record_id:
         raise HTTPException(status_code=500, detail="Failed to record refund")
 
-    evidence = await ev_service.get_evidence(refund.transaction_id)
-
     if evidence:
         _fire_and_forget(
             fs.update_refund_profiles(
@@ -97,6 +97,25 @@ class Settings(BaseSettings):
         default="",
         description="PostgreSQL password (required - set via POSTGRES_PASSWORD env var)"
     )
+    postgres_pool_size: int = Field(
+        default=20,
+        ge=1,
+        description="Persistent connections in the shared API engine pool (per worker)"
+    )
+    postgres_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        description="Extra connections the API pool may open under burst load"
+    )
+    postgres_pool_recycle_s: int = Field(
+        default=3600,
+        description="Recycle pooled connections older than this many seconds (-1 disables)"
+    )
+    postgres_statement_cache_size: int = Field(
+        default=1024,
+        ge=0,
+        description="Prepared statements cached per pooled connection (0 disables, e.g. behind pgbouncer)"
+    )
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -131,6 +150,21 @@ class Settings(BaseSettings):
         default=1,
         description="Number of API worker processes"
     )
+    api_max_bulk_decisions: int = Field(
+        default=1000,
+        ge=1,
+        description="Maximum events accepted by one POST /decide/bulk request"
+    )
+    api_background_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        description="Pending post-decision tasks (evidence, profiles) before new ones are dropped"
+    )
+    api_background_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Worker tasks draining the post-decision background queue"
+    )
 
     # =========================================================================
     # Security / Access Control (capstone-friendly)
@@ -0,0 +1,18 @@
+"""
+Shared Constants
+
+Domain constants used by both the API and the offline ML tooling.
+"""
+
+import sys
+
+# Card-network chargeback reason codes treated as criminal fraud (Visa 10.x).
+# Frozen and interned: safe to share across threads and cheap to test
+# membership against on the request path.
+CRIMINAL_REASON_CODES: frozenset[str] = frozenset(
+    sys.intern(code) for code in ("10.1", "10.2", "10.3", "10.4", "10.5")
+)
+
+# Deterministic order for SQL array binds, so the statement and its
+# parameters are identical on every run
+CRIMINAL_REASON_CODES_SORTED: tuple[str, ...] = tuple(sorted(CRIMINAL_REASON_CODES))
@@ -15,7 +15,7 @@ import hmac
 import hashlib
 import time
 from datetime import datetime, UTC, timedelta
-from typing import Optional
+from typing import Optional, Union
 from uuid import uuid4
 
 from sqlalchemy import text
@@ -50,27 +50,30 @@ class EvidenceService:
     - Decision and scores
     """
 
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, engine: Optional[AsyncEngine] = None):
         """
         Initialize evidence service.
 
         Args:
             database_url: PostgreSQL connection URL
+            engine: Shared engine to use instead of creating (and owning) one
         """
         self.database_url = database_url
-        self.engine: Optional[AsyncEngine] = None
+        self.engine: Optional[AsyncEngine] = engine
+        self._owns_engine = engine is None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
     async def initialize(self) -> None:
         """Initialize database connection."""
         try:
-            self.engine = create_async_engine(
-                self.database_url,
-                echo=settings.app_debug,
-                pool_size=5,
-                max_overflow=10,
-                pool_pre_ping=True,
-            )
+            if self.engine is None:
+                self.engine = create_async_engine(
+                    self.database_url,
+                    echo=settings.app_debug,
+                    pool_size=5,
+                    max_overflow=10,
+                    pool_pre_ping=True,
+                )
             self.session_factory = async_sessionmaker(
                 bind=self.engine,
                 class_=AsyncSession,
@@ -82,7 +85,7 @@ class EvidenceService:
 
     async def close(self) -> None:
         """Close database connections."""
-        if self.engine:
+        if self.engine and self._owns_engine:
             await self.engine.dispose()
 
     async def health_check(self) -> bool:
@@ -477,10 +480,15 @@ class EvidenceService:
     async def store_idempotency_response(
         self,
         idempotency_key: str,
-        response_json: dict,
+        response_json: Union[dict, str],
         ttl_hours: int = 24,
     ) -> None:
-        """Store idempotency response in Postgres with TTL."""
+        """
+        Store idempotency response in Postgres with TTL.
+
+        `response_json` may be a dict or an already-serialized JSON string,
+        which is stored as-is.
+        """
         if not self.session_factory:
             return
 
@@ -504,7 +512,10 @@ class EvidenceService:
                 """),
                 {
                     "idempotency_key": idempotency_key,
-                    "response_json": self._json_dumps(response_json),
+                    "response_json": (
+                        response_json if isinstance(response_json, str)
+                        else self._json_dumps(response_json)
+                    ),
                     "created_at": datetime.now(UTC),
                     "expires_at": expires_at,
                 },
@@ -575,6 +586,16 @@ class EvidenceService:
             return None
         return json.dumps(value, sort_keys=True)
 
+    @staticmethod
+    def _evidence_from_row(row) -> Optional[dict]:
+        """Decode the to_jsonb(evidence) column of a *_with_evidence row."""
+        if not row or row["evidence"] is None:
+            return None
+        evidence = row["evidence"]
+        if isinstance(evidence, str):
+            return dict(json.loads(evidence))
+        return dict(evidence)
+
     @staticmethod
     def _json_dumps(value: object) -> str:
         """Safe JSON serialization for datetime and pydantic types."""
@@ -608,39 +629,70 @@ class EvidenceService:
         Returns:
             Chargeback record ID if successful
         """
+        record_id, _ = await self.record_chargeback_with_evidence(
+            transaction_id, chargeback_id, amount_cents, reason_code,
+            reason_description=reason_description, fraud_type=fraud_type,
+        )
+        return record_id
+
+    async def record_chargeback_with_evidence(
+        self,
+        transaction_id: str,
+        chargeback_id: str,
+        amount_cents: int,
+        reason_code: str,
+        reason_description: Optional[str] = None,
+        fraud_type: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[dict]]:
+        """
+        Record a chargeback and fetch the original transaction's evidence.
+
+        Same as record_chargeback, but the INSERT runs in a CTE joined to
+        transaction_evidence, so the affected entities come back in the same
+        round trip instead of a follow-up get_evidence().
+
+        Returns:
+            (chargeback record ID or None on failure, evidence dict or None)
+        """
         if not self.session_factory:
-            return None
+            return None, None
 
         try:
             record_id = str(uuid4())
 
             async with self.session_factory() as session:
                 started_at = time.perf_counter()
-                await session.execute(
+                result = await session.execute(
                     text("""
-                        INSERT INTO chargebacks (
-                            id,
-                            transaction_id,
-                            chargeback_id,
-                            received_at,
-                            amount_cents,
-                            currency,
-                            reason_code,
-                            reason_description,
-                            fraud_type,
-                            status
-                        ) VALUES (
-                            :id,
-                            :transaction_id,
-                            :chargeback_id,
-                            :received_at,
-                            :amount_cents,
-                            :currency,
-                            :reason_code,
-                            :reason_description,
-                            :fraud_type,
-                            :status
+                        WITH ins AS (
+                            INSERT INTO chargebacks (
+                                id,
+                                transaction_id,
+                                chargeback_id,
+                                received_at,
+                                amount_cents,
+                                currency,
+                                reason_code,
+                                reason_description,
+                                fraud_type,
+                                status
+                            ) VALUES (
+                                :id,
+                                :transaction_id,
+                                :chargeback_id,
+                                :received_at,
+                                :amount_cents,
+                                :currency,
+                                :reason_code,
+                                :reason_description,
+                                :fraud_type,
+                                :status
+                            )
+                            RETURNING transaction_id
                         )
+                        SELECT to_jsonb(e) AS evidence
+                        FROM ins
+                        JOIN transaction_evidence e ON e.transaction_id = ins.transaction_id
                     """),
                     {
                         "id": record_id,
@@ -655,15 +707,16 @@ class EvidenceService:
                         "status": "RECEIVED",
                     },
                 )
+                row = result.mappings().first()
                 await session.commit()
                 metrics.postgres_latency.observe((time.perf_counter() - started_at) * 1000)
 
-            return record_id
+            return record_id, self._evidence_from_row(row)
 
         except Exception as e:
             logger.warning("Chargeback recording failed: %s", e)
             metrics.errors_total.labels(error_type="ChargebackRecordFailed").inc()
-            return None
+            return None, None
 
     async def record_refund(
         self,
@@ -690,37 +743,65 @@ class EvidenceService:
         Returns:
             Refund record ID if successful
         """
+        record_id, _ = await self.record_refund_with_evidence(
+            transaction_id, refund_id, amount_cents,
+            reason_code=reason_code, reason_description=reason_description,
+        )
+        return record_id
+
+    async def record_refund_with_evidence(
+        self,
+        transaction_id: str,
+        refund_id: str,
+        amount_cents: int,
+        reason_code: Optional[str] = None,
+        reason_description: Optional[str] = None,
+    ) -> tuple[Optional[str], Optional[dict]]:
+        """
+        Record a refund and fetch the original transaction's evidence.
+
+        Refund counterpart of record_chargeback_with_evidence.
+
+        Returns:
+            (refund record ID or None on failure, evidence dict or None)
+        """
         if not self.session_factory:
-            return None
+            return None, None
 
         try:
             record_id = str(uuid4())
 
             async with self.session_factory() as session:
                 started_at = time.perf_counter()
-                await session.execute(
+                result = await session.execute(
                     text("""
-                        INSERT INTO refunds (
-                            id,
-                            transaction_id,
-                            refund_id,
-                            processed_at,
-                            amount_cents,
-                            currency,
-                            reason_code,
-                            reason_description,
-                            status
-                        ) VALUES (
-                            :id,
-                            :transaction_id,
-                            :refund_id,
-                            :processed_at,
-                            :amount_cents,
-                            :currency,
-                            :reason_code,
-                            :reason_description,
-                            :status
+                        WITH ins AS (
+                            INSERT INTO refunds (
+                                id,
+                                transaction_id,
+                                refund_id,
+                                processed_at,
+                                amount_cents,
+                                currency,
+                                reason_code,
+                                reason_description,
+                                status
+                            ) VALUES (
+                                :id,
+                                :transaction_id,
+                                :refund_id,
+                                :processed_at,
+                                :amount_cents,
+                                :currency,
+                                :reason_code,
+                                :reason_description,
+                                :status
+                            )
+                            RETURNING transaction_id
                         )
+                        SELECT to_jsonb(e) AS evidence
+                        FROM ins
+                        JOIN transaction_evidence e ON e.transaction_id = ins.transaction_id
                     """),
                     {
                         "id": record_id,
@@ -734,12 +815,13 @@ class EvidenceService:
                         "status": "RECEIVED",
                     },
                 )
+                row = result.mappings().first()
                 await session.commit()
                 metrics.postgres_latency.observe((time.perf_counter() - started_at) * 1000)
 
-            return record_id
+            return record_id, self._evidence_from_row(row)
 
         except Exception as e:
             logger.warning("Refund recording failed: %s", e)
             metrics.errors_total.labels(error_type="RefundRecordFailed").inc()
-            return None
+            return None, None
@@ -220,52 +220,79 @@ class FeatureStore:
     # Entity Profile Operations
     # =========================================================================
 
+    def _profile_lookups(self, event: PaymentEvent) -> list[tuple[str, str]]:
+        """(profile kind, entity id) for every profile the event references."""
+        lookups: list[tuple[str, str]] = []
+        if event.card_token:
+            lookups.append(("card", event.card_token))
+        if event.device_id:
+            lookups.append(("device", event.device_id))
+        if event.ip_address:
+            lookups.append(("ip", event.ip_address))
+        if event.user_id:
+            lookups.append(("user", event.user_id))
+        # Service profile (replaces merchant profile for telco)
+        if event.service_id:
+            lookups.append(("service", event.service_id))
+        return lookups
+
+    def queue_profile_reads(self, pipe: Any, event: PaymentEvent) -> list[str]:
+        """
+        Queue the event's profile HGETALLs on a caller-owned pipeline.
+
+        Lets the API fetch profiles in the same round trip as its idempotency
+        lookup. Returns the profile kinds in queue order; pass
+        dict(zip(kinds, results)) to compute_features as preloaded_profiles.
+        """
+        kinds = []
+        for kind, entity_id in self._profile_lookups(event):
+            pipe.hgetall(f"{self.prefix}profile:{kind}:{entity_id}")
+            kinds.append(kind)
+        return kinds
+
     async def get_entity_profiles(
         self,
         event: PaymentEvent,
+        preloaded: Optional[dict[str, dict]] = None,
     ) -> EntityProfiles:
         """
         Retrieve entity profiles for a transaction.
 
         Args:
             event: Payment event
+            preloaded: Raw profile hashes by kind, from queue_profile_reads;
+                skips the Redis reads when given
 
         Returns:
             EntityProfiles with all available profiles
         """
-        tasks: list[Any] = []
-        keys: list[str] = []
-
-        # Queue profile lookups
-        if event.card_token:
-            tasks.append(self._get_card_profile(event.card_token))
-            keys.append("card")
-
-        if event.device_id:
-            tasks.append(self._get_device_profile(event.device_id))
-            keys.append("device")
-
-        if event.ip_address:
-            tasks.append(self._get_ip_profile(event.ip_address))
-            keys.append("ip")
-
-        if event.user_id:
-            tasks.append(self._get_user_profile(event.user_id))
-            keys.append("user")
+        lookups = self._profile_lookups(event)
+        profiles = EntityProfiles()
 
-        # Service profile (replaces merchant profile for telco)
-        if event.service_id:
-            tasks.append(self._get_service_profile(event.service_id))
-            keys.append("service")
+        if preloaded is not None:
+            for kind, entity_id in lookups:
+                profile = self._PROFILE_PARSERS[kind](entity_id, preloaded.get(kind) or {})
+                if profile is not None:
+                    setattr(profiles, kind, profile)
+            return profiles
+
+        getters = {
+            "card": self._get_card_profile,
+            "device": self._get_device_profile,
+            "ip": self._get_ip_profile,
+            "user": self._get_user_profile,
+            "service": self._get_service_profile,
+        }
 
         # Execute in parallel
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *(getters[kind](entity_id) for kind, entity_id in lookups),
+            return_exceptions=True,
+        )
 
-        # Build profiles object
-        profiles = EntityProfiles()
-        for key, result in zip(keys, results):
+        for (kind, _), result in zip(lookups, results):
             if not isinstance(result, Exception) and result is not None:
-                setattr(profiles, key, result)
+                setattr(profiles, kind, result)
 
         return profiles
 
@@ -273,7 +300,10 @@ class FeatureStore:
         """Get card profile from Redis hash."""
         key = f"{self.prefix}profile:card:{card_token}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_card_profile(card_token, data)
 
+    @staticmethod
+    def _parse_card_profile(card_token: str, data: dict) -> Optional[CardProfile]:
         if not data:
             return None
 
@@ -292,7 +322,10 @@ class FeatureStore:
         """Get device profile from Redis hash."""
         key = f"{self.prefix}profile:device:{device_id}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_device_profile(device_id, data)
 
+    @staticmethod
+    def _parse_device_profile(device_id: str, data: dict) -> Optional[DeviceProfile]:
         if not data:
             return None
 
@@ -312,7 +345,10 @@ class FeatureStore:
         """Get IP profile from Redis hash."""
         key = f"{self.prefix}profile:ip:{ip_address}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_ip_profile(ip_address, data)
 
+    @staticmethod
+    def _parse_ip_profile(ip_address: str, data: dict) -> Optional[IPProfile]:
         if not data:
             return None
 
@@ -335,7 +371,10 @@ class FeatureStore:
         """Get user profile from Redis hash."""
         key = f"{self.prefix}profile:user:{user_id}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_user_profile(user_id, data)
 
+    @staticmethod
+    def _parse_user_profile(user_id: str, data: dict) -> Optional[UserProfile]:
         if not data:
             return None
 
@@ -358,7 +397,10 @@ class FeatureStore:
         """Get service profile from Redis hash."""
         key = f"{self.prefix}profile:service:{service_id}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_service_profile(service_id, data)
 
+    @staticmethod
+    def _parse_service_profile(service_id: str, data: dict) -> Optional[ServiceProfile]:
         if not data:
             return None
 
@@ -374,7 +416,10 @@ class FeatureStore:
         """Get merchant profile from Redis hash."""
         key = f"{self.prefix}profile:merchant:{merchant_id}"
         data = await self.redis.hgetall(key)  # type: ignore[misc]
+        return self._parse_merchant_profile(merchant_id, data)
 
+    @staticmethod
+    def _parse_merchant_profile(merchant_id: str, data: dict) -> Optional[MerchantProfile]:
         if not data:
             return None
 
@@ -389,6 +434,14 @@ class FeatureStore:
             total_transactions=int(data.get("total_transactions", 0)),
         )
 
+    _PROFILE_PARSERS = {
+        "card": _parse_card_profile,
+        "device": _parse_device_profile,
+        "ip": _parse_ip_profile,
+        "user": _parse_user_profile,
+        "service": _parse_service_profile,
+    }
+
     # =========================================================================
     # Entity Profile Updates
     # =========================================================================
@@ -410,72 +463,87 @@ class FeatureStore:
             event: Payment event
             is_decline: Whether the transaction was declined
         """
+        pipe = self.redis.pipeline(transaction=False)
+        await self.queue_profile_updates(pipe, event, is_decline)
+        # Best effort, as before: one failed command must not hide the rest
+        await pipe.execute(raise_on_error=False)
+
+    async def queue_profile_updates(
+        self,
+        pipe: Any,
+        event: PaymentEvent,
+        is_decline: bool = False,
+    ) -> None:
+        """
+        Queue the post-transaction profile and velocity writes on a pipeline.
+
+        Counterpart of queue_profile_reads: the caller owns and executes the
+        pipeline, so the API can send these writes together with its
+        idempotency cache write in one round trip. The one read involved (the
+        user's running amount stats) is awaited here, before the caller
+        executes.
+        """
         now = datetime.now(UTC)
         now_ms = int(time.time() * 1000)
-        tasks = []
 
         # Update card profile and velocity
         if event.card_token:
-            tasks.append(self._update_card(event, now, now_ms, is_decline))
+            self._queue_card_updates(pipe, event, now, now_ms, is_decline)
 
         # Update device profile and velocity
         if event.device_id:
-            tasks.append(self._update_device(event, now, now_ms))
+            self._queue_device_updates(pipe, event, now, now_ms)
 
         # Update IP profile and velocity
         if event.ip_address:
-            tasks.append(self._update_ip(event, now, now_ms))
+            self._queue_ip_updates(pipe, event, now, now_ms)
 
         # Update user profile and velocity
         if event.user_id:
-            tasks.append(self._update_user(event, now, now_ms))
+            await self._queue_user_updates(pipe, event, now, now_ms)
 
         # Update service profile (telco/MSP)
         if event.service_id:
-            tasks.append(self._update_service(event, now, now_ms))
-
-        # Execute all updates in parallel
-        await asyncio.gather(*tasks, return_exceptions=True)
+            self._queue_service_updates(pipe, event, now, now_ms)
 
-    async def _update_card(
+    def _queue_card_updates(
         self,
+        pipe: Any,
         event: PaymentEvent,
         now: datetime,
         now_ms: int,
         is_decline: bool,
     ) -> None:
-        """Update card profile and velocity counters."""
+        """Queue card profile and velocity counter writes."""
         card_token = event.card_token
         tx_id = event.transaction_id
 
-        pipe = self.redis.pipeline()
-
         # Update velocity counters
-        await self.velocity.increment(
-            "card", card_token, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_increment(
+            pipe, "card", card_token, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         if is_decline:
-            await self.velocity.increment(
-                "card", card_token, "declines", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_increment(
+                pipe, "card", card_token, "declines", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
 
         # Track distinct entities (service_id replaces merchant_id for telco)
         if event.service_id:
-            await self.velocity.add_distinct(
-                "card", card_token, "accounts", event.service_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "card", card_token, "accounts", event.service_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
         if event.device and event.device.device_id:
-            await self.velocity.add_distinct(
-                "card", card_token, "devices", event.device.device_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "card", card_token, "devices", event.device.device_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
         if event.geo and event.geo.ip_address:
-            await self.velocity.add_distinct(
-                "card", card_token, "ips", event.geo.ip_address, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "card", card_token, "ips", event.geo.ip_address, now_ms, ttl_seconds=self.WINDOW_30D
             )
         if event.user_id:
-            await self.velocity.add_distinct(
-                "card", card_token, "users", event.user_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "card", card_token, "users", event.user_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
 
         # Update profile hash
@@ -490,33 +558,30 @@ class FeatureStore:
             pipe.hset(profile_key, "last_geo_lat", str(event.geo.latitude))
             pipe.hset(profile_key, "last_geo_lon", str(event.geo.longitude))
 
-        await pipe.execute()
-
-    async def _update_device(
+    def _queue_device_updates(
         self,
+        pipe: Any,
         event: PaymentEvent,
         now: datetime,
         now_ms: int,
     ) -> None:
-        """Update device profile and velocity counters."""
+        """Queue device profile and velocity counter writes."""
         assert event.device_id is not None
         device_id: str = event.device_id
         tx_id = event.transaction_id
 
-        pipe = self.redis.pipeline()
-
         # Update velocity counters
-        await self.velocity.increment(
-            "device", device_id, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_increment(
+            pipe, "device", device_id, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         # Track distinct cards and users
-        await self.velocity.add_distinct(
-            "device", device_id, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_add_distinct(
+            pipe, "device", device_id, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
         )
         if event.user_id:
-            await self.velocity.add_distinct(
-                "device", device_id, "users", event.user_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "device", device_id, "users", event.user_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
 
         # Update profile hash
@@ -534,29 +599,27 @@ class FeatureStore:
             pipe.hset(profile_key, "last_city", event.geo.city or "")
 
         pipe.expire(profile_key, self.WINDOW_90D)
-        await pipe.execute()
 
-    async def _update_ip(
+    def _queue_ip_updates(
         self,
+        pipe: Any,
         event: PaymentEvent,
         now: datetime,
         now_ms: int,
     ) -> None:
-        """Update IP profile and velocity counters."""
+        """Queue IP profile and velocity counter writes."""
         assert event.ip_address is not None
         ip_address: str = event.ip_address
         tx_id = event.transaction_id
 
-        pipe = self.redis.pipeline()
-
         # Update velocity counters
-        await self.velocity.increment(
-            "ip", ip_address, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_increment(
+            pipe, "ip", ip_address, "attempts", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         # Track distinct cards
-        await self.velocity.add_distinct(
-            "ip", ip_address, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_add_distinct(
+            pipe, "ip", ip_address, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         # Update profile hash
@@ -575,33 +638,31 @@ class FeatureStore:
             pipe.hset(profile_key, "city", event.geo.city or "")
 
         pipe.expire(profile_key, self.WINDOW_30D)
-        await pipe.execute()
 
-    async def _update_user(
+    async def _queue_user_updates(
         self,
+        pipe: Any,
         event: PaymentEvent,
         now: datetime,
         now_ms: int,
     ) -> None:
-        """Update user profile and velocity counters."""
+        """Queue user profile and velocity counter writes."""
         assert event.user_id is not None
         user_id: str = event.user_id
         tx_id = event.transaction_id
 
-        pipe = self.redis.pipeline()
-
         # Update velocity counters
-        await self.velocity.increment(
-            "user", user_id, "transactions", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_increment(
+            pipe, "user", user_id, "transactions", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         # Track distinct cards
-        await self.velocity.add_distinct(
-            "user", user_id, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_add_distinct(
+            pipe, "user", user_id, "cards", event.card_token, now_ms, ttl_seconds=self.WINDOW_30D
         )
         if event.device_id:
-            await self.velocity.add_distinct(
-                "user", user_id, "devices", event.device_id, now_ms, ttl_seconds=self.WINDOW_30D
+            self.velocity.queue_add_distinct(
+                pipe, "user", user_id, "devices", event.device_id, now_ms, ttl_seconds=self.WINDOW_30D
             )
 
         # Update amount counter
@@ -627,7 +688,6 @@ class FeatureStore:
             pipe.hset(profile_key, "account_age_days", str(event.account_age_days))
 
         pipe.expire(profile_key, self.WINDOW_30D)
-        await pipe.execute()
 
     async def _update_amount_stats(
         self,
@@ -665,21 +725,20 @@ class FeatureStore:
 
         return count, round(mean, 4), round(m2, 4)
 
-    async def _update_service(
+    def _queue_service_updates(
         self,
+        pipe: Any,
         event: PaymentEvent,
         now: datetime,
         now_ms: int,
     ) -> None:
-        """Update service profile counters."""
+        """Queue service profile counter writes."""
         service_id = event.service_id
         tx_id = event.transaction_id
 
-        pipe = self.redis.pipeline()
-
         # Track velocity for service (basic)
-        await self.velocity.increment(
-            "service", service_id, "transactions", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
+        self.velocity.queue_increment(
+            pipe, "service", service_id, "transactions", tx_id, now_ms, ttl_seconds=self.WINDOW_30D
         )
 
         profile_key = f"{self.prefix}profile:service:{service_id}"
@@ -690,7 +749,6 @@ class FeatureStore:
             pipe.hset(profile_key, "service_name", event.service_name)
 
         pipe.expire(profile_key, self.WINDOW_30D)
-        await pipe.execute()
 
     # =========================================================================
     # Chargeback Profile Updates
@@ -752,6 +810,7 @@ class FeatureStore:
     async def compute_features(
         self,
         event: PaymentEvent,
+        preloaded_profiles: Optional[dict[str, dict]] = None,
     ) -> FeatureSet:
         """
         Compute complete feature set for a transaction.
@@ -763,13 +822,15 @@ class FeatureStore:
 
         Args:
             event: Payment event
+            preloaded_profiles: Raw profile hashes already read by the caller
+                (see queue_profile_reads)
 
         Returns:
             Complete FeatureSet
         """
         # Compute velocity, profiles, and relationship flags in parallel
         velocity_task = self.compute_velocity_features(event)
-        profiles_task = self.get_entity_profiles(event)
+        profiles_task = self.get_entity_profiles(event, preloaded=preloaded_profiles)
         relation_task = self._get_relationship_flags(event)
 
         velocity_features, profiles, relation_flags = await asyncio.gather(
@@ -83,22 +83,38 @@ class VelocityCounter:
         Returns:
             Number of elements added (0 if event_id already exists)
         """
+        # Use pipeline for atomic operation
+        pipe = self.redis.pipeline()
+        self.queue_increment(pipe, entity_type, entity_id, metric, event_id, timestamp_ms, ttl_seconds)
+        results = await pipe.execute()
+        return int(results[0])  # Number of elements added
+
+    def queue_increment(
+        self,
+        pipe,
+        entity_type: str,
+        entity_id: str,
+        metric: str,
+        event_id: str,
+        timestamp_ms: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        """
+        Queue increment() on a caller-owned pipeline without executing it.
+
+        Queues two commands (ZADD, EXPIRE), so batched writers can fold many
+        counters into one round trip.
+        """
         key = self._make_key(entity_type, entity_id, metric)
         ts = timestamp_ms or int(time.time() * 1000)
         ttl = ttl_seconds or self.default_ttl
 
-        # Use pipeline for atomic operation
-        pipe = self.redis.pipeline()
-
         # Add event to ZSET with timestamp as score
         pipe.zadd(key, {event_id: ts})
 
         # Set TTL on key (refreshed on each write)
         pipe.expire(key, ttl)
 
-        results = await pipe.execute()
-        return int(results[0])  # Number of elements added
-
     async def count(
         self,
         entity_type: str,
@@ -177,17 +193,29 @@ class VelocityCounter:
         Returns:
             Number of elements added (0 if value already exists)
         """
+        pipe = self.redis.pipeline()
+        self.queue_add_distinct(pipe, entity_type, entity_id, metric, value, timestamp_ms, ttl_seconds)
+        results = await pipe.execute()
+        return int(results[0])
+
+    def queue_add_distinct(
+        self,
+        pipe,
+        entity_type: str,
+        entity_id: str,
+        metric: str,
+        value: str,
+        timestamp_ms: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        """Queue add_distinct() on a caller-owned pipeline without executing it."""
         key = self._make_key(entity_type, entity_id, metric)
         ts = timestamp_ms or int(time.time() * 1000)
         ttl = ttl_seconds or self.default_ttl
 
-        pipe = self.redis.pipeline()
         pipe.zadd(key, {value: ts})
         pipe.expire(key, ttl)
 
-        results = await pipe.execute()
-        return int(results[0])
-
     async def has_distinct(
         self,
         entity_type: str,
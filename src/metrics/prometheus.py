@@ -170,6 +170,24 @@ class FraudMetrics:
             buckets=[5, 10, 25, 50, 100, 250],
         )
 
+        # Post-decision background work (evidence capture, profile updates)
+        self.background_queue_depth = Gauge(
+            "fraud_background_queue_depth",
+            "Background tasks waiting for a worker",
+        )
+
+        self.background_dropped = Counter(
+            "fraud_background_dropped_total",
+            "Background tasks dropped because the queue was full",
+            labelnames=["task"],
+        )
+
+        self.background_inline = Counter(
+            "fraud_background_inline_total",
+            "Required background tasks run in the request because the queue was full",
+            labelnames=["task"],
+        )
+
         # Component health
         self.component_health = Gauge(
             "fraud_component_health",
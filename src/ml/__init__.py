@@ -1,6 +1,13 @@
 """ML utilities for FraudDetection."""
 
-from .features import FEATURE_COLUMNS, extract_feature_dict, extract_from_snapshot, vector_from_feature_dict
+from .features import (
+    FEATURE_COLUMNS,
+    extract_feature_dict,
+    extract_from_snapshot,
+    fill_from_snapshot,
+    snapshot_select_columns,
+    vector_from_feature_dict,
+)
 from .registry import ModelRegistry, ModelEntry
 from .replay import ReplayMetrics, ReplayResults, replay
 from .drift import DriftReport, DriftScore, compute_drift_report
@@ -11,6 +18,8 @@ __all__ = [
     "FEATURE_COLUMNS",
     "extract_feature_dict",
     "extract_from_snapshot",
+    "fill_from_snapshot",
+    "snapshot_select_columns",
     "vector_from_feature_dict",
     "ModelRegistry",
     "ModelEntry",
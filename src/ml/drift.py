@@ -17,7 +17,7 @@ import numpy as np
 from sqlalchemy import create_engine, text
 
 from ..config import settings
-from .features import FEATURE_COLUMNS, extract_from_snapshot, vector_from_feature_dict
+from .features import FEATURE_COLUMNS, fill_from_snapshot
 
 
 @dataclass
@@ -81,7 +81,8 @@ def _load_feature_matrix(
             },
         ).mappings().all()
 
-    vectors: list[list[float]] = []
+    x = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=float)
+    filled = 0
     for row in rows:
         snapshot = row.get("features_snapshot")
         if snapshot is None:
@@ -93,13 +94,13 @@ def _load_feature_matrix(
                 continue
         if not isinstance(snapshot, dict):
             continue
-        feature_dict = extract_from_snapshot(snapshot)
-        vectors.append(vector_from_feature_dict(feature_dict))
+        fill_from_snapshot(x[filled], snapshot)
+        filled += 1
 
-    if not vectors:
+    if not filled:
         return np.array([])
 
-    return np.array(vectors, dtype=float)
+    return x[:filled]
 
 
 def compute_psi(
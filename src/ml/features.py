@@ -106,6 +106,59 @@ def vector_from_feature_dict(values: dict[str, float]) -> list[float]:
     return [float(values.get(name, 0.0)) for name in FEATURE_COLUMNS]
 
 
+# Where each FEATURE_COLUMNS entry lives in an evidence snapshot:
+# (section, key). card_decline_rate_1h falls back to a derived value.
+_SNAPSHOT_SOURCES: dict[str, tuple[str, str]] = {
+    "card_attempts_10m": ("velocity", "card_attempts_10m"),
+    "card_attempts_1h": ("velocity", "card_attempts_1h"),
+    "card_attempts_24h": ("velocity", "card_attempts_24h"),
+    "device_distinct_cards_1h": ("velocity", "device_distinct_cards_1h"),
+    "device_distinct_cards_24h": ("velocity", "device_distinct_cards_24h"),
+    "ip_distinct_cards_1h": ("velocity", "ip_distinct_cards_1h"),
+    "user_amount_24h_cents": ("velocity", "user_amount_24h_cents"),
+    "card_decline_rate_1h": ("velocity", "card_decline_rate_1h"),
+    "card_age_hours": ("entity", "card_age_hours"),
+    "device_age_hours": ("entity", "device_age_hours"),
+    "user_account_age_days": ("entity", "user_account_age_days"),
+    "user_chargeback_count_lifetime": ("entity", "user_chargeback_count"),
+    "user_chargeback_rate_90d": ("entity", "user_chargeback_rate_90d"),
+    "user_refund_count_90d": ("entity", "user_refund_count_90d"),
+    "card_distinct_devices_30d": ("velocity", "card_distinct_devices_30d"),
+    "card_distinct_users_30d": ("velocity", "card_distinct_users_30d"),
+    "amount_usd": ("transaction", "amount_usd"),
+    "amount_zscore": ("transaction", "amount_zscore"),
+    "is_new_card_for_user": ("transaction", "is_new_card_for_user"),
+    "is_new_device_for_user": ("transaction", "is_new_device_for_user"),
+    "hour_of_day": ("transaction", "hour_of_day"),
+    "is_weekend": ("transaction", "is_weekend"),
+    "is_emulator": ("entity", "device_is_emulator"),
+    "is_rooted": ("entity", "device_is_rooted"),
+    "is_datacenter_ip": ("entity", "ip_is_datacenter"),
+    "is_vpn": ("entity", "ip_is_vpn"),
+    "is_tor": ("entity", "ip_is_tor"),
+    "ip_risk_score": ("entity", "ip_risk_score"),
+}
+_SNAPSHOT_PATHS: tuple[tuple[str, str], ...] = tuple(_SNAPSHOT_SOURCES[name] for name in FEATURE_COLUMNS)
+_DECLINE_RATE_INDEX = FEATURE_COLUMNS.index("card_decline_rate_1h")
+
+
+def _snapshot_values(snapshot: dict[str, Any]) -> list[float]:
+    """Read snapshot features as numbers in FEATURE_COLUMNS order."""
+    sections = {
+        "velocity": snapshot.get("velocity") or {},
+        "entity": snapshot.get("entity") or {},
+        "transaction": snapshot.get("transaction") or {},
+    }
+    values = [_as_number(sections[section].get(key)) for section, key in _SNAPSHOT_PATHS]
+
+    velocity = sections["velocity"]
+    if velocity.get("card_decline_rate_1h") is None:
+        attempts_1h = _as_number(velocity.get("card_attempts_1h"))
+        declines_1h = _as_number(velocity.get("card_declines_1h"))
+        values[_DECLINE_RATE_INDEX] = declines_1h / attempts_1h if attempts_1h > 0 else 0.0
+    return values
+
+
 def extract_from_snapshot(snapshot: dict[str, Any]) -> dict[str, float]:
     """
     Extract features from an evidence snapshot.
@@ -117,45 +170,46 @@ def extract_from_snapshot(snapshot: dict[str, Any]) -> dict[str, float]:
       "transaction": {...}
     }
     """
-    velocity = snapshot.get("velocity") or {}
-    entity = snapshot.get("entity") or {}
-    transaction = snapshot.get("transaction") or {}
+    return dict(zip(FEATURE_COLUMNS, _snapshot_values(snapshot)))
 
-    decline_rate_1h = velocity.get("card_decline_rate_1h")
-    if decline_rate_1h is None:
-        attempts_1h = _as_number(velocity.get("card_attempts_1h"))
-        declines_1h = _as_number(velocity.get("card_declines_1h"))
-        decline_rate_1h = declines_1h / attempts_1h if attempts_1h > 0 else 0.0
-
-    values: dict[str, Any] = {
-        "card_attempts_10m": velocity.get("card_attempts_10m"),
-        "card_attempts_1h": velocity.get("card_attempts_1h"),
-        "card_attempts_24h": velocity.get("card_attempts_24h"),
-        "device_distinct_cards_1h": velocity.get("device_distinct_cards_1h"),
-        "device_distinct_cards_24h": velocity.get("device_distinct_cards_24h"),
-        "ip_distinct_cards_1h": velocity.get("ip_distinct_cards_1h"),
-        "user_amount_24h_cents": velocity.get("user_amount_24h_cents"),
-        "card_decline_rate_1h": decline_rate_1h,
-        "card_age_hours": entity.get("card_age_hours"),
-        "device_age_hours": entity.get("device_age_hours"),
-        "user_account_age_days": entity.get("user_account_age_days"),
-        "user_chargeback_count_lifetime": entity.get("user_chargeback_count"),
-        "user_chargeback_rate_90d": entity.get("user_chargeback_rate_90d"),
-        "user_refund_count_90d": entity.get("user_refund_count_90d"),
-        "card_distinct_devices_30d": velocity.get("card_distinct_devices_30d"),
-        "card_distinct_users_30d": velocity.get("card_distinct_users_30d"),
-        "amount_usd": transaction.get("amount_usd"),
-        "amount_zscore": transaction.get("amount_zscore"),
-        "is_new_card_for_user": transaction.get("is_new_card_for_user"),
-        "is_new_device_for_user": transaction.get("is_new_device_for_user"),
-        "hour_of_day": transaction.get("hour_of_day"),
-        "is_weekend": transaction.get("is_weekend"),
-        "is_emulator": entity.get("device_is_emulator"),
-        "is_rooted": entity.get("device_is_rooted"),
-        "is_datacenter_ip": entity.get("ip_is_datacenter"),
-        "is_vpn": entity.get("ip_is_vpn"),
-        "is_tor": entity.get("ip_is_tor"),
-        "ip_risk_score": entity.get("ip_risk_score"),
-    }
 
-    return {key: _as_number(value) for key, value in values.items()}
+def fill_from_snapshot(out: Any, snapshot: dict[str, Any]) -> None:
+    """
+    Write snapshot features into `out` in FEATURE_COLUMNS order.
+
+    `out` is any mutable sequence of len(FEATURE_COLUMNS), typically a row of
+    a preallocated numpy matrix, so bulk loaders skip the intermediate dict.
+    """
+    out[:] = _snapshot_values(snapshot)
+
+
+def _snapshot_sql_number(snapshot_expr: str, section: str, key: str) -> str:
+    path = f"({snapshot_expr} #> '{{{section},{key}}}')"
+    return (
+        f"CASE jsonb_typeof({path}) "
+        f"WHEN 'number' THEN {path}::float8 "
+        f"WHEN 'boolean' THEN {path}::boolean::int::float8 "
+        "END"
+    )
+
+
+def snapshot_select_columns(snapshot_expr: str = "e.features_snapshot") -> list[str]:
+    """
+    SQL select expressions projecting FEATURE_COLUMNS out of a JSONB snapshot.
+
+    Mirrors extract_from_snapshot on the Postgres side (same paths, booleans
+    as 0/1, missing or non-numeric values as 0, derived decline rate), so
+    training loads receive dense float8 columns instead of the whole blob.
+    """
+    columns = []
+    for name, (section, key) in zip(FEATURE_COLUMNS, _SNAPSHOT_PATHS):
+        value = _snapshot_sql_number(snapshot_expr, section, key)
+        if name == "card_decline_rate_1h":
+            attempts = _snapshot_sql_number(snapshot_expr, "velocity", "card_attempts_1h")
+            declines = _snapshot_sql_number(snapshot_expr, "velocity", "card_declines_1h")
+            value = (
+                f"COALESCE({value}, CASE WHEN {attempts} > 0 "
+                f"THEN COALESCE({declines}, 0) / {attempts} END)"
+            )
+        columns.append(f"COALESCE({value}, 0) AS {name}")
+    return columns
@@ -10,21 +10,14 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, Optional
+from typing import Optional, Sequence
 
 import numpy as np
 from sqlalchemy import create_engine, text
 
 from ..config import settings
-from .features import FEATURE_COLUMNS, extract_from_snapshot, vector_from_feature_dict
-
-CRIMINAL_REASON_CODES = {
-    "10.1",
-    "10.2",
-    "10.3",
-    "10.4",
-    "10.5",
-}
+from ..constants import CRIMINAL_REASON_CODES_SORTED
+from .features import FEATURE_COLUMNS, fill_from_snapshot
 
 
 @dataclass
@@ -66,7 +59,7 @@ def _load_rows(start: datetime, end: datetime, postgres_url: Optional[str]) -> l
             MAX(
                 CASE
                     WHEN c.fraud_type = 'CRIMINAL' THEN 1
-                    WHEN c.reason_code IN :reason_codes THEN 1
+                    WHEN c.reason_code = ANY(:reason_codes) THEN 1
                     ELSE 0
                 END
             ) AS label
@@ -84,7 +77,7 @@ def _load_rows(start: datetime, end: datetime, postgres_url: Optional[str]) -> l
             {
                 "start": start,
                 "end": end,
-                "reason_codes": tuple(CRIMINAL_REASON_CODES),
+                "reason_codes": list(CRIMINAL_REASON_CODES_SORTED),
             },
         ).mappings().all()
     return [dict(row) for row in rows]
@@ -102,18 +95,21 @@ def _load_model(model_path: str, model_type: str):
     raise ValueError(f"Unsupported model_type: {model_type}")
 
 
-def _predict(model: object, model_type: str, X: np.ndarray) -> np.ndarray:
+def _predict(model: object, model_type: str, x: np.ndarray) -> np.ndarray:
     if model_type == "xgb_classifier":
-        probas = model.predict_proba(X)[:, 1]  # type: ignore[attr-defined]
+        probas = model.predict_proba(x)[:, 1]  # type: ignore[attr-defined]
         return np.asarray(probas)
     if model_type == "lgbm_classifier":
-        probas = model.predict(X)  # type: ignore[attr-defined]
+        probas = model.predict(x)  # type: ignore[attr-defined]
         return np.asarray(probas)
     raise ValueError(f"Unsupported model_type: {model_type}")
 
 
-def _build_dataset(rows: Iterable[dict]) -> tuple[np.ndarray, np.ndarray, list[str]]:
-    features_list: list[list[float]] = []
+def _build_dataset(rows: Sequence[dict]) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    # Snapshots are written straight into a preallocated matrix, skipping the
+    # per-row feature dict and list-of-lists
+    x = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=float)
+    filled = 0
     labels: list[int] = []
     decisions: list[str] = []
 
@@ -128,16 +124,15 @@ def _build_dataset(rows: Iterable[dict]) -> tuple[np.ndarray, np.ndarray, list[s
                 continue
         if not isinstance(snapshot, dict):
             continue
-        feature_dict = extract_from_snapshot(snapshot)
-        vector = vector_from_feature_dict(feature_dict)
-        features_list.append(vector)
+        fill_from_snapshot(x[filled], snapshot)
+        filled += 1
         labels.append(int(row.get("label") or 0))
         decisions.append(row.get("decision") or "ALLOW")
 
-    if not features_list:
+    if not filled:
         return np.array([]), np.array([]), []
 
-    return np.array(features_list, dtype=float), np.array(labels, dtype=int), decisions
+    return x[:filled], np.array(labels, dtype=int), decisions
 
 
 def _compute_metrics(decisions: list[str], labels: np.ndarray) -> ReplayMetrics:
@@ -174,12 +169,12 @@ def replay(
     postgres_url: Optional[str] = None,
 ) -> ReplayResults:
     rows = _load_rows(start, end, postgres_url)
-    X, y, decisions = _build_dataset(rows)
-    if X.size == 0:
+    x, y, decisions = _build_dataset(rows)
+    if x.size == 0:
         raise ValueError("No usable feature snapshots found for replay window")
 
     model = _load_model(model_path, model_type)
-    scores = _predict(model, model_type, X)
+    scores = _predict(model, model_type, x)
 
     replayed_decisions = ["BLOCK" if score >= threshold else "ALLOW" for score in scores]
 
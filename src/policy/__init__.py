@@ -4,10 +4,13 @@ from .rules import PolicyRules, PolicyRule, ScoreThreshold, RuleAction, Friction
 from .versioning import (
     PolicyVersioningService,
     PolicyVersion,
+    PolicyVersionSummary,
     PolicyValidationError,
     ThresholdUpdate,
     RuleUpdate,
     ListUpdate,
+    PolicyOperation,
+    PolicyListType,
 )
 
 __all__ = [
@@ -19,8 +22,11 @@ __all__ = [
     "FrictionType",
     "PolicyVersioningService",
     "PolicyVersion",
+    "PolicyVersionSummary",
     "PolicyValidationError",
     "ThresholdUpdate",
     "RuleUpdate",
     "ListUpdate",
+    "PolicyOperation",
+    "PolicyListType",
 ]
@@ -57,22 +57,41 @@ class PolicyEngine:
             policy: Policy rules (if None, uses default)
             policy_path: Path to YAML policy file (optional)
         """
-        self.policy = policy or DEFAULT_POLICY
         self.policy_path = policy_path
-        self.policy_hash = self._compute_hash()
+        policy = policy or DEFAULT_POLICY
+        # (policy, hash) published together so a reader never sees a new
+        # policy paired with the old hash. Replaced wholesale on reload,
+        # never mutated, so evaluate() needs no lock.
+        self._active: tuple[PolicyRules, str] = (policy, self._compute_hash(policy))
 
         if policy_path and policy_path.exists():
             self.reload_policy()
 
-    def _compute_hash(self) -> str:
-        """Compute hash of current policy for audit."""
-        policy_json = self.policy.model_dump_json()
+    @staticmethod
+    def _compute_hash(policy: PolicyRules) -> str:
+        """Compute hash of a policy for audit."""
+        policy_json = policy.model_dump_json()
         return hashlib.sha256(policy_json.encode()).hexdigest()[:16]
 
+    @property
+    def policy(self) -> PolicyRules:
+        """Currently active policy rules."""
+        return self._active[0]
+
+    @property
+    def policy_hash(self) -> str:
+        """Hash of the currently active policy."""
+        return self._active[1]
+
     def reload_policy(self) -> bool:
         """
         Reload policy from YAML file.
 
+        The new policy is parsed and hashed fully before being published
+        with a single reference swap; in-flight evaluations keep the policy
+        they started with. Blocking file I/O, so async callers should run
+        it via asyncio.to_thread.
+
         Returns:
             True if reload successful
         """
@@ -83,8 +102,8 @@ class PolicyEngine:
             with open(self.policy_path) as f:
                 config = yaml.safe_load(f)
 
-            self.policy = PolicyRules(**config)
-            self.policy_hash = self._compute_hash()
+            policy = PolicyRules(**config)
+            self._active = (policy, self._compute_hash(policy))
             return True
         except Exception as e:
             # Log error but keep existing policy
@@ -111,11 +130,13 @@ class PolicyEngine:
         reasons = []
         friction_type = None
         review_priority = None
+        # One snapshot for the whole evaluation, even if a reload lands mid-way
+        policy = self.policy
 
         # =======================================================================
         # Step 1: Check allowlists (immediate ALLOW)
         # =======================================================================
-        if event.card_token in self.policy.allowlist_cards:
+        if event.card_token in policy.allowlist_cards:
             reasons.append(DecisionReason(
                 code=ReasonCodes.ALLOWLIST_CARD,
                 description="Card is on allowlist",
@@ -123,7 +144,7 @@ class PolicyEngine:
             ))
             return Decision.ALLOW, reasons, None, None
 
-        if event.user_id and event.user_id in self.policy.allowlist_users:
+        if event.user_id and event.user_id in policy.allowlist_users:
             reasons.append(DecisionReason(
                 code=ReasonCodes.ALLOWLIST_USER,
                 description="User is on allowlist",
@@ -131,7 +152,7 @@ class PolicyEngine:
             ))
             return Decision.ALLOW, reasons, None, None
 
-        if event.service_id in self.policy.allowlist_services:
+        if event.service_id in policy.allowlist_services:
             reasons.append(DecisionReason(
                 code=ReasonCodes.ALLOWLIST_SERVICE,
                 description="Service is on allowlist",
@@ -142,7 +163,7 @@ class PolicyEngine:
         # =======================================================================
         # Step 2: Check blocklists (immediate BLOCK)
         # =======================================================================
-        if event.card_token in self.policy.blocklist_cards:
+        if event.card_token in policy.blocklist_cards:
             reasons.append(DecisionReason(
                 code=ReasonCodes.BLOCKLIST_CARD,
                 description="Card is on blocklist",
@@ -150,7 +171,7 @@ class PolicyEngine:
             ))
             return Decision.BLOCK, reasons, None, None
 
-        if event.device_id and event.device_id in self.policy.blocklist_devices:
+        if event.device_id and event.device_id in policy.blocklist_devices:
             reasons.append(DecisionReason(
                 code=ReasonCodes.BLOCKLIST_DEVICE,
                 description="Device is on blocklist",
@@ -158,7 +179,7 @@ class PolicyEngine:
             ))
             return Decision.BLOCK, reasons, None, None
 
-        if event.ip_address and event.ip_address in self.policy.blocklist_ips:
+        if event.ip_address and event.ip_address in policy.blocklist_ips:
             reasons.append(DecisionReason(
                 code=ReasonCodes.BLOCKLIST_IP,
                 description="IP is on blocklist",
@@ -166,7 +187,7 @@ class PolicyEngine:
             ))
             return Decision.BLOCK, reasons, None, None
 
-        if event.user_id and event.user_id in self.policy.blocklist_users:
+        if event.user_id and event.user_id in policy.blocklist_users:
             reasons.append(DecisionReason(
                 code=ReasonCodes.BLOCKLIST_USER,
                 description="User is on blocklist",
@@ -177,7 +198,7 @@ class PolicyEngine:
         # =======================================================================
         # Step 3: Evaluate explicit rules
         # =======================================================================
-        for rule in self.policy.get_sorted_rules():
+        for rule in policy.get_sorted_rules():
             matches, rule_reasons = self._evaluate_rule(rule, event, features, scores)
 
             if matches:
@@ -196,7 +217,7 @@ class PolicyEngine:
         # =======================================================================
         # Step 4: Apply score thresholds
         # =======================================================================
-        decision, threshold_reasons, friction_type, review_priority = self._apply_thresholds(scores)
+        decision, threshold_reasons, friction_type, review_priority = self._apply_thresholds(scores, policy.thresholds)
         reasons.extend(threshold_reasons)
 
         if decision != Decision.ALLOW:
@@ -205,7 +226,7 @@ class PolicyEngine:
         # =======================================================================
         # Step 5: Default decision
         # =======================================================================
-        return self._convert_action(self.policy.default_action), reasons, None, None
+        return self._convert_action(policy.default_action), reasons, None, None
 
     def _evaluate_rule(
         self,
@@ -302,6 +323,7 @@ class PolicyEngine:
     def _apply_thresholds(
         self,
         scores: RiskScores,
+        thresholds: Optional[dict] = None,
     ) -> tuple[Decision, list[DecisionReason], Optional[str], Optional[str]]:
         """
         Apply score thresholds.
@@ -321,7 +343,9 @@ class PolicyEngine:
             "friendly": scores.friendly_fraud_score,
         }
 
-        for score_type, threshold in self.policy.thresholds.items():
+        if thresholds is None:
+            thresholds = self.policy.thresholds
+        for score_type, threshold in thresholds.items():
             score_value = score_values.get(score_type, 0)
 
             # Check BLOCK threshold
@@ -13,36 +13,54 @@ Version format: MAJOR.MINOR.PATCH
 """
 
 import hashlib
-import json
 import re
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Any, AsyncIterator, List, Literal, Optional, Tuple, get_args
 
+import orjson
 import yaml  # type: ignore[import-untyped]
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
 
 from .rules import PolicyRules, ScoreThreshold, PolicyRule, RuleAction, FrictionType
 
 
+PolicyListType = Literal[
+    'blocklist_cards', 'blocklist_devices', 'blocklist_ips', 'blocklist_users',
+    'allowlist_cards', 'allowlist_users', 'allowlist_services',
+]
+_POLICY_LIST_FIELDS: Tuple[str, ...] = get_args(PolicyListType)
+_POLICY_LIST_FIELD_SET = frozenset(_POLICY_LIST_FIELDS)
+
+
 class PolicyValidationError(Exception):
     """Raised when policy validation fails."""
     pass
 
 
-class PolicyVersion(BaseModel):
-    """Represents a policy version record."""
+class PolicyVersionSummary(BaseModel):
+    """A policy version record without its policy content (for listings)."""
     id: int
     version: str
-    policy_content: dict
-    policy_hash: str
     change_type: str
     change_summary: str
     changed_by: str
     created_at: datetime
     is_active: bool
+
+    @cached_property
+    def created_at_iso(self) -> str:
+        """created_at as ISO 8601, formatted once per instance."""
+        return self.created_at.isoformat()
+
+
+class PolicyVersion(PolicyVersionSummary):
+    """Represents a policy version record."""
+    policy_content: dict
+    policy_hash: str
     previous_version: Optional[str] = None
 
 
@@ -76,22 +94,46 @@ class RuleUpdate(BaseModel):
 
 class ListUpdate(BaseModel):
     """Request to add or remove from a list."""
-    list_type: str  # blocklist_cards, blocklist_devices, etc.
+    list_type: str  # one of PolicyListType
     value: str
     action: str = "add"  # add or remove
 
     @field_validator('list_type')
     @classmethod
     def validate_list_type(cls, v):
-        valid_types = [
-            'blocklist_cards', 'blocklist_devices', 'blocklist_ips', 'blocklist_users',
-            'allowlist_cards', 'allowlist_users', 'allowlist_services'
-        ]
-        if v not in valid_types:
-            raise ValueError(f'list_type must be one of: {valid_types}')
+        if v not in _POLICY_LIST_FIELD_SET:
+            raise ValueError(f'list_type must be one of: {list(_POLICY_LIST_FIELDS)}')
         return v
 
 
+class PolicyOperation(BaseModel):
+    """
+    One step of a batched policy change (POST /policy/batch).
+
+    `op` selects the change; the matching payload field must be set:
+    thresholds for update_thresholds, rule for add_rule/update_rule,
+    rule_id for delete_rule, list_update for update_list.
+    """
+    op: Literal["update_thresholds", "add_rule", "update_rule", "delete_rule", "update_list"]
+    thresholds: Optional[List[ThresholdUpdate]] = None
+    rule: Optional[RuleUpdate] = None
+    rule_id: Optional[str] = None
+    list_update: Optional[ListUpdate] = None
+
+    @model_validator(mode='after')
+    def validate_payload(self):
+        required = {
+            "update_thresholds": "thresholds",
+            "add_rule": "rule",
+            "update_rule": "rule",
+            "delete_rule": "rule_id",
+            "update_list": "list_update",
+        }[self.op]
+        if getattr(self, required) is None:
+            raise ValueError(f"{self.op} requires '{required}'")
+        return self
+
+
 class PolicyVersioningService:
     """
     Service for managing policy versions.
@@ -103,29 +145,37 @@ class PolicyVersioningService:
     - YAML file synchronization
     """
 
-    def __init__(self, database_url: str, policy_path: Optional[Path] = None):
+    def __init__(
+        self,
+        database_url: str,
+        policy_path: Optional[Path] = None,
+        engine: Optional[AsyncEngine] = None,
+    ):
         """
         Initialize versioning service.
 
         Args:
             database_url: PostgreSQL connection URL
             policy_path: Path to policy.yaml file
+            engine: Shared engine to use instead of creating (and owning) one
         """
         self.database_url = database_url
         self.policy_path = policy_path
-        self.engine: Optional[AsyncEngine] = None
+        self.engine: Optional[AsyncEngine] = engine
+        self._owns_engine = engine is None
         self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
         self._current_version_id: Optional[int] = None
 
     async def initialize(self) -> None:
         """Initialize database connection and load/create initial version."""
-        self.engine = create_async_engine(
-            self.database_url,
-            echo=False,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-        )
+        if self.engine is None:
+            self.engine = create_async_engine(
+                self.database_url,
+                echo=False,
+                pool_size=5,
+                max_overflow=10,
+                pool_pre_ping=True,
+            )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             class_=AsyncSession,
@@ -146,7 +196,7 @@ class PolicyVersioningService:
 
     async def close(self) -> None:
         """Close database connections."""
-        if self.engine:
+        if self.engine and self._owns_engine:
             await self.engine.dispose()
 
     async def _create_initial_version(self) -> PolicyVersion:
@@ -167,10 +217,25 @@ class PolicyVersioningService:
             version="1.0.0",
         )
 
+    @staticmethod
+    def _sort_lists(content: dict) -> dict:
+        """Sort the block/allow lists of a dumped policy in place and return it."""
+        for key in _POLICY_LIST_FIELDS:
+            if key in content:
+                content[key] = sorted(content[key])
+        return content
+
     def _compute_hash(self, policy: PolicyRules) -> str:
-        """Compute SHA256 hash of policy content."""
-        policy_json = policy.model_dump_json(exclude_none=True)
-        return hashlib.sha256(policy_json.encode()).hexdigest()
+        """
+        Compute SHA256 hash of policy content.
+
+        The version string is excluded, so versions with identical rules,
+        thresholds and lists (e.g. a rollback and its target) share a hash.
+        """
+        # Canonical form: sorted keys and sorted list entries. The lists are
+        # sets on the model, whose iteration order differs between processes.
+        content = self._sort_lists(policy.model_dump(mode="json", exclude_none=True, exclude={"version"}))
+        return hashlib.sha256(orjson.dumps(content, option=orjson.OPT_SORT_KEYS)).hexdigest()
 
     def _increment_version(self, current: str, change_type: str) -> str:
         """
@@ -242,8 +307,10 @@ class PolicyVersioningService:
         # Compute hash
         policy_hash = self._compute_hash(policy)
 
-        # Convert policy to JSON-serializable dict
-        policy_dict = json.loads(policy.model_dump_json())
+        # Serialize once: the JSON text is stored as-is, the dict is returned.
+        # Lists are sorted so stored content does not depend on set order.
+        policy_dict = self._sort_lists(policy.model_dump(mode="json"))
+        policy_json = orjson.dumps(policy_dict).decode()
 
         assert self.session_factory is not None
         async with self.session_factory() as session:
@@ -266,7 +333,7 @@ class PolicyVersioningService:
                 """),
                 {
                     "version": version,
-                    "policy_content": json.dumps(policy_dict),
+                    "policy_content": policy_json,
                     "policy_hash": policy_hash,
                     "change_type": change_type,
                     "change_summary": change_summary,
@@ -303,18 +370,32 @@ class PolicyVersioningService:
             return
 
         # Convert to YAML-friendly format
-        policy_dict = json.loads(policy.model_dump_json())
+        policy_dict = orjson.loads(policy.model_dump_json())
 
         # Convert sets to lists for YAML
-        for key in ['blocklist_cards', 'blocklist_devices', 'blocklist_ips',
-                    'blocklist_users', 'allowlist_cards', 'allowlist_users',
-                    'allowlist_services']:
+        for key in _POLICY_LIST_FIELDS:
             if key in policy_dict and isinstance(policy_dict[key], list):
                 policy_dict[key] = list(policy_dict[key])
 
         with open(self.policy_path, 'w') as f:
             yaml.dump(policy_dict, f, default_flow_style=False, sort_keys=False)
 
+    @staticmethod
+    def _row_to_version(row: Any) -> PolicyVersion:
+        """Build a PolicyVersion from a policy_versions SELECT row."""
+        return PolicyVersion(
+            id=row[0],
+            version=row[1],
+            policy_content=row[2] if isinstance(row[2], dict) else orjson.loads(row[2]),
+            policy_hash=row[3],
+            change_type=row[4],
+            change_summary=row[5],
+            changed_by=row[6],
+            created_at=row[7],
+            is_active=row[8],
+            previous_version=row[9],
+        )
+
     async def get_active_version(self) -> Optional[PolicyVersion]:
         """Get the currently active policy version."""
         if not self.session_factory:
@@ -336,18 +417,7 @@ class PolicyVersioningService:
 
             self._current_version_id = row[0]
 
-            return PolicyVersion(
-                id=row[0],
-                version=row[1],
-                policy_content=row[2] if isinstance(row[2], dict) else json.loads(row[2]),
-                policy_hash=row[3],
-                change_type=row[4],
-                change_summary=row[5],
-                changed_by=row[6],
-                created_at=row[7],
-                is_active=row[8],
-                previous_version=row[9],
-            )
+            return self._row_to_version(row)
 
     async def get_version(self, version: str) -> Optional[PolicyVersion]:
         """Get a specific policy version by version string."""
@@ -366,18 +436,26 @@ class PolicyVersioningService:
             if not row:
                 return None
 
-            return PolicyVersion(
-                id=row[0],
-                version=row[1],
-                policy_content=row[2] if isinstance(row[2], dict) else json.loads(row[2]),
-                policy_hash=row[3],
-                change_type=row[4],
-                change_summary=row[5],
-                changed_by=row[6],
-                created_at=row[7],
-                is_active=row[8],
-                previous_version=row[9],
+            return self._row_to_version(row)
+
+    async def get_versions_bulk(self, versions: List[str]) -> dict[str, PolicyVersion]:
+        """
+        Get several policy versions in one query, keyed by version string.
+
+        Versions that do not exist are simply absent from the result.
+        """
+        assert self.session_factory is not None
+        async with self.session_factory() as session:
+            result = await session.execute(
+                text("""
+                    SELECT id, version, policy_content, policy_hash, change_type,
+                           change_summary, changed_by, created_at, is_active, previous_version
+                    FROM policy_versions
+                    WHERE version = ANY(:versions)
+                """),
+                {"versions": list(versions)},
             )
+            return {row[1]: self._row_to_version(row) for row in result.fetchall()}
 
     async def get_version_by_id(self, version_id: int) -> Optional[PolicyVersion]:
         """Get a specific policy version by ID."""
@@ -396,79 +474,82 @@ class PolicyVersioningService:
             if not row:
                 return None
 
-            return PolicyVersion(
-                id=row[0],
-                version=row[1],
-                policy_content=row[2] if isinstance(row[2], dict) else json.loads(row[2]),
-                policy_hash=row[3],
-                change_type=row[4],
-                change_summary=row[5],
-                changed_by=row[6],
-                created_at=row[7],
-                is_active=row[8],
-                previous_version=row[9],
-            )
+            return self._row_to_version(row)
+
+    async def iter_versions(
+        self,
+        limit: int = 50,
+        before: Optional[Tuple[datetime, int]] = None,
+    ) -> AsyncIterator[PolicyVersionSummary]:
+        """
+        Stream version summaries, most recent first.
+
+        Keyset-paginated: pass the (created_at, id) of the last version from
+        the previous page as `before` to continue after it.
 
-    async def list_versions(self, limit: int = 50) -> List[PolicyVersion]:
-        """List policy versions, most recent first."""
+        Skips policy_content (the bulk of each row) and reads through a
+        server-side cursor, so rows are decoded as they arrive instead of
+        buffering the whole page.
+        """
         assert self.session_factory is not None
+        keyset = "WHERE (created_at, id) < (:before_created_at, :before_id)" if before else ""
+        params: dict[str, Any] = {"limit": limit}
+        if before is not None:
+            params["before_created_at"], params["before_id"] = before
         async with self.session_factory() as session:
-            result = await session.execute(
-                text("""
-                    SELECT id, version, policy_content, policy_hash, change_type,
-                           change_summary, changed_by, created_at, is_active, previous_version
+            result = await session.stream(
+                text(f"""
+                    SELECT id, version, change_type, change_summary, changed_by,
+                           created_at, is_active
                     FROM policy_versions
-                    ORDER BY created_at DESC
+                    {keyset}
+                    ORDER BY created_at DESC, id DESC
                     LIMIT :limit
                 """),
-                {"limit": limit},
+                params,
             )
-            rows = result.fetchall()
-
-            return [
-                PolicyVersion(
+            async for row in result:
+                yield PolicyVersionSummary(
                     id=row[0],
                     version=row[1],
-                    policy_content=row[2] if isinstance(row[2], dict) else json.loads(row[2]),
-                    policy_hash=row[3],
-                    change_type=row[4],
-                    change_summary=row[5],
-                    changed_by=row[6],
-                    created_at=row[7],
-                    is_active=row[8],
-                    previous_version=row[9],
+                    change_type=row[2],
+                    change_summary=row[3],
+                    changed_by=row[4],
+                    created_at=row[5],
+                    is_active=row[6],
                 )
-                for row in rows
-            ]
 
     @property
     def current_version_id(self) -> Optional[int]:
         """Get the current active version ID for evidence linking."""
         return self._current_version_id
 
-    async def update_thresholds(
-        self,
-        updates: List[ThresholdUpdate],
-        changed_by: str = "system",
-    ) -> PolicyVersion:
-        """
-        Update score thresholds.
-
-        Args:
-            updates: List of threshold updates
-            changed_by: User making the change
-
-        Returns:
-            New policy version
-        """
-        # Get current policy
+    async def _load_active_policy(self) -> PolicyRules:
+        """Load the active policy for modification."""
         current = await self.get_active_version()
         if not current:
             raise PolicyValidationError("No active policy found")
+        return PolicyRules(**current.policy_content)
+
+    @staticmethod
+    def _build_rule(rule: RuleUpdate) -> PolicyRule:
+        return PolicyRule(
+            id=rule.id,
+            name=rule.name,
+            description=rule.description,
+            enabled=rule.enabled,
+            priority=rule.priority,
+            conditions=rule.conditions,
+            action=RuleAction(rule.action),
+            friction_type=FrictionType(rule.friction_type) if rule.friction_type else None,
+            review_priority=rule.review_priority,
+        )
 
-        policy = PolicyRules(**current.policy_content)
+    # The _apply_* helpers change a PolicyRules in place and return
+    # (change_type, change_summary); callers save the result as a version.
 
-        # Apply updates
+    @staticmethod
+    def _apply_thresholds(policy: PolicyRules, updates: List[ThresholdUpdate]) -> Tuple[str, str]:
         changes = []
         for update in updates:
             if update.score_type not in policy.thresholds:
@@ -491,11 +572,90 @@ class PolicyVersioningService:
 
             changes.append(f"{update.score_type}: {old_values}")
 
-        change_summary = f"Updated thresholds: {'; '.join(changes)}"
+        return "threshold", f"Updated thresholds: {'; '.join(changes)}"
+
+    @classmethod
+    def _apply_add_rule(cls, policy: PolicyRules, rule: RuleUpdate) -> Tuple[str, str]:
+        # Check if rule ID already exists
+        for existing in policy.rules:
+            if existing.id == rule.id:
+                raise PolicyValidationError(f"Rule with id '{rule.id}' already exists")
+
+        policy.rules.append(cls._build_rule(rule))
+        return "rule_add", f"Added rule: {rule.name} ({rule.id})"
+
+    @classmethod
+    def _apply_update_rule(cls, policy: PolicyRules, rule: RuleUpdate) -> Tuple[str, str]:
+        for i, existing in enumerate(policy.rules):
+            if existing.id == rule.id:
+                policy.rules[i] = cls._build_rule(rule)
+                return "rule_update", f"Updated rule: {rule.name} ({rule.id})"
+
+        raise PolicyValidationError(f"Rule with id '{rule.id}' not found")
+
+    @staticmethod
+    def _apply_delete_rule(policy: PolicyRules, rule_id: str) -> Tuple[str, str]:
+        original_count = len(policy.rules)
+        policy.rules = [r for r in policy.rules if r.id != rule_id]
+
+        if len(policy.rules) == original_count:
+            raise PolicyValidationError(f"Rule with id '{rule_id}' not found")
+
+        return "rule_delete", f"Deleted rule: {rule_id}"
 
+    @staticmethod
+    def _apply_list_update(policy: PolicyRules, update: ListUpdate) -> Tuple[str, str]:
+        # Get the appropriate list
+        list_attr = getattr(policy, update.list_type)
+
+        if update.action == "add":
+            if update.value in list_attr:
+                raise PolicyValidationError(f"'{update.value}' already in {update.list_type}")
+            list_attr.add(update.value)
+            return "list_add", f"Added '{update.value}' to {update.list_type}"
+
+        # remove
+        if update.value not in list_attr:
+            raise PolicyValidationError(f"'{update.value}' not in {update.list_type}")
+        list_attr.remove(update.value)
+        return "list_remove", f"Removed '{update.value}' from {update.list_type}"
+
+    def _apply_operation(self, policy: PolicyRules, operation: PolicyOperation) -> Tuple[str, str]:
+        if operation.op == "update_thresholds":
+            assert operation.thresholds is not None
+            return self._apply_thresholds(policy, operation.thresholds)
+        if operation.op == "add_rule":
+            assert operation.rule is not None
+            return self._apply_add_rule(policy, operation.rule)
+        if operation.op == "update_rule":
+            assert operation.rule is not None
+            return self._apply_update_rule(policy, operation.rule)
+        if operation.op == "delete_rule":
+            assert operation.rule_id is not None
+            return self._apply_delete_rule(policy, operation.rule_id)
+        assert operation.list_update is not None
+        return self._apply_list_update(policy, operation.list_update)
+
+    async def update_thresholds(
+        self,
+        updates: List[ThresholdUpdate],
+        changed_by: str = "system",
+    ) -> PolicyVersion:
+        """
+        Update score thresholds.
+
+        Args:
+            updates: List of threshold updates
+            changed_by: User making the change
+
+        Returns:
+            New policy version
+        """
+        policy = await self._load_active_policy()
+        change_type, change_summary = self._apply_thresholds(policy, updates)
         return await self._save_version(
             policy=policy,
-            change_type="threshold",
+            change_type=change_type,
             change_summary=change_summary,
             changed_by=changed_by,
         )
@@ -506,36 +666,12 @@ class PolicyVersioningService:
         changed_by: str = "system",
     ) -> PolicyVersion:
         """Add a new rule to the policy."""
-        current = await self.get_active_version()
-        if not current:
-            raise PolicyValidationError("No active policy found")
-
-        policy = PolicyRules(**current.policy_content)
-
-        # Check if rule ID already exists
-        for existing in policy.rules:
-            if existing.id == rule.id:
-                raise PolicyValidationError(f"Rule with id '{rule.id}' already exists")
-
-        # Create new rule
-        new_rule = PolicyRule(
-            id=rule.id,
-            name=rule.name,
-            description=rule.description,
-            enabled=rule.enabled,
-            priority=rule.priority,
-            conditions=rule.conditions,
-            action=RuleAction(rule.action),
-            friction_type=FrictionType(rule.friction_type) if rule.friction_type else None,
-            review_priority=rule.review_priority,
-        )
-
-        policy.rules.append(new_rule)
-
+        policy = await self._load_active_policy()
+        change_type, change_summary = self._apply_add_rule(policy, rule)
         return await self._save_version(
             policy=policy,
-            change_type="rule_add",
-            change_summary=f"Added rule: {rule.name} ({rule.id})",
+            change_type=change_type,
+            change_summary=change_summary,
             changed_by=changed_by,
         )
 
@@ -545,37 +681,12 @@ class PolicyVersioningService:
         changed_by: str = "system",
     ) -> PolicyVersion:
         """Update an existing rule."""
-        current = await self.get_active_version()
-        if not current:
-            raise PolicyValidationError("No active policy found")
-
-        policy = PolicyRules(**current.policy_content)
-
-        # Find and update rule
-        found = False
-        for i, existing in enumerate(policy.rules):
-            if existing.id == rule.id:
-                policy.rules[i] = PolicyRule(
-                    id=rule.id,
-                    name=rule.name,
-                    description=rule.description,
-                    enabled=rule.enabled,
-                    priority=rule.priority,
-                    conditions=rule.conditions,
-                    action=RuleAction(rule.action),
-                    friction_type=FrictionType(rule.friction_type) if rule.friction_type else None,
-                    review_priority=rule.review_priority,
-                )
-                found = True
-                break
-
-        if not found:
-            raise PolicyValidationError(f"Rule with id '{rule.id}' not found")
-
+        policy = await self._load_active_policy()
+        change_type, change_summary = self._apply_update_rule(policy, rule)
         return await self._save_version(
             policy=policy,
-            change_type="rule_update",
-            change_summary=f"Updated rule: {rule.name} ({rule.id})",
+            change_type=change_type,
+            change_summary=change_summary,
             changed_by=changed_by,
         )
 
@@ -585,23 +696,12 @@ class PolicyVersioningService:
         changed_by: str = "system",
     ) -> PolicyVersion:
         """Delete a rule from the policy."""
-        current = await self.get_active_version()
-        if not current:
-            raise PolicyValidationError("No active policy found")
-
-        policy = PolicyRules(**current.policy_content)
-
-        # Find and remove rule
-        original_count = len(policy.rules)
-        policy.rules = [r for r in policy.rules if r.id != rule_id]
-
-        if len(policy.rules) == original_count:
-            raise PolicyValidationError(f"Rule with id '{rule_id}' not found")
-
+        policy = await self._load_active_policy()
+        change_type, change_summary = self._apply_delete_rule(policy, rule_id)
         return await self._save_version(
             policy=policy,
-            change_type="rule_delete",
-            change_summary=f"Deleted rule: {rule_id}",
+            change_type=change_type,
+            change_summary=change_summary,
             changed_by=changed_by,
         )
 
@@ -611,32 +711,47 @@ class PolicyVersioningService:
         changed_by: str = "system",
     ) -> PolicyVersion:
         """Add or remove from a blocklist/allowlist."""
-        current = await self.get_active_version()
-        if not current:
-            raise PolicyValidationError("No active policy found")
-
-        policy = PolicyRules(**current.policy_content)
-
-        # Get the appropriate list
-        list_attr = getattr(policy, update.list_type)
+        policy = await self._load_active_policy()
+        change_type, change_summary = self._apply_list_update(policy, update)
+        return await self._save_version(
+            policy=policy,
+            change_type=change_type,
+            change_summary=change_summary,
+            changed_by=changed_by,
+        )
 
-        if update.action == "add":
-            if update.value in list_attr:
-                raise PolicyValidationError(f"'{update.value}' already in {update.list_type}")
-            list_attr.add(update.value)
-            change_type = "list_add"
-            change_summary = f"Added '{update.value}' to {update.list_type}"
-        else:  # remove
-            if update.value not in list_attr:
-                raise PolicyValidationError(f"'{update.value}' not in {update.list_type}")
-            list_attr.remove(update.value)
-            change_type = "list_remove"
-            change_summary = f"Removed '{update.value}' from {update.list_type}"
+    async def apply_batch(
+        self,
+        operations: List[PolicyOperation],
+        changed_by: str = "system",
+    ) -> PolicyVersion:
+        """
+        Apply several changes as a single new version.
 
+        Operations run in order against one copy of the active policy; if
+        any fails validation nothing is saved. The version is bumped as for
+        the most significant change (any rule change makes it MINOR) and the
+        summary lists every step.
+        """
+        if not operations:
+            raise PolicyValidationError("No operations given")
+
+        policy = await self._load_active_policy()
+        change_types = []
+        summaries = []
+        for operation in operations:
+            change_type, summary = self._apply_operation(policy, operation)
+            change_types.append(change_type)
+            summaries.append(summary)
+
+        change_type = next(
+            (ct for ct in change_types if ct in ('rule_add', 'rule_update', 'rule_delete')),
+            change_types[0],
+        )
         return await self._save_version(
             policy=policy,
             change_type=change_type,
-            change_summary=change_summary,
+            change_summary=f"Batch of {len(summaries)}: {'; '.join(summaries)}",
             changed_by=changed_by,
         )
 
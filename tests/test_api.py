@@ -129,6 +129,53 @@ class TestDecisionEndpoint:
         assert response.status_code == 422  # Validation error
 
 
+class TestBulkDecisionEndpoint:
+    """Tests for bulk decision endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_returns_decisions_in_order(self, api_client: AsyncClient):
+        """Test bulk decisions come back one per event, in request order."""
+        payloads = [
+            {
+                "transaction_id": f"txn_bulk_{i}",
+                "idempotency_key": f"idem_bulk_{i}",
+                "amount_cents": 2000,
+                "card_token": f"card_bulk_{i}",
+                "service_id": "mobile_prepaid_001",
+                "event_subtype": "topup",
+            }
+            for i in range(3)
+        ]
+
+        response = await api_client.post("/decide/bulk", json=payloads)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [d["transaction_id"] for d in data] == ["txn_bulk_0", "txn_bulk_1", "txn_bulk_2"]
+        assert all(d["decision"] in ("ALLOW", "FRICTION", "REVIEW", "BLOCK") for d in data)
+
+    @pytest.mark.asyncio
+    async def test_bulk_rejects_oversized_batch(self, api_client: AsyncClient, monkeypatch):
+        """Test batches above the configured limit are rejected."""
+        from src.config import settings
+
+        monkeypatch.setattr(settings, "api_max_bulk_decisions", 1)
+        payloads = [
+            {
+                "transaction_id": f"txn_bulk_big_{i}",
+                "idempotency_key": f"idem_bulk_big_{i}",
+                "amount_cents": 2000,
+                "card_token": "card_bulk_big",
+                "service_id": "mobile_prepaid_001",
+            }
+            for i in range(2)
+        ]
+
+        response = await api_client.post("/decide/bulk", json=payloads)
+
+        assert response.status_code == 413
+
+
 class TestPolicyEndpoint:
     """Tests for policy endpoints."""
 
@@ -0,0 +1,367 @@
+"""
+Unit tests for API helpers that run without Redis or Postgres.
+
+Services are replaced with in-memory fakes; the end-to-end behaviour is
+covered by test_api.py against live services.
+"""
+
+import asyncio
+from collections import OrderedDict
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+
+import src.api.main as api
+from src.policy import PolicyRules, PolicyVersion, PolicyVersioningService
+
+
+class TestBackgroundQueue:
+    """Tests for the bounded post-decision background queue."""
+
+    @pytest.fixture
+    def full_queue(self, monkeypatch):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        queue.put_nowait(("post_decision_writes", None))
+        monkeypatch.setattr(api, "_background_queue", queue)
+        return queue
+
+    async def test_best_effort_work_is_shed_when_full(self, full_queue):
+        ran = []
+
+        async def update_profiles():
+            ran.append("profiles")
+
+        api._fire_and_forget(update_profiles(), "post_decision_writes")
+
+        assert ran == []
+        assert full_queue.qsize() == 1
+
+    async def test_evidence_runs_inline_when_full(self, full_queue):
+        ran = []
+
+        async def capture_evidence():
+            ran.append("evidence")
+
+        await api._enqueue_required(capture_evidence(), "capture_evidence")
+
+        assert ran == ["evidence"]
+        assert full_queue.qsize() == 1
+
+    async def test_evidence_is_queued_when_there_is_room(self, monkeypatch):
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        monkeypatch.setattr(api, "_background_queue", queue)
+
+        async def capture_evidence():
+            pass
+
+        coro = capture_evidence()
+        await api._enqueue_required(coro, "capture_evidence")
+
+        assert queue.get_nowait() == ("capture_evidence", coro)
+        coro.close()
+
+
+class TestPostDecisionWrites:
+    """Tests for the pipelined idempotency and profile writes."""
+
+    class FailingPipeline:
+        """Records commands; the profile HSET fails on execute."""
+
+        def __init__(self):
+            self.command_stack: list = []
+
+        def setex(self, key, ttl, value):
+            self.command_stack.append((("SETEX", key, ttl, value), {}))
+
+        def hset(self, key, mapping):
+            self.command_stack.append((("HSET", key, mapping), {}))
+
+        async def execute(self, raise_on_error=True):
+            assert raise_on_error is False
+            self.command_stack = []
+            return [True, ConnectionError("connection reset")]
+
+    class ProfileStore:
+        async def queue_profile_updates(self, pipe, event, is_decline):
+            pipe.hset(f"profile:card:{event.card_token}", {"attempts": 1})
+
+    async def test_failed_commands_are_logged_with_their_key(self, monkeypatch, caplog, sample_event):
+        pipe = self.FailingPipeline()
+        monkeypatch.setattr(api, "redis_client", type("Redis", (), {"pipeline": lambda self, transaction: pipe})())
+
+        await api._post_decision_writes(self.ProfileStore(), sample_event, False, "{}")
+
+        failures = [r.getMessage() for r in caplog.records if "Post-decision" in r.getMessage()]
+        assert failures == [f"Post-decision HSET profile:card:{sample_event.card_token} failed: connection reset"]
+
+
+def _version(version: str, policy_hash: str, content: dict, is_active: bool = False) -> PolicyVersion:
+    return PolicyVersion(
+        id=int(version.replace(".", "")),
+        version=version,
+        policy_content=content,
+        policy_hash=policy_hash,
+        change_type="list_add",
+        change_summary="",
+        changed_by="test",
+        created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        is_active=is_active,
+    )
+
+
+class TestPolicyDiff:
+    """Tests for the memoized policy diff."""
+
+    @pytest.fixture(autouse=True)
+    def empty_caches(self, monkeypatch):
+        monkeypatch.setattr(api, "_diff_cache", OrderedDict())
+        monkeypatch.setattr(api, "_diff_index_cache", OrderedDict())
+
+    def test_rollback_versions_share_a_cache_entry(self):
+        """Diffs are keyed by content hash, so a rollback reuses its target's diff."""
+        hasher = PolicyVersioningService(database_url="postgresql+asyncpg://localhost/test")
+
+        def saved(rules: PolicyRules) -> PolicyVersion:
+            return _version(rules.version, hasher._compute_hash(rules), rules.model_dump(mode="json"))
+
+        base = saved(PolicyRules(version="1.0.0"))
+        target = saved(PolicyRules(version="1.0.1", blocklist_cards={"card_1"}))
+        rollback = saved(PolicyRules(version="1.0.3", blocklist_cards={"card_1"}))
+        assert rollback.policy_hash == target.policy_hash
+
+        first = api._policy_diff(base, target)
+
+        assert api._policy_diff(base, rollback) is first
+        assert first == [{"type": "list", "key": "blocklist_cards", "added": ["card_1"], "removed": []}]
+
+    def test_setting_changes_are_reported(self):
+        """Top-level settings (default_action, description) diff by value; version does not."""
+        v1 = _version("1.0.0", "h1", PolicyRules(version="1.0.0").model_dump(mode="json"))
+        v2 = _version("1.0.1", "h2", PolicyRules(
+            version="1.0.1", default_action="REVIEW", description="Tightened",
+        ).model_dump(mode="json"))
+
+        changes = api._policy_diff(v1, v2)
+
+        assert sorted(changes, key=lambda c: c["key"]) == [
+            {"type": "setting", "key": "default_action", "v1": "ALLOW", "v2": "REVIEW"},
+            {"type": "setting", "key": "description", "v1": None, "v2": "Tightened"},
+        ]
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis calls made by the policy response cache."""
+
+    def __init__(self):
+        self.strings: dict[str, str] = {}
+        self.hashes: dict[str, dict] = {}
+        self.expirations: dict[str, int] = {}
+        self.expire_calls = 0
+
+    async def hmget(self, key, fields):
+        entry = self.hashes.get(key, {})
+        return [entry.get(field) for field in fields]
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def incr(self, key):
+        value = int(self.strings.get(key, "0")) + 1
+        self.strings[key] = str(value)
+        return value
+
+    async def delete(self, key):
+        self.hashes.pop(key, None)
+        self.expirations.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        # Mirrors _POLICY_CACHE_WRITE_LUA
+        assert script == api._POLICY_CACHE_WRITE_LUA
+
+        async def write(keys, args):
+            generation_key, key = keys
+            generation, field, body, etag, ttl = args
+            if self.strings.get(generation_key, "0") != generation:
+                return 0
+            self.hashes.setdefault(key, {}).update({field: body, f"{field}:etag": etag})
+            if key not in self.expirations:
+                self.expirations[key] = ttl
+                self.expire_calls += 1
+            return 1
+
+        return write
+
+
+class FakePipeline:
+    def __init__(self, redis: FakeRedis):
+        self._redis = redis
+        self._calls: list = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((getattr(self._redis, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self._calls]
+
+
+class FakeVersioning:
+    """Serves fixed versions and counts database reads."""
+
+    def __init__(self, versions: list[PolicyVersion]):
+        self.versions = versions  # most recent first
+        self.reads = 0
+        self.before_read = None
+
+    async def get_active_version(self):
+        self.reads += 1
+        if self.before_read is not None:
+            await self.before_read()
+        return next((v for v in self.versions if v.is_active), None)
+
+    async def iter_versions(self, limit=50, before=None):
+        self.reads += 1
+        rows = self.versions
+        if before is not None:
+            rows = [v for v in rows if (v.created_at, v.id) < before]
+        for v in rows[:limit]:
+            yield v
+
+
+def _dated_versions(count: int) -> list[PolicyVersion]:
+    """`count` versions, most recent (and active) first, one minute apart."""
+    versions = []
+    for i in reversed(range(count)):
+        v = _version(f"1.0.{i}", f"h{i}", {"version": f"1.0.{i}"}, is_active=(i == count - 1))
+        versions.append(v.model_copy(update={"id": i + 1, "created_at": datetime(2026, 1, 1, 0, i, tzinfo=UTC)}))
+    return versions
+
+
+class TestPolicyResponseCache:
+    """Tests for the Redis-backed policy GET cache, ETags and version paging."""
+
+    @pytest.fixture
+    def fake_redis(self, monkeypatch):
+        fake = FakeRedis()
+        monkeypatch.setattr(api, "redis_client", fake)
+        monkeypatch.setattr(api, "_policy_cache_write", fake.register_script(api._POLICY_CACHE_WRITE_LUA))
+        return fake
+
+    @pytest.fixture
+    def versioning(self, monkeypatch):
+        fake = FakeVersioning(_dated_versions(5))
+        monkeypatch.setattr(api, "policy_versioning", fake)
+        monkeypatch.setattr(api, "_active_version_fetch", None)
+        monkeypatch.setattr(api, "_inactive_version_cache", OrderedDict())
+        return fake
+
+    @pytest.fixture
+    async def client(self, fake_redis, versioning):
+        api.app.dependency_overrides[api.require_api_token] = lambda: None
+        transport = httpx.ASGITransport(app=api.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            yield client
+        api.app.dependency_overrides.pop(api.require_api_token, None)
+
+    async def test_cache_hit_skips_the_database(self, client, versioning):
+        first = await client.get("/policy")
+        second = await client.get("/policy")
+
+        assert first.status_code == second.status_code == 200
+        assert second.json() == first.json()
+        assert second.headers["etag"] == first.headers["etag"] == '"1.0.4-h4"'
+        assert versioning.reads == 1
+
+    async def test_matching_etag_gets_304(self, client):
+        etag = (await client.get("/policy")).headers["etag"]
+        await api._invalidate_policy_responses()
+
+        for _ in range(2):  # served from the database, then from the cache
+            response = await client.get("/policy", headers={"If-None-Match": f"W/{etag}"})
+            assert response.status_code == 304
+            assert response.content == b""
+            assert response.headers["etag"] == etag
+
+        assert (await client.get("/policy", headers={"If-None-Match": '"stale"'})).status_code == 200
+
+    async def test_mutation_invalidates_cached_responses(self, client, versioning):
+        await client.get("/policy")
+        await api._invalidate_policy_responses()
+        await client.get("/policy")
+
+        assert versioning.reads == 2
+
+    async def test_read_racing_a_mutation_is_not_cached(self, client, fake_redis, versioning):
+        """A GET that read before a mutation must not repopulate the cache after it."""
+        versioning.before_read = api._invalidate_policy_responses
+
+        response = await client.get("/policy")
+
+        assert response.status_code == 200
+        assert fake_redis.hashes == {}
+
+    async def test_ttl_is_not_extended_by_later_writes(self, client, fake_redis):
+        await client.get("/policy")
+        await client.get("/policy/versions")
+
+        assert len(fake_redis.hashes[api._policy_response_cache_key()]) == 4
+        assert fake_redis.expire_calls == 1
+
+    async def test_versions_page_through_with_cursor(self, client):
+        first = (await client.get("/policy/versions", params={"limit": 2})).json()
+        second = (await client.get("/policy/versions", params={"limit": 2, "cursor": first["next_cursor"]})).json()
+        last = (await client.get("/policy/versions", params={"limit": 2, "cursor": second["next_cursor"]})).json()
+
+        pages = [[v["version"] for v in page["versions"]] for page in (first, second, last)]
+        assert pages == [["1.0.4", "1.0.3"], ["1.0.2", "1.0.1"], ["1.0.0"]]
+        assert last["next_cursor"] is None
+
+    async def test_invalid_cursor_is_rejected(self, client):
+        response = await client.get("/policy/versions", params={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+    def test_cursor_round_trips(self):
+        created_at = datetime(2026, 1, 1, 12, 30, tzinfo=UTC)
+
+        cursor = api._encode_version_cursor(created_at, 42)
+
+        assert api._decode_version_cursor(cursor) == (created_at, 42)
+
+
+class TestPolicyReload:
+    """Tests for coalesced engine reloads after policy mutations."""
+
+    class CountingEngine:
+        def __init__(self):
+            self.reloads = 0
+
+        def reload_policy(self):
+            self.reloads += 1
+
+    @pytest.fixture(autouse=True)
+    def idle_reloader(self, monkeypatch):
+        monkeypatch.setattr(api, "_reload_task", None)
+        monkeypatch.setattr(api, "_reload_pending", False)
+
+    async def test_concurrent_mutations_share_one_reload(self):
+        engine = self.CountingEngine()
+
+        await asyncio.gather(*(api._request_policy_reload(engine) for _ in range(100)))
+
+        assert engine.reloads == 1
+
+    async def test_later_mutation_reloads_again(self):
+        engine = self.CountingEngine()
+
+        await api._request_policy_reload(engine)
+        await api._request_policy_reload(engine)
+
+        assert engine.reloads == 2
@@ -33,6 +33,20 @@ class TestEvidenceServiceInit:
         assert service.engine is None
         assert service.session_factory is None
 
+    @pytest.mark.asyncio
+    async def test_shared_engine_not_disposed_on_close(self):
+        """A shared engine belongs to the app and must outlive the service."""
+        engine = MagicMock()
+        engine.dispose = AsyncMock()
+        service = EvidenceService(database_url="postgresql+asyncpg://localhost/test", engine=engine)
+
+        await service.initialize()
+        await service.close()
+
+        assert service.engine is engine
+        assert service.session_factory is not None
+        engine.dispose.assert_not_awaited()
+
 
 class TestEvidenceCapture:
     """Tests for evidence capture logic."""
@@ -278,7 +292,7 @@ class TestChargebackRecording:
         service = EvidenceService(database_url="postgresql+asyncpg://localhost/test")
 
         mock_session = AsyncMock()
-        mock_session.execute = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=MagicMock())
         mock_session.commit = AsyncMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
@@ -299,6 +313,34 @@ class TestChargebackRecording:
         mock_session.execute.assert_called_once()
         mock_session.commit.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_record_chargeback_with_evidence_returns_entities(self):
+        """The insert's CTE row carries the original transaction's evidence."""
+        service = EvidenceService(database_url="postgresql+asyncpg://localhost/test")
+
+        result_proxy = MagicMock()
+        result_proxy.mappings.return_value.first.return_value = {
+            "evidence": '{"card_token": "card_abc", "user_id": "user_1", "model_variant": "champion"}',
+        }
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=result_proxy)
+        mock_session.commit = AsyncMock()
+        mock_session.__aenter__ = AsyncMock(return_value=mock_session)
+        mock_session.__aexit__ = AsyncMock(return_value=None)
+
+        service.session_factory = MagicMock(return_value=mock_session)
+
+        record_id, evidence = await service.record_chargeback_with_evidence(
+            transaction_id="txn_123",
+            chargeback_id="cb_456",
+            amount_cents=5000,
+            reason_code="10.4",
+        )
+
+        assert record_id is not None
+        assert evidence == {"card_token": "card_abc", "user_id": "user_1", "model_variant": "champion"}
+        mock_session.execute.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_record_chargeback_handles_db_error(self):
         """record_chargeback should return None on database error."""
@@ -343,7 +385,7 @@ class TestRefundRecording:
         service = EvidenceService(database_url="postgresql+asyncpg://localhost/test")
 
         mock_session = AsyncMock()
-        mock_session.execute = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=MagicMock())
         mock_session.commit = AsyncMock()
         mock_session.__aenter__ = AsyncMock(return_value=mock_session)
         mock_session.__aexit__ = AsyncMock(return_value=None)
@@ -9,6 +9,8 @@ from src.ml.features import (
     FEATURE_COLUMNS,
     extract_feature_dict,
     extract_from_snapshot,
+    fill_from_snapshot,
+    snapshot_select_columns,
     vector_from_feature_dict,
 )
 from src.ml.registry import ModelEntry, ModelRegistry
@@ -130,6 +132,38 @@ def test_snapshot_extraction_consistency():
     assert vector_features == vector_snapshot
 
 
+def test_fill_from_snapshot_matches_dict_extraction():
+    snapshot = {
+        "velocity": {"card_attempts_1h": 4, "card_declines_1h": 1},
+        "entity": {"ip_is_vpn": True, "card_age_hours": "not-a-number"},
+        "transaction": {"amount_usd": 12.5, "hour_of_day": 7},
+    }
+    row = [None] * len(FEATURE_COLUMNS)
+
+    fill_from_snapshot(row, snapshot)
+
+    assert row == vector_from_feature_dict(extract_from_snapshot(snapshot))
+    assert row[FEATURE_COLUMNS.index("card_decline_rate_1h")] == 0.25
+
+
+def test_snapshot_select_columns_follow_feature_order():
+    columns = snapshot_select_columns("s")
+
+    assert [c.rsplit(" AS ", 1)[1] for c in columns] == FEATURE_COLUMNS
+    chargebacks = columns[FEATURE_COLUMNS.index("user_chargeback_count_lifetime")]
+    assert "s #> '{entity,user_chargeback_count}'" in chargebacks
+
+
+def test_training_query_skips_rows_without_snapshot_object():
+    pytest.importorskip("asyncpg")
+    from scripts.train_model import training_query
+
+    where = training_query().split("WHERE e.captured_at", 1)[1]
+
+    assert "e.features_snapshot IS NOT NULL" in where
+    assert "jsonb_typeof(e.features_snapshot) = 'object'" in where
+
+
 def test_registry_round_trip(tmp_path):
     path = tmp_path / "registry.json"
     registry = ModelRegistry(str(path))
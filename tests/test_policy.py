@@ -4,6 +4,8 @@ Policy Engine Tests
 Tests for policy evaluation logic.
 """
 
+from unittest.mock import AsyncMock
+
 import pytest
 
 from src.schemas import (
@@ -16,6 +18,13 @@ from src.schemas import (
 )
 from src.policy import PolicyEngine
 from src.policy.rules import PolicyRules, PolicyRule, RuleAction, ScoreThreshold
+from src.policy.versioning import (
+    ListUpdate,
+    PolicyOperation,
+    PolicyValidationError,
+    PolicyVersioningService,
+    RuleUpdate,
+)
 
 
 class TestPolicyEngine:
@@ -130,6 +139,21 @@ class TestPolicyEngine:
         assert engine.version == "1.0.0-test"
         assert engine.hash is not None
 
+    def test_reload_swaps_policy_and_hash_together(self, engine, policy, tmp_path):
+        """Reload publishes the new policy and its hash in one swap."""
+        old_policy, old_hash = engine.policy, engine.hash
+        path = tmp_path / "policy.yaml"
+        path.write_text("version: 2.0.0-test\ndefault_action: REVIEW\n")
+        engine.policy_path = path
+
+        assert engine.reload_policy()
+        assert engine.version == "2.0.0-test"
+        assert engine.hash != old_hash
+        assert engine.hash == PolicyEngine._compute_hash(engine.policy)
+        # The previous snapshot is replaced, not mutated
+        assert old_policy is policy
+        assert old_policy.version == "1.0.0-test"
+
 
 class TestPolicyRules:
     """Tests for policy rules configuration."""
@@ -163,3 +187,67 @@ class TestPolicyRules:
 
         assert len(sorted_rules) == 1
         assert sorted_rules[0].id == "enabled"
+
+
+class TestPolicyBatch:
+    """Tests for batched policy changes."""
+
+    @pytest.fixture
+    def service(self):
+        service = PolicyVersioningService(database_url="postgresql+asyncpg://localhost/test")
+        service._load_active_policy = AsyncMock(return_value=PolicyRules(version="1.0.0"))
+        service._save_version = AsyncMock(return_value="saved")
+        return service
+
+    @pytest.mark.asyncio
+    async def test_batch_saves_one_version(self, service):
+        """All operations land in a single saved version."""
+        operations = [
+            PolicyOperation(op="update_list", list_update=ListUpdate(list_type="blocklist_cards", value="card_1")),
+            PolicyOperation(op="add_rule", rule=RuleUpdate(id="r1", name="Rule 1", action="BLOCK")),
+            PolicyOperation(op="update_list", list_update=ListUpdate(list_type="blocklist_cards", value="card_2")),
+        ]
+
+        assert await service.apply_batch(operations) == "saved"
+
+        service._save_version.assert_awaited_once()
+        kwargs = service._save_version.await_args.kwargs
+        assert kwargs["policy"].blocklist_cards == {"card_1", "card_2"}
+        assert [r.id for r in kwargs["policy"].rules] == ["r1"]
+        assert kwargs["change_type"] == "rule_add"
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_saves_nothing(self, service):
+        """A failing operation aborts the whole batch."""
+        operations = [
+            PolicyOperation(op="update_list", list_update=ListUpdate(list_type="blocklist_cards", value="card_1")),
+            PolicyOperation(op="delete_rule", rule_id="missing"),
+        ]
+
+        with pytest.raises(PolicyValidationError):
+            await service.apply_batch(operations)
+        service._save_version.assert_not_awaited()
+
+    def test_operation_requires_payload(self):
+        """Each op must carry its matching payload."""
+        with pytest.raises(ValueError):
+            PolicyOperation(op="add_rule")
+
+
+class TestPolicyVersionHash:
+    """Tests for the stored policy_hash."""
+
+    def test_hash_ignores_version_string(self):
+        """A rollback and its target carry the same content hash."""
+        service = PolicyVersioningService(database_url="postgresql+asyncpg://localhost/test")
+        original = PolicyRules(version="1.0.0", blocklist_cards={"card_1", "card_2"})
+        rollback = PolicyRules(version="1.0.3", blocklist_cards={"card_2", "card_1"})
+
+        assert service._compute_hash(original) == service._compute_hash(rollback)
+
+    def test_hash_changes_with_content(self):
+        service = PolicyVersioningService(database_url="postgresql+asyncpg://localhost/test")
+        before = PolicyRules(version="1.0.0")
+        after = PolicyRules(version="1.0.0", blocklist_cards={"card_1"})
+
+        assert service._compute_hash(before) != service._compute_hash(after)